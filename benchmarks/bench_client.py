@@ -0,0 +1,347 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from simplewebdavclient.simplewebdavclient import Client
+from benchmarks.server import StandInServer, PATTERN
+from benchmarks.synthetic import bench_sizes
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+MIB = 1024 * 1024
+SCENARIOS = ('listing', 'crawl', 'small', 'large')
+
+
+def measure(repeat, func):
+    """
+    Function to run a callable several times keeping the best time and the memory high-water mark
+
+    The timed runs are made without tracing, the peak comes from one more run
+    under tracemalloc and counts Python allocations.  The stand-in server runs
+    in the same process but keeps large bodies out of memory.
+
+    :type repeat: Integer
+    :param repeat: Number of runs
+    :type func: Callable
+    :param func: The thing to time, it returns the number of units of work done
+
+    :rtype: Tuple
+    :return: The best time in seconds, the units of work per run and the peak traced MiB
+
+    """
+    best = None
+    units = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        units = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+
+    finally:
+        tracemalloc.stop()
+
+    return best, units, peak / float(MIB)
+
+
+def result(name, seconds, units, unit, peak_mib, **parameters):
+    """
+    Function to build one benchmark result
+
+    :type name: String
+    :param name: The benchmark name
+    :type seconds: Float
+    :param seconds: The best time
+    :type units: Float
+    :param units: The work done in that time
+    :type unit: String
+    :param unit: What the work is counted in
+    :type peak_mib: Float
+    :param peak_mib: The traced memory high-water mark
+    :type parameters: KWARGS
+    :param parameters: What the benchmark was run with
+
+    :rtype: Dict
+    :return: The result
+
+    """
+    return dict(name=name, seconds=seconds, rate=units / seconds if seconds else None,
+                unit='{unit}/s'.format(unit=unit), peak_traced_mib=peak_mib, parameters=parameters)
+
+
+def bench_listing(client, sizes, repeat):
+    """
+    Function to benchmark parsing listings of synthetic collections
+
+    :type client: Client
+    :param client: A Client pointing at the stand-in server
+    :type sizes: List
+    :param sizes: The listing sizes
+    :type repeat: Integer
+    :param repeat: Runs per measurement
+
+    :rtype: List
+    :return: The results
+
+    """
+    results = []
+    for size in sizes:
+        path = StandInServer.listing_path(size) + '/'
+        for name, func in (('resource_list', lambda: len(client.resource_list(path))),
+                           ('resource_list_table', lambda: len(client.resource_list(path, as_table=True))),
+                           ('iter_resources', lambda: sum(1 for _ in client.iter_resources(path)))):
+            seconds, entries, peak = measure(repeat, func)
+            results.append(result('listing.' + name, seconds, entries, 'entries', peak, entries=size))
+
+    return results
+
+
+def bench_crawl(client, size, collections, workers, processes, repeat):
+    """
+    Function to benchmark listing many collections from many threads, parsing in the threads or in processes
+
+    Every collection is the same synthetic listing, so only the client side changes between runs
+
+    :type client: Client
+    :param client: A Client pointing at the stand-in server
+    :type size: Integer
+    :param size: The entries in every collection
+    :type collections: Integer
+    :param collections: The collections to list
+    :type workers: Integer
+    :param workers: Threads sending the PROPFINDs
+    :type processes: Integer
+    :param processes: Parser processes
+    :type repeat: Integer
+    :param repeat: Runs per measurement
+
+    :rtype: List
+    :return: The results
+
+    """
+    path = StandInServer.listing_path(size) + '/'
+
+    def crawl(parser_pool):
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return sum(executor.map(lambda _: len(client.resource_list(path, parser_pool=parser_pool)),
+                                    range(collections)))
+
+    results = []
+    # Spawned rather than forked, the stand-in server thread is already running
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+        # Start the parser processes before anything is timed
+        list(pool.map(abs, range(processes)))
+        for name, parser_pool, parsers in (('threads', None, 0), ('process_pool', pool, processes)):
+            seconds, entries, peak = measure(repeat, lambda: crawl(parser_pool))
+            results.append(result('crawl.' + name, seconds, entries, 'entries', peak, collections=collections,
+                                  entries=size, workers=workers, processes=parsers))
+
+    return results
+
+
+def bench_small(client, count, size, workers, repeat):
+    """
+    Function to benchmark many small file operations
+
+    :type client: Client
+    :param client: A Client pointing at the stand-in server
+    :type count: Integer
+    :param count: The number of files
+    :type size: Integer
+    :param size: The size of every file in bytes
+    :type workers: Integer
+    :param workers: Threads for the bulk operations
+    :type repeat: Integer
+    :param repeat: Runs per measurement
+
+    :rtype: List
+    :return: The results
+
+    """
+    data = (PATTERN * (size // len(PATTERN) + 1))[:size]
+    remote_paths = ['/small/file-{index:06d}.bin'.format(index=index) for index in range(count)]
+    client.directories_create('/small/')
+
+    def upload_each():
+        for remote_path in remote_paths:
+            client.upload(data, remote_path)
+
+        return count
+
+    def upload_many():
+        client.upload_many([(data, remote_path) for remote_path in remote_paths], max_workers=workers)
+        return count
+
+    def download_each():
+        buffer = bytearray(size)
+        for remote_path in remote_paths:
+            client.download(remote_path, buffer)
+
+        return count
+
+    def download_many():
+        client.download_many([(remote_path, bytearray(size)) for remote_path in remote_paths], max_workers=workers)
+        return count
+
+    def exists_each():
+        for remote_path in remote_paths:
+            client.resource_exists(remote_path)
+
+        return count
+
+    results = []
+    for name, func, threads in (('upload', upload_each, 1), ('upload_many', upload_many, workers),
+                                ('download', download_each, 1), ('download_many', download_many, workers),
+                                ('resource_exists', exists_each, 1)):
+        seconds, operations, peak = measure(repeat, func)
+        results.append(result('small.' + name, seconds, operations, 'ops', peak, files=count, size_bytes=size,
+                              workers=threads))
+
+    return results
+
+
+def bench_large(client, size_mib, segments, repeat):
+    """
+    Function to benchmark moving one large file
+
+    :type client: Client
+    :param client: A Client pointing at the stand-in server
+    :type size_mib: Integer
+    :param size_mib: The file size in MiB
+    :type segments: Integer
+    :param segments: Ranges for the segmented download
+    :type repeat: Integer
+    :param repeat: Runs per measurement
+
+    :rtype: List
+    :return: The results
+
+    """
+    temporary_dir = tempfile.mkdtemp(prefix='webdav-bench-')
+    try:
+        local_path = os.path.join(temporary_dir, 'large.bin')
+        with open(local_path, 'wb') as file:
+            for _ in range(size_mib * MIB // len(PATTERN)):
+                file.write(PATTERN)
+
+        download_path = os.path.join(temporary_dir, 'download.bin')
+
+        def upload():
+            client.upload(local_path, '/large.bin')
+            return size_mib
+
+        def download():
+            client.download('/large.bin', download_path)
+            return size_mib
+
+        def download_segments():
+            client.download('/large.bin', download_path, segments=segments)
+            return size_mib
+
+        results = []
+        for name, func, parameters in (('upload', upload, {}), ('download', download, {}),
+                                       ('download_segments', download_segments, dict(segments=segments))):
+            seconds, mib, peak = measure(repeat, func)
+            results.append(result('large.' + name, seconds, mib, 'MiB', peak, size_mib=size_mib, **parameters))
+
+        return results
+
+    finally:
+        shutil.rmtree(temporary_dir, ignore_errors=True)
+
+
+def git_revision():
+    """
+    Function to get the commit the benchmarks ran against
+
+    :rtype: String
+    :return: The commit hash, None outside a git checkout
+
+    """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Client against an in-process WebDav stand-in server')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help='Comma separated, from listing,crawl,small,large')
+    parser.add_argument('--sizes', default=None, help='Comma separated listing sizes, default 1000,10000,100000')
+    parser.add_argument('--crawl-collections', type=int, default=100, help='Collections listed by the crawl')
+    parser.add_argument('--crawl-size', type=int, default=1000, help='Entries in every crawled collection')
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help='Parser processes for the crawl')
+    parser.add_argument('--small-files', type=int, default=500, help='Number of small files')
+    parser.add_argument('--small-size', type=int, default=4096, help='Size of a small file in bytes')
+    parser.add_argument('--large-mib', type=int, default=64, help='Size of the large file in MiB')
+    parser.add_argument('--segments', type=int, default=4, help='Ranges for the segmented download')
+    parser.add_argument('--workers', type=int, default=8, help='Threads for the bulk operations')
+    parser.add_argument('--latency', type=float, default=0.0, help='Milliseconds the server waits per request')
+    parser.add_argument('--bandwidth', type=float, default=None, help='MiB/s per connection, default no limit')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement, best is kept')
+    parser.add_argument('--json', default=None, help='Append the run as one JSON line to this file')
+    args = parser.parse_args()
+    scenarios = [scenario for scenario in args.scenarios.split(',') if scenario]
+    sizes = [int(size) for size in args.sizes.split(',')] if args.sizes else bench_sizes('1000,10000,100000')
+    listing_sizes = set(sizes) if 'listing' in scenarios else set()
+    if 'crawl' in scenarios:
+        listing_sizes.add(args.crawl_size)
+
+    server = StandInServer(latency=args.latency / 1000.0,
+                           bandwidth=args.bandwidth * MIB if args.bandwidth else None,
+                           listing_sizes=listing_sizes)
+    results = []
+    with server, Client('127.0.0.1', port=server.port, pool_maxsize=max(10, args.workers)) as client:
+        if 'listing' in scenarios:
+            results.extend(bench_listing(client, sizes, args.repeat))
+
+        if 'crawl' in scenarios:
+            results.extend(bench_crawl(client, args.crawl_size, args.crawl_collections, args.workers,
+                                       args.processes, args.repeat))
+
+        if 'small' in scenarios:
+            results.extend(bench_small(client, args.small_files, args.small_size, args.workers, args.repeat))
+
+        if 'large' in scenarios:
+            results.extend(bench_large(client, args.large_mib, args.segments, args.repeat))
+
+    run = dict(timestamp=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()), revision=git_revision(),
+               python=platform.python_version(), platform=platform.platform(),
+               server=dict(latency_ms=args.latency, bandwidth_mib_s=args.bandwidth),
+               max_rss_mib=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, results=results)
+
+    for item in results:
+        print('{name:<28} {rate:>14,.1f} {unit:<11} peak {peak:8.1f} MiB  {parameters}'.format(
+            name=item['name'], rate=item['rate'] or 0, unit=item['unit'], peak=item['peak_traced_mib'],
+            parameters=item['parameters']))
+
+    print('max rss {rss:.1f} MiB'.format(rss=run['max_rss_mib']))
+    if args.json:
+        with open(args.json, 'a') as file:
+            file.write(json.dumps(run, sort_keys=True) + '\n')
+
+
+if __name__ == '__main__':
+    main()
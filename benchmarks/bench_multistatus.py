@@ -0,0 +1,105 @@
+import argparse
+import time
+try:
+    import xml.etree.cElementTree as xml
+
+except ImportError:
+    import xml.etree.ElementTree as xml
+from simplewebdavclient.simplewebdavclient import Client
+from simplewebdavclient.multistatus import extract_properties
+from benchmarks.synthetic import multistatus_document, size_in_mib, bench_sizes
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def legacy_extract(element):
+    """
+    Function reproducing the original six descendant searches per response
+
+    :type element: Element
+    :param element: The {DAV:}response element
+
+    :rtype: Tuple
+    :return: The extracted fields
+
+    """
+    get = Client.get_xml_element
+    return (get(element, 'href'),
+            get(element, 'displayname'),
+            int(get(element, 'getcontentlength', 0)),
+            get(element, 'getlastmodified', ''),
+            get(element, 'creationdate', ''),
+            get(element, 'getcontenttype', ''))
+
+
+def single_pass_extract(element):
+    """
+    Function using the single pass tag table extractor
+
+    :type element: Element
+    :param element: The {DAV:}response element
+
+    :rtype: Tuple
+    :return: The extracted fields
+
+    """
+    properties = extract_properties(element)
+    return (properties.get('resource_url'),
+            properties.get('resource_name'),
+            int(properties.get('file_size') or 0),
+            properties.get('modified_time') or '',
+            properties.get('creation_time') or '',
+            properties.get('content_type') or '')
+
+
+def best_of(repeat, func, *args):
+    """
+    Function to time a callable and keep the best run
+
+    :type repeat: Integer
+    :param repeat: Number of runs
+    :type func: Callable
+    :param func: The thing to time
+
+    :rtype: Float
+    :return: The best time in seconds
+
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare multistatus property extraction strategies')
+    parser.add_argument('--sizes', default=None, help='Comma separated listing sizes, default 10000,100000')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement, best is kept')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')] if args.sizes else bench_sizes('10000,100000')
+
+    for size in sizes:
+        document = multistatus_document(size)
+        elements = xml.fromstring(document).findall('{DAV:}response')
+        assert [legacy_extract(e) for e in elements] == [single_pass_extract(e) for e in elements]
+
+        legacy = best_of(args.repeat, lambda: [legacy_extract(e) for e in elements])
+        single = best_of(args.repeat, lambda: [single_pass_extract(e) for e in elements])
+        print('{size:>8} entries ({mib:.1f} MiB)  legacy {legacy:8.3f}s  single pass {single:8.3f}s  '
+              'speedup {speedup:5.2f}x'.format(size=size, mib=size_in_mib(document), legacy=legacy, single=single,
+                                               speedup=legacy / single))
+
+
+if __name__ == '__main__':
+    main()
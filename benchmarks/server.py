@@ -0,0 +1,658 @@
+import threading
+import time
+from email.utils import formatdate
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlparse
+from benchmarks.synthetic import multistatus_document
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+CHECKSUMS_TAG = '{http://owncloud.org/ns}checksums'
+PROP_TAG = '{DAV:}prop'
+# Bodies bigger than this are counted instead of kept, and served back from a fixed pattern
+LARGE_BODY_BYTES = 1 * 1024 * 1024
+IO_CHUNK_BYTES = 64 * 1024
+PATTERN = bytes(range(256)) * (IO_CHUNK_BYTES // 256)
+FINITE_DEPTH_ERROR = (b'<?xml version="1.0" encoding="utf-8"?>'
+                      b'<D:error xmlns:D="DAV:"><D:propfind-finite-depth/></D:error>')
+
+
+class Resource(object):
+    """
+    Class for a resource kept by the stand-in server
+
+    :type data: Bytes
+    :param data: The body, None for a collection or a large body
+    :type size: Integer
+    :param size: The body size
+    :type collection: Boolean
+    :param collection: True for a collection
+    :type properties: Dict
+    :param properties: Dead properties, namespaced tag to text
+
+    """
+
+    __slots__ = ('data', 'size', 'collection', 'mtime', 'version', 'properties')
+
+    def __init__(self, data=None, size=0, collection=False, properties=None):
+        self.data = data
+        self.size = size
+        self.collection = collection
+        self.mtime = time.time()
+        self.version = 0
+        self.properties = dict(properties or {})
+
+    def etag(self):
+        return '"{size:x}-{version:x}"'.format(size=self.size, version=self.version)
+
+
+class StandInServer(object):
+    """
+    Class for an in-process WebDav stand-in server to benchmark the Client against
+
+    Listings of synthetic collections are rendered before the server starts, so
+    benchmarks measure the client and not the server building XML.  Bodies over
+    LARGE_BODY_BYTES are only counted, so the server does not add to the memory
+    the client is measured with.
+
+    :type latency: Float
+    :param latency: Seconds every request waits before it is answered
+    :type bandwidth: Float
+    :param bandwidth: Bytes per second bodies are sent and received at per connection, None for no limit
+    :type listing_sizes: Iterable
+    :param listing_sizes: Sizes of synthetic collections to serve at /listing-<size>/
+    :type finite_depth: Boolean
+    :param finite_depth: If set to True Depth infinity PROPFINDs are refused with 403, like many servers do
+    :type chunked: Boolean
+    :param chunked: If set to True bodies are sent with chunked transfer encoding instead of a Content-Length
+
+    """
+
+    def __init__(self, latency=0.0, bandwidth=None, listing_sizes=(), finite_depth=False, chunked=False):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.finite_depth = finite_depth
+        self.chunked = chunked
+        self.lock = threading.Lock()
+        self.resources = {'/': Resource(collection=True)}
+        self.listings = {}
+        for size in listing_sizes:
+            path = self.listing_path(size)
+            self.listings[path] = multistatus_document(size, base=path + '/')
+
+        # Paths that can not be made, moved or deleted, as if another client held a lock on them
+        self.locked = set()
+        # Paths that PROPFINDs are redirected from with 301, mapped to the path they are sent to
+        self.redirects = {}
+        # Paths that can not be read or listed, as if the client lacked the permission
+        self.forbidden = set()
+        self.requests = 0
+        self.connections = 0
+        self._server = None
+        self._thread = None
+
+    @staticmethod
+    def listing_path(size):
+        """
+        Method to get the path of a synthetic collection
+
+        :type size: Integer
+        :param size: The number of entries
+
+        :rtype: String
+        :return: The path without a trailing /
+
+        """
+        return '/listing-{size}'.format(size=size)
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        """
+        Method to start serving on a free local port in a background thread
+
+        :rtype: StandInServer
+        :return: The server
+
+        """
+        handler = type('Handler', (StandInHandler,), {'stand_in': self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Method to stop serving
+
+        :rtype: None
+        :return: None
+
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def throttle(self, size):
+        """
+        Method to hold a connection for as long as size bytes take at the bandwidth
+
+        :type size: Integer
+        :param size: Bytes moved
+
+        :rtype: None
+        :return: None
+
+        """
+        if self.bandwidth:
+            time.sleep(size / float(self.bandwidth))
+
+
+def normalize(path):
+    """
+    Function to turn a request path into a store key
+
+    :type path: String
+    :param path: The request path
+
+    :rtype: String
+    :return: The unquoted path without a trailing /
+
+    """
+    path = unquote(urlparse(path).path)
+    if path != '/' and path.endswith('/'):
+        path = path[:-1]
+
+    return path or '/'
+
+
+def parent(path):
+    return path.rsplit('/', 1)[0] or '/'
+
+
+def requested_properties(body):
+    """
+    Function to find the properties outside the DAV: namespace a PROPFIND asks for by name
+
+    :type body: Bytes
+    :param body: The request body
+
+    :rtype: List
+    :return: The namespaced tags, empty for allprop, propname or no body
+
+    """
+    if not body:
+        return []
+
+    prop = ElementTree.fromstring(body).find(PROP_TAG)
+    if prop is None:
+        return []
+
+    return [item.tag for item in prop if not item.tag.startswith('{DAV:}')]
+
+
+def property_element(tag, text=''):
+    """
+    Function to render a dead property
+
+    :type tag: String
+    :param tag: The namespaced tag
+    :type text: String
+    :param text: The value
+
+    :rtype: String
+    :return: The element
+
+    """
+    namespace, _, name = tag[1:].partition('}')
+    return '<X:{name} xmlns:X="{namespace}">{text}</X:{name}>'.format(name=name, namespace=escape(namespace),
+                                                                    text=escape(text))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and bodies are written separately, Nagle would hold the body back for the delayed ACK
+    disable_nagle_algorithm = True
+    stand_in = None
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.stand_in.lock:
+            self.stand_in.connections += 1
+
+    def parse_request(self):
+        # handle_one_request also runs for the read that finds a kept alive connection closed
+        parsed = BaseHTTPRequestHandler.parse_request(self)
+        if parsed:
+            with self.stand_in.lock:
+                self.stand_in.requests += 1
+
+        return parsed
+
+    def end_headers(self):
+        # A client asking for Connection: close is told the connection closes, or it may send again on it
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+
+        BaseHTTPRequestHandler.end_headers(self)
+
+    def send_body(self, code, body=b'', headers=None):
+        if self.stand_in.latency:
+            time.sleep(self.stand_in.latency)
+
+        self.send_response(code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.send_length(len(body))
+        if self.command != 'HEAD':
+            view = memoryview(body)
+            for offset in range(0, len(view), IO_CHUNK_BYTES):
+                self.write_piece(view[offset:offset + IO_CHUNK_BYTES])
+
+            self.finish_body()
+
+    def send_length(self, size):
+        self.chunked_body = self.stand_in.chunked and size > 0
+        if self.chunked_body:
+            self.send_header('Transfer-Encoding', 'chunked')
+
+        else:
+            self.send_header('Content-Length', str(size))
+
+        self.end_headers()
+
+    def write_piece(self, piece):
+        self.stand_in.throttle(len(piece))
+        if self.chunked_body:
+            self.wfile.write('{0:x}\r\n'.format(len(piece)).encode('ascii') + bytes(piece) + b'\r\n')
+
+        else:
+            self.wfile.write(piece)
+
+    def finish_body(self):
+        if self.chunked_body:
+            self.wfile.write(b'0\r\n\r\n')
+
+    def read_body(self, keep):
+        """
+        Method to read the request body
+
+        :type keep: Boolean
+        :param keep: If set to False the body is only counted once it passes LARGE_BODY_BYTES
+
+        :rtype: Tuple
+        :return: The body, None if it was too large to keep, and its size
+
+        """
+        pieces = []
+        size = 0
+        for piece in self.iter_body():
+            size += len(piece)
+            self.stand_in.throttle(len(piece))
+            if pieces is not None:
+                pieces.append(piece)
+                if not keep and size > LARGE_BODY_BYTES:
+                    pieces = None
+
+        return (b''.join(pieces) if pieces is not None else None), size
+
+    def iter_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            while True:
+                size = int(self.rfile.readline().split(b';')[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return
+
+                yield self.rfile.read(size)
+                self.rfile.readline()
+
+        remaining = int(self.headers.get('Content-Length') or 0)
+        while remaining:
+            piece = self.rfile.read(min(remaining, IO_CHUNK_BYTES))
+            if not piece:
+                return
+
+            remaining -= len(piece)
+            yield piece
+
+    def href(self, path, resource):
+        href = quote(path)
+        if resource.collection and not href.endswith('/'):
+            href += '/'
+
+        return href
+
+    def entry(self, path, resource, requested=()):
+        name = path.rsplit('/', 1)[-1]
+        if resource.collection:
+            props = '<D:resourcetype><D:collection/></D:resourcetype>'
+
+        else:
+            props = ('<D:resourcetype/><D:getcontentlength>{size}</D:getcontentlength>'
+                     '<D:getcontenttype>application/octet-stream</D:getcontenttype>').format(size=resource.size)
+
+        # Dead properties asked for by name, the ones a resource does not have are reported with 404
+        props += ''.join(property_element(tag, resource.properties[tag]) for tag in requested
+                         if tag in resource.properties)
+        missing = ''.join(property_element(tag) for tag in requested if tag not in resource.properties)
+        if missing:
+            missing = ('<D:propstat><D:prop>{0}</D:prop><D:status>HTTP/1.1 404 Not Found</D:status>'
+                       '</D:propstat>').format(missing)
+
+        return ('<D:response><D:href>{href}</D:href><D:propstat><D:prop>'
+                '<D:displayname>{name}</D:displayname>'
+                '<D:getlastmodified>{mtime}</D:getlastmodified>'
+                '<D:creationdate>2020-01-12T10:11:12Z</D:creationdate>'
+                '<D:getetag>{etag}</D:getetag>{props}'
+                '</D:prop><D:status>HTTP/1.1 200 OK</D:status></D:propstat>{missing}'
+                '</D:response>').format(href=self.href(path, resource), name=name,
+                                        mtime=formatdate(resource.mtime, usegmt=True), etag=resource.etag(),
+                                        props=props, missing=missing)
+
+    def do_PROPFIND(self):
+        body, _ = self.read_body(keep=True)
+        requested = requested_properties(body)
+        path = normalize(self.path)
+        listing = self.stand_in.listings.get(path)
+        if listing is not None:
+            return self.send_body(207, listing, {'Content-Type': 'application/xml; charset="utf-8"'})
+
+        if path in self.stand_in.forbidden:
+            return self.send_body(403)
+
+        target = self.stand_in.redirects.get(path)
+        if target is not None:
+            return self.send_body(301, b'', {'Location': quote(target) + '/'})
+
+        depth = self.headers.get('Depth', 'infinity')
+        if depth == 'infinity' and self.stand_in.finite_depth:
+            return self.send_body(403, FINITE_DEPTH_ERROR, {'Content-Type': 'application/xml; charset="utf-8"'})
+
+        with self.stand_in.lock:
+            resources = self.stand_in.resources
+            if path not in resources:
+                return self.send_body(404)
+
+            entries = [self.entry(path, resources[path], requested)]
+            if depth != '0':
+                prefix = path.rstrip('/') + '/'
+                for other, resource in resources.items():
+                    if other != path and other.startswith(prefix) and (depth == 'infinity' or
+                                                                       '/' not in other[len(prefix):]):
+                        entries.append(self.entry(other, resource, requested))
+
+        body = '<?xml version="1.0" encoding="utf-8"?><D:multistatus xmlns:D="DAV:">{0}</D:multistatus>'.format(
+            ''.join(entries)).encode('utf-8')
+        self.send_body(207, body, {'Content-Type': 'application/xml; charset="utf-8"'})
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        path = normalize(self.path)
+        if path in self.stand_in.forbidden:
+            return self.send_body(403)
+
+        with self.stand_in.lock:
+            resource = self.stand_in.resources.get(path)
+
+        if resource is None:
+            return self.send_body(404)
+
+        headers = {'ETag': resource.etag(), 'Accept-Ranges': 'bytes',
+                   'Last-Modified': formatdate(resource.mtime, usegmt=True)}
+        if self.matches(self.headers.get('If-None-Match'), resource):
+            return self.send_body(304, b'', headers)
+
+        start, end, code = 0, resource.size - 1, 200
+        byte_range = self.headers.get('Range')
+        if byte_range and self.headers.get('If-Range', resource.etag()) == resource.etag():
+            first, _, last = byte_range.split('=', 1)[1].partition('-')
+            start = int(first)
+            end = int(last) if last else resource.size - 1
+            if start >= resource.size:
+                return self.send_body(416, b'', {'Content-Range': 'bytes */{0}'.format(resource.size)})
+
+            end = min(end, resource.size - 1)
+            code = 206
+            headers['Content-Range'] = 'bytes {0}-{1}/{2}'.format(start, end, resource.size)
+
+        if resource.data is not None:
+            return self.send_body(code, resource.data[start:end + 1], headers)
+
+        self.send_pattern(code, start, end + 1, headers)
+
+    @staticmethod
+    def matches(condition, resource):
+        """
+        Method to check an If-Match or If-None-Match header against a resource
+
+        :type condition: String
+        :param condition: The header, None if it was not sent
+        :type resource: Resource
+        :param resource: The resource, None if there is none
+
+        :rtype: Boolean
+        :return: True if the header names the resource, False if it does not or was not sent
+
+        """
+        if condition is None or resource is None:
+            return False
+
+        return any(tag.strip() in ('*', resource.etag()) for tag in condition.split(','))
+
+    def send_pattern(self, code, start, stop, headers):
+        if self.stand_in.latency:
+            time.sleep(self.stand_in.latency)
+
+        self.send_response(code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+
+        self.send_length(max(0, stop - start))
+        if self.command == 'HEAD':
+            return
+
+        view = memoryview(PATTERN)
+        while start < stop:
+            # Byte n of every large body is PATTERN[n % len(PATTERN)], ranges included
+            offset = start % len(PATTERN)
+            piece = view[offset:offset + min(IO_CHUNK_BYTES, stop - start)]
+            self.write_piece(piece)
+            start += len(piece)
+
+        self.finish_body()
+
+    def do_PUT(self):
+        path = normalize(self.path)
+        data, size = self.read_body(keep=False)
+        with self.stand_in.lock:
+            resources = self.stand_in.resources
+            if parent(path) not in resources:
+                return self.send_body(409)
+
+            existing = resources.get(path)
+            if_match = self.headers.get('If-Match')
+            if (if_match is not None and not self.matches(if_match, existing)) or \
+                    self.matches(self.headers.get('If-None-Match'), existing):
+                return self.send_body(412)
+
+            resource = resources[path] = Resource(data, size)
+            if existing is not None:
+                resource.version = existing.version + 1
+
+            if self.headers.get('OC-Checksum'):
+                resource.properties[CHECKSUMS_TAG] = self.headers['OC-Checksum']
+
+            self.touch_parents(path)
+
+        self.send_body(204 if existing is not None else 201, b'', {'ETag': resource.etag()})
+
+    def do_MKCOL(self):
+        path = normalize(self.path)
+        with self.stand_in.lock:
+            resources = self.stand_in.resources
+            if path in self.stand_in.locked:
+                return self.send_body(423)
+
+            if path in resources:
+                return self.send_body(405)
+
+            if parent(path) not in resources:
+                return self.send_body(409)
+
+            resources[path] = Resource(collection=True)
+            self.touch_parents(path)
+
+        self.send_body(201)
+
+    def do_DELETE(self):
+        path = normalize(self.path)
+        with self.stand_in.lock:
+            resources = self.stand_in.resources
+            if path not in resources:
+                return self.send_body(404)
+
+            prefix = path + '/'
+            members = [other for other in resources if other == path or other.startswith(prefix)]
+            failed = sorted(other for other in members if other in self.stand_in.locked)
+            if path in failed:
+                return self.send_body(423)
+
+            kept = self.kept_for(path, failed)
+            for other in members:
+                if other not in kept:
+                    del resources[other]
+
+            self.touch_parents(path)
+
+        if failed:
+            return self.send_failures(failed, 'HTTP/1.1 423 Locked')
+
+        self.send_body(204)
+
+    def do_COPY(self):
+        self.copy_or_move(move=False)
+
+    def do_MOVE(self):
+        self.copy_or_move(move=True)
+
+    def copy_or_move(self, move):
+        path = normalize(self.path)
+        destination = normalize(self.headers.get('Destination', ''))
+        with self.stand_in.lock:
+            resources = self.stand_in.resources
+            if path not in resources:
+                return self.send_body(404)
+
+            prefix = path + '/'
+            if destination == path or destination.startswith(prefix):
+                return self.send_body(403)
+
+            if parent(destination) not in resources:
+                return self.send_body(409)
+
+            existing = destination in resources
+            if existing and self.headers.get('Overwrite', 'T') == 'F':
+                return self.send_body(412)
+
+            members = [other for other in resources if other == path or other.startswith(prefix)]
+            if not move and self.headers.get('Depth', 'infinity') == '0':
+                members = [path]
+
+            failed = sorted(other for other in members if other in self.stand_in.locked) if move else []
+            if path in failed:
+                return self.send_body(423)
+
+            kept = self.kept_for(path, failed)
+            for other in [other for other in resources if other == destination or other.startswith(destination + '/')]:
+                del resources[other]
+
+            for other in members:
+                if other in failed:
+                    continue
+
+                source = resources[other] if other in kept or not move else resources.pop(other)
+                copied = Resource(source.data, source.size, source.collection, source.properties)
+                resources[destination + other[len(path):]] = copied
+
+            self.touch_parents(destination)
+            if move:
+                self.touch_parents(path)
+
+        if failed:
+            return self.send_failures(failed, 'HTTP/1.1 423 Locked')
+
+        self.send_body(204 if existing else 201)
+
+    def touch_parents(self, path):
+        """
+        Method to change the ETag and modified time of every collection above a changed path, like ownCloud does
+
+        :type path: String
+        :param path: The path that changed
+
+        :rtype: None
+        :return: None
+
+        """
+        resources = self.stand_in.resources
+        while path != '/':
+            path = parent(path)
+            collection = resources.get(path)
+            if collection is not None:
+                collection.version += 1
+                collection.mtime = time.time()
+
+    @staticmethod
+    def kept_for(path, failed):
+        """
+        Method to find what has to stay at a source when some of its members failed
+
+        :type path: String
+        :param path: The collection being moved or deleted
+        :type failed: Iterable
+        :param failed: The members that failed
+
+        :rtype: Set
+        :return: The failed members and every collection up to path holding them
+
+        """
+        kept = set(failed)
+        for other in failed:
+            while other != path:
+                other = parent(other)
+                kept.add(other)
+
+        return kept
+
+    def send_failures(self, paths, status):
+        body = ''.join('<D:response><D:href>{href}</D:href><D:status>{status}</D:status></D:response>'.format(
+            href=quote(path), status=status) for path in paths)
+        body = '<?xml version="1.0" encoding="utf-8"?><D:multistatus xmlns:D="DAV:">{0}</D:multistatus>'.format(
+            body).encode('utf-8')
+        self.send_body(207, body, {'Content-Type': 'application/xml; charset="utf-8"'})
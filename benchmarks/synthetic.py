@@ -0,0 +1,105 @@
+import os
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+RESPONSE_TEMPLATE = (
+    '<D:response>'
+    '<D:href>{href}</D:href>'
+    '<D:propstat><D:prop>'
+    '<D:displayname>{name}</D:displayname>'
+    '<D:getcontentlength>{size}</D:getcontentlength>'
+    '<D:getlastmodified>Mon, 12 Jan 2020 10:11:12 GMT</D:getlastmodified>'
+    '<D:creationdate>2020-01-12T10:11:12Z</D:creationdate>'
+    '<D:getcontenttype>application/octet-stream</D:getcontenttype>'
+    '<D:getetag>"{index:x}-{size:x}"</D:getetag>'
+    '<D:resourcetype/>'
+    '</D:prop><D:status>HTTP/1.1 200 OK</D:status></D:propstat>'
+    '<D:propstat><D:prop><D:quota-used-bytes/><D:lockdiscovery/></D:prop>'
+    '<D:status>HTTP/1.1 404 Not Found</D:status></D:propstat>'
+    '</D:response>'
+)
+
+
+def multistatus_chunks(entries, base='/bench/'):
+    """
+    Function to generate a synthetic Depth 1 multistatus body in chunks
+
+    :type entries: Integer
+    :param entries: The number of file entries in the listing
+    :type base: String
+    :param base: The collection href
+
+    :rtype: Generator
+    :return: A generator of bytes chunks
+
+    """
+    yield ('<?xml version="1.0" encoding="utf-8"?>'
+           '<D:multistatus xmlns:D="DAV:">'
+           '<D:response><D:href>{base}</D:href><D:propstat><D:prop>'
+           '<D:displayname>bench</D:displayname>'
+           '<D:resourcetype><D:collection/></D:resourcetype>'
+           '</D:prop><D:status>HTTP/1.1 200 OK</D:status></D:propstat>'
+           '</D:response>').format(base=base).encode('utf-8')
+
+    batch = []
+    for index in range(entries):
+        name = 'file-{index:08d}.bin'.format(index=index)
+        batch.append(RESPONSE_TEMPLATE.format(href=base + name, name=name, size=index * 37 % 1048576,
+                                              index=index))
+        if len(batch) == 1000:
+            yield ''.join(batch).encode('utf-8')
+            batch = []
+
+    batch.append('</D:multistatus>')
+    yield ''.join(batch).encode('utf-8')
+
+
+def multistatus_document(entries, base='/bench/'):
+    """
+    Function to build a synthetic Depth 1 multistatus body
+
+    :type entries: Integer
+    :param entries: The number of file entries in the listing
+    :type base: String
+    :param base: The collection href
+
+    :rtype: Bytes
+    :return: The multistatus body
+
+    """
+    return b''.join(multistatus_chunks(entries, base))
+
+
+def size_in_mib(data):
+    """
+    Function to get the size of some bytes in MiB
+
+    :type data: Bytes
+    :param data: The data
+
+    :rtype: Float
+    :return: The size in MiB
+
+    """
+    return len(data) / float(1024 * 1024)
+
+
+def bench_sizes(default):
+    """
+    Function to get the listing sizes to benchmark, overridable with BENCH_SIZES
+
+    :type default: String
+    :param default: Comma separated default sizes
+
+    :rtype: List
+    :return: A list of sizes
+
+    """
+    return [int(size) for size in os.environ.get('BENCH_SIZES', default).split(',') if size]
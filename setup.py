@@ -14,6 +14,12 @@ install_requires = [
     'requests == 2.23.0',
 ]
 
+extras_require = {
+    'async': ['aiohttp'],
+    'prometheus': ['prometheus_client'],
+    'opentelemetry': ['opentelemetry-api'],
+}
+
 tests_require = [
     'pytest',
 ]
@@ -21,7 +27,7 @@ tests_require = [
 setup(
     name='simplewebdavclient',
     version=__version__,
-    python_requires='~=3.3',
+    python_requires='>=3.7',
     description='This is a library used to make WebDav Client Connections simple.',
     long_description=long_description,
     long_description_content_type='text/restructuredtext',
@@ -38,6 +44,7 @@ setup(
     packages=packages,
     include_package_data=True,
     install_requires=install_requires,
+    extras_require=extras_require,
     test_suite='pytest',
     tests_require=tests_require,
     classifiers=[
@@ -52,8 +59,6 @@ setup(
         'Operating System :: Microsoft :: Windows',
         'Programming Language :: Python :: 3',
         'Programming Language :: Python :: 3 :: Only',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
     ],
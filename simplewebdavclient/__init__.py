@@ -1 +1,9 @@
 from simplewebdavclient.simplewebdavclient import Client
+from simplewebdavclient.filedata import FileData, ResourceTable
+from simplewebdavclient.transport import Transport
+from simplewebdavclient.bulk import BulkResult
+from simplewebdavclient.cache import ResponseCache
+from simplewebdavclient.retry import RetryPolicy
+from simplewebdavclient.instrumentation import Instrumentation, MetricsAggregator
+from simplewebdavclient.index import ListingIndex
+from simplewebdavclient.integrity import UploadResult
@@ -0,0 +1,589 @@
+import logging
+import ssl
+from urllib.parse import urlparse
+from .exceptions import OperationFailed, MissingDependency, MultiStatusFailed, BufferTooSmall
+from .multistatus import MultistatusStreamParser, iter_response_elements, failed_responses, build_propfind_body,\
+    DEFAULT_PROPFIND_BODY
+from .filedata import FileData
+from .baseclient import BaseClient
+try:
+    import aiohttp
+
+except ImportError:
+    aiohttp = None
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncClient(BaseClient):
+    """
+    Class for an asyncio WebDav Client, it needs aiohttp installed
+
+    The methods mirror Client and raise the same OperationFailed errors.  The
+    aiohttp session is made on first use, pass session to share one connection
+    pool between AsyncClients pointing at the same host.
+
+    :type host: String
+    :param host: IP of the server
+    :type port: Integer
+    :param port: The TCT/UDP Port Number
+    :type auth: String
+    :param auth: Session auth, a (username, password) tuple or an aiohttp.BasicAuth
+    :type username: String
+    :param username: Username
+    :type password: String
+    :param password: Password
+    :type protocol: String
+    :param protocol: http, or https
+    :type verify_ssl: Boolean
+    :param verify_ssl: True or False
+    :type path: String
+    :param path: The path to the resource
+    :type cert: String
+    :param cert: Client cert, a path or a (cert, key) tuple
+    :type session: aiohttp.ClientSession
+    :param session: A session to share with other AsyncClients, when set the pool and timeout options are not used
+    :type limit: Integer
+    :param limit: The most connections open at once
+    :type limit_per_host: Integer
+    :param limit_per_host: The most connections open at once to one host, 0 for no limit
+    :type connect_timeout: Float
+    :param connect_timeout: Seconds to wait for a connection, None waits forever
+    :type read_timeout: Float
+    :param read_timeout: Seconds to wait between bytes from the server, None waits forever
+    :type keep_alive: Boolean
+    :param keep_alive: If set to False connections are closed after every request
+
+    :raises CouldNotDetermineProtocol: If protocol is not http or https
+    :raises MissingDependency: If aiohttp is not installed
+
+    """
+
+    def __init__(self, host, port=None, auth=None, username=None, password=None,
+                 protocol='http', verify_ssl=True, path=None, cert=None, session=None,
+                 limit=100, limit_per_host=0, connect_timeout=None, read_timeout=None, keep_alive=True):
+        if aiohttp is None:
+            raise MissingDependency('Class: {class_name} needs aiohttp, install it with '
+                                    'pip install simplewebdavclient[async]'.format(class_name=type(self)))
+
+        super(AsyncClient, self).__init__(host, port=port, auth=auth, username=username, password=password,
+                                          protocol=protocol, verify_ssl=verify_ssl, path=path, cert=cert)
+        self.owns_transport = session is None
+        self.session = session
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.download_chunk_size_bytes = 1 * 1024 * 1024
+
+        self._ssl = self.__ssl_setting()
+        self._session_owner = None
+        if isinstance(self.auth, tuple):
+            self.auth = aiohttp.BasicAuth(*self.auth)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Method to close the pooled connections, a shared session is left open
+
+        :rtype: None
+        :return: None
+
+        """
+        if self.owns_transport and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def __ssl_setting(self):
+        """
+        Method to work out the ssl argument for aiohttp requests
+
+        :rtype: ssl.SSLContext or Boolean
+        :return: The ssl setting
+
+        """
+        if not self.cert:
+            return True if self.verify_ssl else False
+
+        context = ssl.create_default_context()
+        if not self.verify_ssl:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+
+        if isinstance(self.cert, (tuple, list)):
+            context.load_cert_chain(*self.cert)
+
+        else:
+            context.load_cert_chain(self.cert)
+
+        return context
+
+    def at(self, path):
+        """
+        Method to get an AsyncClient scoped to another working directory
+
+        The scoped AsyncClient gets its session from this one, so a session made
+        on first use is made once, shared, and closed when this one is closed
+
+        :type path: String
+        :param path: Path from your root, or relative to the current working directory
+
+        :rtype: AsyncClient
+        :return: A scoped AsyncClient
+
+        """
+        scoped = super(AsyncClient, self).at(path)
+        scoped._session_owner = self._session_owner or self
+        return scoped
+
+    def _get_session(self):
+        """
+        Method to get the aiohttp session, making it on first use
+
+        :rtype: aiohttp.ClientSession
+        :return: The session
+
+        """
+        if self._session_owner is not None:
+            return self._session_owner._get_session()
+
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             force_close=not self.keep_alive)
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.connect_timeout,
+                                            sock_read=self.read_timeout)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+        return self.session
+
+    async def _send(self, method, path, expected_code, **kwargs):
+        """
+        Method to send data to WebDav server, the caller has to release the response
+
+        :type method:
+        :param method: WebDav Method
+        :type path: String
+        :param path: WebDav Path to resource
+        :type expected_code: Number
+        :param expected_code: Expected HTTP Status Codes
+        type kwargs: KWARGS
+        :param kwargs: Key Word Arguments
+
+        :rtype: aiohttp.ClientResponse Object
+        :return: A response
+
+        """
+        url = self._get_url(path)
+        kwargs.setdefault('ssl', self._ssl)
+        if self.auth:
+            kwargs.setdefault('auth', self.auth)
+
+        response = await self._get_session().request(method, url, allow_redirects=False, **kwargs)
+        try:
+            self._check_status(method, path, expected_code, response.status)
+
+        except OperationFailed:
+            response.release()
+            raise
+
+        return response
+
+    async def directory_create(self, path, safe=False):
+        """
+        Method to make a directory
+
+        :type path: String
+        :param path: Path from your root
+        :type safe: Boolean
+        :param safe: If set to True it will silently do nothing is if directory already exists
+
+        :rtype: None
+        :return: None
+
+        """
+        expected_codes = 201 if not safe else (201, 301, 405)
+        response = await self._send('MKCOL', path, expected_codes)
+        response.release()
+
+    async def directories_create(self, path):
+        """
+        Method to create nested directories
+
+        :type path: String
+        :param path: Path from your root
+
+        :rtype: None
+        :return: None
+
+        """
+        directories = [d for d in path.split('/') if d]
+        if not directories:
+            return
+
+        parent = '/' if path.startswith('/') else self.current_working_directory
+        for directory in directories:
+            directory_path = parent + directory
+            try:
+                await self.directory_create(directory_path, safe=True)
+
+            except OperationFailed as e:
+                if e.actual_code == 409:
+                    raise
+
+            parent = directory_path + '/'
+
+    async def directory_delete(self, path, safe=False):
+        """
+        Method to delete a directory
+
+        :type path: String
+        :param path: Path from your root
+        :type safe: Boolean
+        :param safe: If set to True it will silently do nothing is if directory already exists
+
+        :rtype: None
+        :return: None
+
+        :raises MultiStatusFailed: If some of the resources in the directory could not be deleted
+
+        """
+        path = str(path).rstrip('/') + '/'
+        expected_codes = (200, 204, 207) if not safe else (200, 204, 207, 404)
+        response = await self._send('DELETE', path, expected_codes)
+        await self.__check_multistatus('DELETE', path, (200, 204), response)
+
+    async def resource_delete(self, path):
+        """
+        Method to delete a resource
+
+        :type path: String
+        :param path: Path from your root
+
+        :rtype: None
+        :return: None
+
+        :raises MultiStatusFailed: If the resource is a directory and some of it could not be deleted
+
+        """
+        expected_codes = (200, 204, 207)
+        response = await self._send('DELETE', path, expected_codes)
+        await self.__check_multistatus('DELETE', path, (200, 204), response)
+
+    async def copy(self, source_path, destination_path, depth='infinity', overwrite=True):
+        """
+        Method to copy a resource or directory on the server, no data goes through the client
+
+        :type source_path: String
+        :param source_path: Path from your root
+        :type destination_path: String
+        :param destination_path: Path from your root
+        :type depth: Integer or String
+        :param depth: 0 to copy only a directory and its properties, infinity to copy everything in it
+        :type overwrite: Boolean
+        :param overwrite: If set to False the copy fails with 412 when the destination exists
+
+        :rtype: None
+        :return: None
+
+        :raises MultiStatusFailed: If some of the resources in a directory could not be copied
+
+        """
+        await self.__copy_or_move('COPY', source_path, destination_path, depth, overwrite)
+
+    async def move(self, source_path, destination_path, overwrite=True):
+        """
+        Method to move or rename a resource or directory on the server, no data goes through the client
+
+        :type source_path: String
+        :param source_path: Path from your root
+        :type destination_path: String
+        :param destination_path: Path from your root
+        :type overwrite: Boolean
+        :param overwrite: If set to False the move fails with 412 when the destination exists
+
+        :rtype: None
+        :return: None
+
+        :raises MultiStatusFailed: If some of the resources in a directory could not be moved
+
+        """
+        await self.__copy_or_move('MOVE', source_path, destination_path, 'infinity', overwrite)
+
+    async def __copy_or_move(self, method, source_path, destination_path, depth, overwrite):
+        """
+        Method to send a COPY or MOVE and check a multistatus answer for failures
+
+        :type method: String
+        :param method: COPY or MOVE
+        :type source_path: String
+        :param source_path: Path from your root
+        :type destination_path: String
+        :param destination_path: Path from your root
+        :type depth: Integer or String
+        :param depth: The Depth header
+        :type overwrite: Boolean
+        :param overwrite: The Overwrite header
+
+        :rtype: None
+        :return: None
+
+        """
+        expected_codes = (201, 204, 207)
+        headers = {'Destination': self._destination_url(destination_path), 'Depth': str(depth),
+                   'Overwrite': 'T' if overwrite else 'F'}
+        response = await self._send(method, source_path, expected_codes, headers=headers)
+        await self.__check_multistatus(method, source_path, (201, 204), response)
+
+    async def __check_multistatus(self, method, path, success_codes, response):
+        """
+        Method to raise the failures a 207 answer lists, and release the response
+
+        :type method: String
+        :param method: WebDav Method
+        :type path: String
+        :param path: WebDav Path to resource
+        :type success_codes: Tuple
+        :param success_codes: The codes a complete success is answered with
+        :type response: aiohttp.ClientResponse Object
+        :param response: The response
+
+        :rtype: None
+        :return: None
+
+        :raises MultiStatusFailed: If the multistatus lists failed resources
+
+        """
+        try:
+            if response.status == 207:
+                failures = failed_responses(iter_response_elements([await response.read()]))
+                if failures:
+                    raise MultiStatusFailed(method, path, success_codes, 207, failures)
+
+        finally:
+            response.release()
+
+    async def upload(self, local_path_or_fileobj, remote_path):
+        """
+        Method to upload files to WebDav Server
+
+        Bytes, bytearray and memoryview buffers and binary file objects are sent
+        with a Content-Length, an async iterable of bytes chunks is sent with
+        chunked transfer encoding.  File objects are read in the event loop's
+        default executor.
+
+        :type local_path_or_fileobj: String, File Object, Bytes or AsyncIterable
+        :param local_path_or_fileobj: The path, a binary file object, a buffer, or an async iterable of bytes chunks
+        :type remote_path: String
+        :param remote_path: The path
+
+        :rtype: None
+        :return: None
+
+        """
+        expected_codes = (200, 201, 204)
+        if not self._is_local_path(local_path_or_fileobj):
+            data = local_path_or_fileobj
+            if isinstance(data, memoryview) and data.format != 'B':
+                # Lengths are counted in bytes, not items
+                data = data.cast('B')
+
+            response = await self._send('PUT', remote_path, expected_codes, data=data)
+            response.release()
+            return
+
+        with open(local_path_or_fileobj, 'rb') as file:
+            response = await self._send('PUT', remote_path, expected_codes, data=file)
+            response.release()
+
+    async def download(self, remote_path, local_path_or_fileobj):
+        """
+        Method to download files from WebDav server
+
+        The target can be a local path, a writable binary file object, or a
+        bytearray or writable memoryview that the body is copied into.
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type local_path_or_fileobj: String, File Object or Buffer
+        :param local_path_or_fileobj: The path, a writable binary file object, or a writable buffer
+
+        :rtype: Integer
+        :return: The number of bytes read into a buffer target, otherwise None
+
+        :raises BufferTooSmall: If the body does not fit in a buffer target
+
+        """
+        if isinstance(local_path_or_fileobj, (bytearray, memoryview)):
+            return await self.__download_into(remote_path, local_path_or_fileobj)
+
+        expected_codes = 200
+        response = await self._send('GET', remote_path, expected_codes)
+        try:
+            if not self._is_local_path(local_path_or_fileobj):
+                await self.__write_response(response, local_path_or_fileobj)
+                return
+
+            with open(local_path_or_fileobj, 'wb') as file:
+                await self.__write_response(response, file)
+
+        finally:
+            response.release()
+
+    async def __write_response(self, response, file):
+        """
+        Method to write a response body to a file
+
+        :type response: aiohttp.ClientResponse Object
+        :param response: A response
+        :type file: File Object
+        :param file: The file to write to
+
+        :rtype: None
+        :return: None
+
+        """
+        async for chunk in response.content.iter_chunked(self.download_chunk_size_bytes):
+            file.write(chunk)
+
+    async def __download_into(self, remote_path, buffer):
+        """
+        Method to copy a resource into a writable buffer
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type buffer: Buffer
+        :param buffer: A bytearray or writable memoryview
+
+        :rtype: Integer
+        :return: The number of bytes read
+
+        :raises BufferTooSmall: If the body does not fit in the buffer
+
+        """
+        with memoryview(buffer) as buffer_view, buffer_view.cast('B') as view:
+            response = await self._send('GET', remote_path, 200, headers={'Accept-Encoding': 'identity'})
+            try:
+                length = response.headers.get('Content-Length')
+                if length is not None and int(length) > len(view):
+                    raise BufferTooSmall('Method download {path} is {length} bytes, the buffer holds '
+                                         '{size}'.format(path=remote_path, length=length, size=len(view)))
+
+                position = 0
+                async for chunk in response.content.iter_chunked(self.download_chunk_size_bytes):
+                    if position + len(chunk) > len(view):
+                        raise BufferTooSmall('Method download {path} does not fit in a buffer of {size} '
+                                             'bytes'.format(path=remote_path, size=len(view)))
+
+                    view[position:position + len(chunk)] = chunk
+                    position += len(chunk)
+
+                return position
+
+            finally:
+                response.release()
+
+    async def resource_list(self, remote_path='.', properties=None):
+        """
+        Method to list resources on the WebDav server
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: Iterable
+        :param properties: The properties to ask for, defaults to the ones FileData stores
+
+        :type: List
+        :return: A list of FileData objects
+
+        """
+        return [file_data async for file_data in self.iter_resources(remote_path, properties)]
+
+    async def iter_resources(self, remote_path='.', properties=None, depth=1):
+        """
+        Method to lazily list resources on the WebDav server
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: Iterable
+        :param properties: The properties to ask for, defaults to the ones FileData stores
+        :type depth: Integer or String
+        :param depth: The Depth header, 0, 1 or infinity
+
+        :rtype: AsyncGenerator
+        :return: An async generator of FileData objects
+
+        """
+        propfind_chunk_size_bytes = 64 * 1024
+        if properties is not None:
+            properties = list(properties)
+
+        extra_tags = self._extra_tags(properties)
+        response = await self._propfind(remote_path, properties, depth)
+        parser = MultistatusStreamParser()
+        try:
+            async for chunk in response.content.iter_chunked(propfind_chunk_size_bytes):
+                for element in parser.feed(chunk):
+                    yield FileData(*self._file_values(element, extra_tags))
+
+            for element in parser.close():
+                yield FileData(*self._file_values(element, extra_tags))
+
+        finally:
+            response.release()
+
+    async def _propfind(self, remote_path, properties=None, depth=1):
+        """
+        Method to send a PROPFIND following redirects, the body is left unread
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: Iterable
+        :param properties: The properties to ask for, defaults to the ones FileData stores
+        :type depth: Integer
+        :param depth: The Depth header
+
+        :rtype: aiohttp.ClientResponse Object
+        :return: A response
+
+        """
+        body = DEFAULT_PROPFIND_BODY if properties is None else build_propfind_body(properties)
+        headers = {'Depth': str(depth), 'Content-Type': 'application/xml; charset="utf-8"'}
+        expected_codes = (207, 301)
+        response = await self._send('PROPFIND', remote_path, expected_codes, headers=headers, data=body)
+
+        # Redirect
+        if response.status == 301:
+            response.release()
+            url = urlparse(response.headers['location'])
+            return await self._propfind(url.path, properties, depth)
+
+        return response
+
+    async def resource_exists(self, remote_path):
+        """
+        Method to verify if a resource exists on the WebDav server
+
+        :type remote_path: String
+        :param remote_path: The path
+
+        :rtype: Boolean
+        :return: True or False
+
+        """
+        expected_codes = (200, 301, 404)
+        response = await self._send('HEAD', remote_path, expected_codes)
+        response.release()
+        return True if response.status != 404 else False
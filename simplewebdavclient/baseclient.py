@@ -0,0 +1,331 @@
+import logging
+import copy
+from numbers import Number
+from urllib.parse import urlparse, unquote, quote
+from .exceptions import CouldNotDetermineProtocol, OperationFailed
+from .multistatus import file_record, property_tag, PROPERTY_TAGS
+from .checkers import check_tcp_udp_port_number
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+
+class BaseClient(object):
+    """
+    Class for the parts of a WebDav Client that do not do I/O
+
+    Holds the base url, working directory and credentials, and the path and
+    multistatus helpers shared by Client and AsyncClient
+
+    :type host: String
+    :param host: IP of the server
+    :type port: Integer
+    :param port: The TCT/UDP Port Number
+    :type auth: String
+    :param auth: Session auth
+    :type username: String
+    :param username: Username
+    :type password: String
+    :param password: Password
+    :type protocol: String
+    :param protocol: http, or https
+    :type verify_ssl: Boolean
+    :param verify_ssl: True or False
+    :type path: String
+    :param path: The path to the resource
+    :type cert: String
+    :param cert: Session cert
+
+    :raises CouldNotDetermineProtocol: If protocol is not http or https
+
+    """
+
+    def __init__(self, host, port=None, auth=None, username=None, password=None,
+                 protocol='http', verify_ssl=True, path=None, cert=None):
+        if not port:
+            if protocol == 'http':
+                port = 80
+
+            elif protocol == 'https':
+                port = 443
+
+            else:
+                raise CouldNotDetermineProtocol('Class: {class_name} could not determine port for '
+                                                '{protocol} port given was '
+                                                '{port}'.format(class_name=type(self), protocol=protocol, port=port))
+
+        check_tcp_udp_port_number(port)
+
+        self.base_url = '{protocol}://{host}:{port}'.format(protocol=protocol, host=host, port=port)
+        if path:
+            self.base_url = '{base_url}/{path}'.format(base_url=self.base_url, path=path)
+
+        self.current_working_directory = '/'
+        self.owns_transport = True
+
+        # Kept per Client and sent with every request so a shared transport is never changed
+        self.verify_ssl = verify_ssl
+        self.cert = cert
+        self.auth = None
+        if auth:
+            self.auth = auth
+
+        elif username and password:
+            self.auth = (username, password)
+
+    @staticmethod
+    def _check_status(method, path, expected_code, status_code):
+        """
+        Method to check a response status against the expected codes
+
+        :type method: String
+        :param method: WebDav Method
+        :type path: String
+        :param path: WebDav Path to resource
+        :type expected_code: Number
+        :param expected_code: Expected HTTP Status Codes
+        :type status_code: Integer
+        :param status_code: The response status code
+
+        :rtype: None
+        :return: None
+
+        :raises OperationFailed: If the status code was not expected
+
+        """
+        if isinstance(expected_code, Number) and status_code != expected_code\
+                or not isinstance(expected_code, Number) and status_code not in expected_code:
+            raise OperationFailed(method, path, expected_code, status_code)
+
+    def _get_url(self, path):
+        """
+        Method used to get a good url
+
+        :type path: String
+        :param path: Path from the root directory
+
+        :rtype: String
+        :return: A good url
+
+        """
+        path = str(path).strip()
+        if path.startswith('/'):
+            return self.base_url + path
+
+        return "".join((self.base_url, self.current_working_directory, path))
+
+    def _destination_url(self, path):
+        """
+        Method to get the url for a Destination header, quoted the way the request line is
+
+        :type path: String
+        :param path: Path from the root directory
+
+        :rtype: String
+        :return: A quoted url
+
+        """
+        return quote(self._get_url(path), safe="!#$%&'()*+,/:;=?@[]~")
+
+    def _absolute_path(self, path):
+        """
+        Method to turn a path into a path from your root
+
+        :type path: String
+        :param path: Path from your root, or relative to the current working directory
+
+        :rtype: String
+        :return: A path from your root
+
+        """
+        path = str(path).strip()
+        if path.startswith('/'):
+            return path
+
+        return self.current_working_directory + path
+
+    def change_current_working_directory(self, path):
+        """
+        Method to change your current working directory
+
+        :type path: String
+        :param path: Path from your root
+
+        :rtype: None
+        :return: None
+
+        """
+        self.current_working_directory = self._join_working_directory(self.current_working_directory, path)
+
+    def at(self, path):
+        """
+        Method to get a Client scoped to another working directory
+
+        The scoped Client shares the connection pool, auth and caches of this one
+        but has its own working directory, so scoped Clients can be handed to
+        threads without them changing each other's paths
+
+        :type path: String
+        :param path: Path from your root, or relative to the current working directory
+
+        :rtype: Client
+        :return: A scoped Client
+
+        """
+        scoped = copy.copy(self)
+        scoped.owns_transport = False
+        scoped.current_working_directory = self._join_working_directory(self.current_working_directory, path)
+        return scoped
+
+    @staticmethod
+    def _is_local_path(local_path_or_fileobj):
+        """
+        Method to check if an upload source or download target is a local path
+
+        :type local_path_or_fileobj: Object
+        :param local_path_or_fileobj: The source or target
+
+        :rtype: Boolean
+        :return: True or False
+
+        """
+        return isinstance(local_path_or_fileobj, str) or hasattr(local_path_or_fileobj, '__fspath__')
+
+    @staticmethod
+    def _join_working_directory(working_directory, path):
+        """
+        Method to work out a working directory after changing into path
+
+        :type working_directory: String
+        :param working_directory: The working directory to start from
+        :type path: String
+        :param path: Path from your root, or relative to working_directory
+
+        :rtype: String
+        :return: The new working directory
+
+        """
+        path = path.strip()
+        if not path:
+            return working_directory
+
+        stripped_path = '/'.join(part for part in path.split('/') if part) + '/'
+        if stripped_path == '/':
+            return stripped_path
+
+        elif path.startswith('/'):
+            return '/' + stripped_path
+
+        return working_directory + stripped_path
+
+    def _href_to_path(self, href):
+        """
+        Method to turn a href from a multistatus response into a path from your root
+
+        :type href: String
+        :param href: The href, a path or a full url
+
+        :rtype: String
+        :return: A path from your root
+
+        """
+        path = urlparse(href).path
+        base_path = urlparse(self.base_url).path.rstrip('/')
+        if base_path and (path == base_path or path.startswith(base_path + '/')):
+            path = path[len(base_path):]
+
+        return path or '/'
+
+    @staticmethod
+    def _href_key(href):
+        """
+        Method to normalize a href so the same resource always gives the same key
+
+        :type href: String
+        :param href: The href, a path or a full url
+
+        :rtype: String
+        :return: The key
+
+        """
+        return unquote(urlparse(href).path).rstrip('/')
+
+    def get_current_working_directory(self):
+        """
+        Method to get current working directory
+
+        :rtype: String
+        :return: The current working directory
+
+        """
+        return self.current_working_directory
+
+    def get_base_url(self):
+        """
+        Method to get base url
+
+        :rtype: String
+        :return: The base url
+
+        """
+        return self.base_url
+
+    @staticmethod
+    def get_xml_element(element, element_name, default=None):
+        """
+        Method to retrieve the data from the xml tree
+
+        :type element: String
+        :param element: The xml element
+        :type element_name: String
+        :param element_name: The property
+        :type default: String
+        :param default: What to set default to
+
+        :rtype: String
+        :return: A String
+
+        """
+        child = element.find('.//{DAV:}' + element_name)
+        return default if child is None else child.text
+
+    @staticmethod
+    def _extra_tags(properties):
+        """
+        Method to work out which requested properties FileData has no field for
+
+        :type properties: List
+        :param properties: The properties asked for, None for the defaults
+
+        :rtype: Set
+        :return: A set of namespaced property tags, or None
+
+        """
+        if properties is None:
+            return None
+
+        return set(property_tag(name) for name in properties) - set(PROPERTY_TAGS)
+
+    @staticmethod
+    def _file_values(element, extra_tags=None):
+        """
+        Method to get the FileData arguments from a response element
+
+        :type element: String
+        :param element: The xml element
+        :type extra_tags: Set
+        :param extra_tags: Namespaced property tags to keep besides the FileData fields
+
+        :rtype: Tuple
+        :return: The resource url, name, size, modified time, creation time, content type, other properties, etag
+                 and collection flag
+
+        """
+        return file_record(element, extra_tags)
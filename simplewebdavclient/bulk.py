@@ -0,0 +1,91 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+
+class BulkResult(object):
+    """
+    Class to store the outcome of one item of a bulk operation
+
+    :type item: Object
+    :param item: The item that was worked on, for transfers a (source, destination) tuple
+    :type result: Object
+    :param result: What the operation returned
+    :type error: Exception
+    :param error: The error raised, None if it worked
+
+    """
+
+    __slots__ = ('item', 'result', 'error')
+
+    def __init__(self, item, result=None, error=None):
+        self.item = item
+        self.result = result
+        self.error = error
+
+    def __repr__(self):
+        return '{class_name}(item={item!r}, ok={ok})'.format(class_name=type(self).__name__, item=self.item,
+                                                             ok=self.ok)
+
+    @property
+    def ok(self):
+        """
+        Property to check if the item worked
+
+        :rtype: Boolean
+        :return: True or False
+
+        """
+        return self.error is None
+
+
+def run_concurrently(func, items, max_workers=8, progress=None):
+    """
+    Function to call func on every item over a pool of threads
+
+    Errors are caught per item instead of stopping the whole run
+
+    :type func: Callable
+    :param func: Called with each item
+    :type items: Iterable
+    :param items: The items to work on
+    :type max_workers: Integer
+    :param max_workers: The most calls to run at once
+    :type progress: Callable
+    :param progress: Called as progress(completed, total, bulk_result) after every item
+
+    :rtype: List
+    :return: A list of BulkResult objects in the same order as items
+
+    """
+    items = list(items)
+    results = [None] * len(items)
+    total = len(items)
+    if not total:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = dict((executor.submit(func, item), index) for index, item in enumerate(items))
+        for completed, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            try:
+                result = BulkResult(items[index], result=future.result())
+
+            except Exception as e:
+                LOGGER.debug('Function run_concurrently item {item} failed {error}'.format(item=items[index], error=e))
+                result = BulkResult(items[index], error=e)
+
+            results[index] = result
+            if progress is not None:
+                progress(completed, total, result)
+
+    return results
@@ -0,0 +1,216 @@
+import logging
+import time
+import threading
+from collections import OrderedDict
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+
+class CacheEntry(object):
+    """
+    Class to store one cached response
+
+    :type etag: String
+    :param etag: The ETag header of the response
+    :type last_modified: String
+    :param last_modified: The Last-Modified header of the response
+    :type value: Object
+    :param value: What is served when the server answers 304
+    :type size: Integer
+    :param size: The approximate size of value in bytes
+
+    """
+
+    __slots__ = ('etag', 'last_modified', 'value', 'size', 'stored_at')
+
+    def __init__(self, etag, last_modified, value, size):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.value = value
+        self.size = size
+        self.stored_at = time.monotonic()
+
+    def conditional_headers(self):
+        """
+        Method to get the headers that revalidate this entry
+
+        :rtype: Dict
+        :return: If-None-Match and or If-Modified-Since headers
+
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+
+class ResponseCache(object):
+    """
+    Class for a thread safe LRU cache of responses validated with ETag and Last-Modified
+
+    Entries are revalidated with the server on every use, a 304 answer is
+    counted as a hit.  Entries older than ttl are dropped, and the least
+    recently used entries are evicted to stay within max_entries and max_bytes.
+
+    :type max_entries: Integer
+    :param max_entries: The most entries to keep
+    :type max_bytes: Integer
+    :param max_bytes: The most bytes of cached values to keep
+    :type max_entry_bytes: Integer
+    :param max_entry_bytes: Bodies bigger than this are never cached
+    :type ttl: Float
+    :param ttl: Seconds an entry is kept, None keeps it until evicted
+
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, max_entry_bytes=1 * 1024 * 1024, ttl=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Method to get an entry to revalidate
+
+        :type key: Tuple
+        :param key: The cache key
+
+        :rtype: CacheEntry
+        :return: The entry, or None if there is none or it expired
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if self.ttl is not None and time.monotonic() - entry.stored_at > self.ttl:
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, etag, last_modified, value, size):
+        """
+        Method to store a response, it is skipped without a validator or when too big
+
+        :type key: Tuple
+        :param key: The cache key
+        :type etag: String
+        :param etag: The ETag header of the response
+        :type last_modified: String
+        :param last_modified: The Last-Modified header of the response
+        :type value: Object
+        :param value: What to serve when the server answers 304
+        :type size: Integer
+        :param size: The approximate size of value in bytes
+
+        :rtype: None
+        :return: None
+
+        """
+        if not (etag or last_modified) or size > self.max_entry_bytes:
+            self.invalidate(key)
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = CacheEntry(etag, last_modified, value, size)
+            self.current_bytes += size
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """
+        Method to drop an entry
+
+        :type key: Tuple
+        :param key: The cache key
+
+        :rtype: None
+        :return: None
+
+        """
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """
+        Method to drop every entry, the counters are kept
+
+        :rtype: None
+        :return: None
+
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def record(self, hit):
+        """
+        Method to count a hit or a miss
+
+        :type hit: Boolean
+        :param hit: True for a hit, False for a miss
+
+        :rtype: None
+        :return: None
+
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """
+        Method to get the cache counters
+
+        :rtype: Dict
+        :return: The hits, misses, evictions, entries and bytes
+
+        """
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, evictions=self.evictions, entries=len(self._entries),
+                        bytes=self.current_bytes)
+
+    def _remove(self, key):
+        """
+        Method to drop an entry, the lock has to be held
+
+        :type key: Tuple
+        :param key: The cache key
+
+        :rtype: None
+        :return: None
+
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
@@ -0,0 +1,175 @@
+import logging
+import threading
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+# Trie key marking a collection the Client made, names are never None
+_CREATED = None
+
+
+def split_path(path):
+    """
+    Function to split a path from the root into its names
+
+    :type path: String
+    :param path: Path from the root
+
+    :rtype: Tuple
+    :return: The names in the path
+
+    """
+    return tuple(part for part in path.split('/') if part)
+
+
+class CollectionCache(object):
+    """
+    Class to remember the collections known to exist on the server
+
+    Paths are kept in a trie of names under the root they are on, the base
+    url of a Client, so Clients pointing at other servers or paths can share
+    one cache.  A path is known when every name down to it is.  Collections
+    the Client made itself are flagged, nothing it has not seen can be inside
+    them yet.  The cache only ever learns from successful requests, deletes
+    and moves made by the Client drop the subtree again.  Changes made by
+    other clients are not seen, call clear when the server may have changed.
+
+    """
+
+    def __init__(self):
+        self._roots = {}
+        self._lock = threading.Lock()
+        self._path_locks = {}
+
+    def lookup(self, root, parts):
+        """
+        Method to find the deepest known collection of a path
+
+        :type root: String
+        :param root: The base url the path is under
+        :type parts: Tuple
+        :param parts: The names in the path
+
+        :rtype: Tuple
+        :return: The number of leading names known to exist, and True if the Client made that collection
+
+        """
+        with self._lock:
+            node = self._roots.get(root)
+            if node is None:
+                return 0, False
+
+            for depth, part in enumerate(parts):
+                child = node.get(part)
+                if child is None:
+                    return depth, _CREATED in node
+
+                node = child
+
+            return len(parts), _CREATED in node
+
+    def known_depth(self, root, parts):
+        """
+        Method to count how many leading names of a path are known collections
+
+        :type root: String
+        :param root: The base url the path is under
+        :type parts: Tuple
+        :param parts: The names in the path
+
+        :rtype: Integer
+        :return: The number of leading names known to exist
+
+        """
+        return self.lookup(root, parts)[0]
+
+    def add(self, root, parts, created=False):
+        """
+        Method to record a collection, and so all of its parents, as existing
+
+        :type root: String
+        :param root: The base url the path is under
+        :type parts: Tuple
+        :param parts: The names in the path
+        :type created: Boolean
+        :param created: If set to True the collection was just made and is empty
+
+        :rtype: None
+        :return: None
+
+        """
+        with self._lock:
+            node = self._roots.setdefault(root, {})
+            for part in parts:
+                node = node.setdefault(part, {})
+
+            if created:
+                node[_CREATED] = True
+
+            self._path_locks.pop((root, parts), None)
+
+    def discard(self, root, parts):
+        """
+        Method to forget a collection and everything under it
+
+        :type root: String
+        :param root: The base url the path is under
+        :type parts: Tuple
+        :param parts: The names in the path, empty to forget everything under root
+
+        :rtype: None
+        :return: None
+
+        """
+        with self._lock:
+            if not parts:
+                self._roots.pop(root, None)
+                return
+
+            node = self._roots.get(root)
+            if node is None:
+                return
+
+            for part in parts[:-1]:
+                node = node.get(part)
+                if node is None:
+                    return
+
+            node.pop(parts[-1], None)
+
+    def clear(self):
+        """
+        Method to forget every collection
+
+        :rtype: None
+        :return: None
+
+        """
+        with self._lock:
+            self._roots.clear()
+
+    def path_lock(self, root, parts):
+        """
+        Method to get the lock threads hold while creating a collection
+
+        The lock is dropped from the cache once the collection is known, so
+        threads must check the cache again after taking it
+
+        :type root: String
+        :param root: The base url the path is under
+        :type parts: Tuple
+        :param parts: The names in the path
+
+        :rtype: threading.Lock
+        :return: The lock for the path
+
+        """
+        with self._lock:
+            return self._path_locks.setdefault((root, parts), threading.Lock())
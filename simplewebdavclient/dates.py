@@ -0,0 +1,221 @@
+import logging
+from calendar import monthrange
+from datetime import datetime, timezone
+from email.utils import parsedate_tz, mktime_tz
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+_MONTHS = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+           'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+
+# Epoch seconds at midnight keyed by the date part of a date string, listings repeat few days
+_DAY_CACHE = {}
+_DAY_CACHE_MAX_ENTRIES = 65536
+
+
+def epoch_from_fields(year, month, day, hour=0, minute=0, second=0):
+    """
+    Function to turn UTC date fields into epoch seconds without going through time or datetime
+
+    :type year: Integer
+    :param year: The year
+    :type month: Integer
+    :param month: The month, 1 to 12
+    :type day: Integer
+    :param day: The day of the month
+    :type hour: Integer
+    :param hour: The hour
+    :type minute: Integer
+    :param minute: The minute
+    :type second: Integer
+    :param second: The second
+
+    :rtype: Integer
+    :return: Seconds since the epoch
+
+    """
+    # Days from civil, counting years from March so the leap day comes last
+    if month <= 2:
+        year -= 1
+
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    days = era * 146097 + day_of_era - 719468
+    return days * 86400 + hour * 3600 + minute * 60 + second
+
+
+def _cache_day(key, epoch):
+    """
+    Function to remember the epoch of a date part
+
+    :type key: String
+    :param key: The date part of a date string
+    :type epoch: Integer
+    :param epoch: Epoch seconds at midnight of that day
+
+    :rtype: Integer
+    :return: The epoch
+
+    """
+    if len(_DAY_CACHE) >= _DAY_CACHE_MAX_ENTRIES:
+        _DAY_CACHE.clear()
+
+    _DAY_CACHE[key] = epoch
+    return epoch
+
+
+def _unparsable(function, value):
+    """
+    Function to log a date string that could not be parsed
+
+    :type function: String
+    :param function: The name of the parsing function
+    :type value: String
+    :param value: The date string
+
+    :rtype: None
+    :return: None
+
+    """
+    LOGGER.debug('Function {function} could not parse {value}'.format(function=function, value=value))
+    return None
+
+
+def parse_http_date(value):
+    """
+    Function to parse a RFC 1123 date like getlastmodified into epoch seconds
+
+    Dates in the fixed "Sun, 06 Nov 1994 08:49:37 GMT" layout are read by
+    position, anything else goes through email.utils
+
+    :type value: String
+    :param value: The date string
+
+    :rtype: Float
+    :return: Seconds since the epoch, or None if it could not be parsed
+
+    """
+    if not value:
+        return None
+
+    if len(value) == 29 and value[3] == ',' and value.endswith(' GMT'):
+        day = _DAY_CACHE.get(value[5:16])
+        try:
+            if day is None:
+                month = _MONTHS.get(value[8:11])
+                if month is not None:
+                    year, day_of_month = int(value[12:16]), int(value[5:7])
+                    # email.utils would roll a 31 Feb over into March, the layout is strict enough to refuse it
+                    if not 1 <= day_of_month <= monthrange(year, month)[1]:
+                        return _unparsable('parse_http_date', value)
+
+                    day = _cache_day(value[5:16], epoch_from_fields(year, month, day_of_month))
+
+            if day is not None:
+                hour, minute, second = int(value[17:19]), int(value[20:22]), int(value[23:25])
+                if hour > 23 or minute > 59 or second > 59:
+                    return _unparsable('parse_http_date', value)
+
+                return float(day + hour * 3600 + minute * 60 + second)
+
+        except ValueError:
+            pass
+
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return _unparsable('parse_http_date', value)
+
+    return float(mktime_tz(parsed))
+
+
+def parse_iso8601_date(value):
+    """
+    Function to parse an ISO 8601 date like creationdate into epoch seconds
+
+    Dates like "1997-12-01T17:42:21Z", with optional fractions and a +hh:mm
+    offset, are read by position, anything else goes through datetime
+
+    :type value: String
+    :param value: The date string
+
+    :rtype: Float
+    :return: Seconds since the epoch, or None if it could not be parsed
+
+    """
+    if not value:
+        return None
+
+    if len(value) >= 19 and value[4] == '-' and value[7] == '-' and value[10] in 'Tt ':
+        try:
+            day = _DAY_CACHE.get(value[:10])
+            if day is None:
+                year, month, day_of_month = int(value[0:4]), int(value[5:7]), int(value[8:10])
+                # Refuse what datetime refuses, epoch_from_fields would roll a 31 Feb over into March
+                if not 1 <= month <= 12 or not 1 <= day_of_month <= monthrange(year, month)[1]:
+                    raise ValueError(value)
+
+                day = _cache_day(value[:10], epoch_from_fields(year, month, day_of_month))
+
+            hour, minute, second = int(value[11:13]), int(value[14:16]), int(value[17:19])
+            if hour > 23 or minute > 59 or second > 59:
+                raise ValueError(value)
+
+            epoch = float(day + hour * 3600 + minute * 60 + second)
+            rest = value[19:]
+            if rest[:1] in ('.', ','):
+                digits = 1
+                while digits < len(rest) and rest[digits].isdigit():
+                    digits += 1
+
+                if digits > 1:
+                    epoch += float('0.' + rest[1:digits])
+
+                rest = rest[digits:]
+
+            if rest in ('Z', 'z', ''):
+                return epoch
+
+            if rest[0] in '+-' and len(rest) in (5, 6):
+                offset = int(rest[1:3]) * 3600 + int(rest[-2:]) * 60
+                return epoch - offset if rest[0] == '+' else epoch + offset
+
+        except ValueError:
+            pass
+
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+    except ValueError:
+        return _unparsable('parse_iso8601_date', value)
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return parsed.timestamp()
+
+
+def epoch_to_datetime(epoch):
+    """
+    Function to turn epoch seconds into an aware UTC datetime
+
+    :type epoch: Float
+    :param epoch: Seconds since the epoch, or None
+
+    :rtype: datetime
+    :return: The datetime, or None
+
+    """
+    if epoch is None:
+        return None
+
+    return datetime.fromtimestamp(epoch, timezone.utc)
@@ -21,6 +21,8 @@ class OperationFailed(Exception):
         DELETE="delete",
         MKCOL="create directory",
         PROPFIND="list directory",
+        COPY="copy",
+        MOVE="move",
         )
 
     def __init__(self, method, path, expected_code, actual_code):
@@ -41,6 +43,16 @@ class OperationFailed(Exception):
         LOGGER.critical(msg)
 
 
+class MultiStatusFailed(OperationFailed):
+
+    def __init__(self, method, path, expected_code, actual_code, failures):
+        self.failures = failures
+        super(MultiStatusFailed, self).__init__(method, path, expected_code, actual_code)
+        failures_str = "\n".join('             {0} {1}'.format(href, status) for href, status in failures)
+        LOGGER.critical('{self.reason}, {count} resources failed:\n{failures_str}'.format(count=len(failures),
+                                                                                           **locals()))
+
+
 class BadPortNumber(Exception):
 
     def __init__(self, value):
@@ -69,3 +81,23 @@ class CouldNotDetermineProtocol(Exception):
     def __str__(self):
         LOGGER.critical(self.value)
         return repr(self.value)
+
+
+class MissingDependency(Exception):
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        LOGGER.critical(self.value)
+        return repr(self.value)
+
+
+class BufferTooSmall(Exception):
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        LOGGER.critical(self.value)
+        return repr(self.value)
@@ -0,0 +1,422 @@
+import logging
+from array import array
+from .dates import parse_http_date, parse_iso8601_date, epoch_to_datetime
+from .multistatus import property_tag
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+# Stand in for an unknown or unparsable time in ResourceTable.modified_epochs
+UNKNOWN_TIME = float('-inf')
+
+# Marks a FileData time that has not been parsed yet, None is a time that could not be parsed
+_UNPARSED = object()
+
+
+class FileData(object):
+    """
+    Class to store a file info
+
+    :type resource_url: String
+    :param resource_url: The resource URL
+    :type resource_name: String
+    :param resource_name: The name of the resource
+    :type file_size: Integer
+    :param file_size: The file size
+    :type modified_time: String
+    :param modified_time: The modified date/time
+    :type creation_time: String
+    :param creation_time: The creation date/time
+    :type content_type: String
+    :param content_type: The content type
+    :type properties: Dict
+    :param properties: Other requested properties keyed by namespaced name
+    :type etag: String
+    :param etag: The entity tag
+    :type collection: Boolean
+    :param collection: True if the resourcetype is a collection, None if the resourcetype was not received
+
+    The times are parsed the first time modified_epoch, creation_epoch or the
+    datetime properties are read, and kept for later reads
+
+    """
+
+    __slots__ = ('resource_url', 'resource_name', 'file_size', 'modified_time', 'creation_time', 'content_type',
+                 'properties', 'etag', 'collection', '_modified_epoch', '_creation_epoch')
+
+    def __init__(self, resource_url, resource_name, file_size, modified_time, creation_time, content_type,
+                 properties=None, etag=None, collection=None):
+        self.resource_url = resource_url
+        self.resource_name = resource_name
+        self.file_size = file_size
+        self.modified_time = modified_time
+        self.creation_time = creation_time
+        self.content_type = content_type
+        self.properties = properties
+        self.etag = etag
+        self.collection = collection
+        self._modified_epoch = _UNPARSED
+        self._creation_epoch = _UNPARSED
+
+    @property
+    def modified_epoch(self):
+        """
+        Property with the modified time in seconds since the epoch
+
+        :rtype: Float
+        :return: The epoch time, None if it is missing or could not be parsed
+
+        """
+        if self._modified_epoch is _UNPARSED:
+            self._modified_epoch = parse_http_date(self.modified_time)
+
+        return self._modified_epoch
+
+    @property
+    def creation_epoch(self):
+        """
+        Property with the creation time in seconds since the epoch
+
+        :rtype: Float
+        :return: The epoch time, None if it is missing or could not be parsed
+
+        """
+        if self._creation_epoch is _UNPARSED:
+            self._creation_epoch = parse_iso8601_date(self.creation_time)
+
+        return self._creation_epoch
+
+    @property
+    def modified_datetime(self):
+        """
+        Property with the modified time as an aware UTC datetime
+
+        :rtype: datetime
+        :return: The datetime, None if it is missing or could not be parsed
+
+        """
+        return epoch_to_datetime(self.modified_epoch)
+
+    @property
+    def creation_datetime(self):
+        """
+        Property with the creation time as an aware UTC datetime
+
+        :rtype: datetime
+        :return: The datetime, None if it is missing or could not be parsed
+
+        """
+        return epoch_to_datetime(self.creation_epoch)
+
+    def get_resource_url(self):
+        """
+        Method to get the WebDav resource url
+
+        :rtype: String
+        :return: A resource url
+
+        """
+        return self.resource_url
+
+    def get_resource_name(self):
+        """
+        Method to get the WebDav resource name
+
+        :rtype: String
+        :return: A resource name
+
+        """
+        return self.resource_name
+
+    def get_file_size(self):
+        """
+        Method to get the WebDav resource file size
+
+        :rtype: String
+        :return: A resource file size
+
+        """
+        return self.file_size
+
+    def get_modified_time(self):
+        """
+        Method to get the WebDav resource modified date and time
+
+        :rtype: String
+        :return: A resource modified date and time
+
+        """
+        return self.modified_time
+
+    def get_creation_time(self):
+        """
+        Method to get the WebDav resource creation date and time
+
+        :rtype: String
+        :return: A resource creation date and time
+
+        """
+        return self.creation_time
+
+    def get_content_type(self):
+        """
+        Method to get the WebDav resource content type
+
+        :rtype: String
+        :return: A resource content type
+
+        """
+        return self.content_type
+
+    def get_etag(self):
+        """
+        Method to get the WebDav resource entity tag
+
+        :rtype: String
+        :return: A resource entity tag, or None
+
+        """
+        return self.etag
+
+    def get_property(self, name, default=None):
+        """
+        Method to get another requested WebDav property
+
+        :type name: String or Tuple
+        :param name: A name like "{http://owncloud.org/ns}checksums", or a (namespace, name) tuple
+        :type default: String
+        :param default: What to return if the property was not received
+
+        :rtype: String
+        :return: The property text
+
+        """
+        if not self.properties:
+            return default
+
+        return self.properties.get(property_tag(name), default)
+
+    def is_dir(self):
+        """
+        Method to check to see if WebDav resource is a directory
+
+        The resourcetype is used when it was received, otherwise a trailing / on the url
+
+        :rtype: Boolean
+        :return: True or False
+
+        """
+        if self.collection is not None:
+            return self.collection
+
+        if self.resource_url.endswith('/'):
+            return True
+
+        else:
+            return False
+
+
+class ResourceTable(object):
+    """
+    Class to store a listing in columns instead of one FileData object per entry
+
+    Sizes, parsed modified times and the directory flags are kept in array backed
+    storage, so filtering and sorting large listings does not build FileData
+    objects.  Directory flags come from the resourcetype, or a trailing / on
+    the url when the server did not send one.  Methods that select entries return a list of row indexes that can be
+    handed to take.  Modified times that are unknown are stored as UNKNOWN_TIME.
+    Other requested properties are not kept.
+
+    """
+
+    def __init__(self):
+        self.resource_urls = []
+        self.resource_names = []
+        self.modified_times = []
+        self.creation_times = []
+        self.content_types = []
+        self.etags = []
+        self.file_sizes = array('q')
+        self.modified_epochs = array('d')
+        self.dirs = array('b')
+
+    def __len__(self):
+        return len(self.resource_urls)
+
+    def __getitem__(self, index):
+        return self.get_file_data(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.get_file_data(index)
+
+    @classmethod
+    def from_file_data(cls, file_data_objects):
+        """
+        Method to build a ResourceTable from FileData objects
+
+        :type file_data_objects: Iterable
+        :param file_data_objects: An iterable of FileData objects
+
+        :rtype: ResourceTable
+        :return: A ResourceTable
+
+        """
+        table = cls()
+        for file_data in file_data_objects:
+            table.append(file_data)
+
+        return table
+
+    def append(self, file_data):
+        """
+        Method to add a FileData object to the table
+
+        :type file_data: FileData
+        :param file_data: A FileData object
+
+        :rtype: None
+        :return: None
+
+        """
+        self.append_values(file_data.resource_url, file_data.resource_name, file_data.file_size,
+                           file_data.modified_time, file_data.creation_time, file_data.content_type,
+                           etag=file_data.etag, collection=file_data.collection)
+
+    def append_values(self, resource_url, resource_name, file_size, modified_time, creation_time, content_type,
+                      properties=None, etag=None, collection=None):
+        """
+        Method to add a row to the table, the arguments match FileData, properties are not kept
+
+        :rtype: None
+        :return: None
+
+        """
+        modified_epoch = parse_http_date(modified_time)
+        self.resource_urls.append(resource_url)
+        self.resource_names.append(resource_name)
+        self.modified_times.append(modified_time)
+        self.creation_times.append(creation_time)
+        self.content_types.append(content_type)
+        self.etags.append(etag)
+        self.file_sizes.append(file_size)
+        self.modified_epochs.append(UNKNOWN_TIME if modified_epoch is None else modified_epoch)
+        if collection is None:
+            collection = bool(resource_url) and resource_url.endswith('/')
+
+        self.dirs.append(1 if collection else 0)
+
+    def get_file_data(self, index):
+        """
+        Method to build a FileData object for one row
+
+        :type index: Integer
+        :param index: The row index
+
+        :rtype: FileData
+        :return: A FileData object
+
+        """
+        file_data = FileData(resource_url=self.resource_urls[index],
+                             resource_name=self.resource_names[index],
+                             file_size=self.file_sizes[index],
+                             modified_time=self.modified_times[index],
+                             creation_time=self.creation_times[index],
+                             content_type=self.content_types[index],
+                             etag=self.etags[index],
+                             collection=bool(self.dirs[index]))
+        modified_epoch = self.modified_epochs[index]
+        file_data._modified_epoch = None if modified_epoch == UNKNOWN_TIME else modified_epoch
+        return file_data
+
+    def select(self, min_size=None, max_size=None, modified_after=None, modified_before=None, dirs=None):
+        """
+        Method to find the rows matching all of the given conditions
+
+        :type min_size: Integer
+        :param min_size: Smallest file size to keep
+        :type max_size: Integer
+        :param max_size: Largest file size to keep
+        :type modified_after: Float
+        :param modified_after: Keep rows modified at or after this epoch time
+        :type modified_before: Float
+        :param modified_before: Keep rows modified before this epoch time
+        :type dirs: Boolean
+        :param dirs: True for only directories, False for only files, None for both
+
+        :rtype: List
+        :return: A list of row indexes
+
+        """
+        indexes = range(len(self))
+        if min_size is not None:
+            sizes = self.file_sizes
+            indexes = [index for index in indexes if sizes[index] >= min_size]
+
+        if max_size is not None:
+            sizes = self.file_sizes
+            indexes = [index for index in indexes if sizes[index] <= max_size]
+
+        if modified_after is not None:
+            epochs = self.modified_epochs
+            indexes = [index for index in indexes if epochs[index] >= modified_after]
+
+        if modified_before is not None:
+            epochs = self.modified_epochs
+            indexes = [index for index in indexes if epochs[index] < modified_before]
+
+        if dirs is not None:
+            flags = self.dirs
+            wanted = 1 if dirs else 0
+            indexes = [index for index in indexes if flags[index] == wanted]
+
+        return list(indexes)
+
+    def sort_indexes(self, key='resource_urls', reverse=False, indexes=None):
+        """
+        Method to get row indexes ordered by a column
+
+        :type key: String
+        :param key: The column name, for example file_sizes or modified_epochs
+        :type reverse: Boolean
+        :param reverse: True for descending order
+        :type indexes: List
+        :param indexes: Only sort these rows, defaults to all rows
+
+        :rtype: List
+        :return: A list of row indexes
+
+        """
+        column = getattr(self, key)
+        if indexes is None:
+            indexes = range(len(self))
+
+        return sorted(indexes, key=column.__getitem__, reverse=reverse)
+
+    def take(self, indexes):
+        """
+        Method to build a new ResourceTable from some of the rows
+
+        :type indexes: Iterable
+        :param indexes: The row indexes to keep, in order
+
+        :rtype: ResourceTable
+        :return: A ResourceTable
+
+        """
+        indexes = list(indexes)
+        table = type(self)()
+        for name in ('resource_urls', 'resource_names', 'modified_times', 'creation_times', 'content_types',
+                     'etags', 'file_sizes', 'modified_epochs', 'dirs'):
+            column = getattr(self, name)
+            new_column = getattr(table, name)
+            new_column.extend(column[index] for index in indexes)
+
+        return table
@@ -0,0 +1,516 @@
+import logging
+import posixpath
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import quote, unquote, urlsplit
+from .exceptions import OperationFailed
+from .filedata import FileData, ResourceTable
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS entries ('
+    'path TEXT PRIMARY KEY, parent TEXT NOT NULL, resource_url TEXT, resource_name TEXT, '
+    'collection INTEGER NOT NULL, file_size INTEGER NOT NULL, modified_epoch REAL, modified_time TEXT, '
+    'creation_time TEXT, content_type TEXT, etag TEXT) WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS entries_parent ON entries (parent)',
+    'CREATE INDEX IF NOT EXISTS entries_file_size ON entries (file_size)',
+    'CREATE INDEX IF NOT EXISTS entries_modified_epoch ON entries (modified_epoch)',
+    'CREATE TABLE IF NOT EXISTS collections ('
+    'path TEXT PRIMARY KEY, etag TEXT, modified_time TEXT) WITHOUT ROWID',
+)
+
+# Columns query results can be ordered by
+ORDER_COLUMNS = ('path', 'file_size', 'modified_epoch')
+
+_COLUMNS = 'resource_url, resource_name, file_size, modified_time, creation_time, content_type, etag, collection'
+_WRITE_BATCH = 1000
+
+
+def _prefix_bounds(prefix):
+    """
+    Function to turn a path prefix into a range of the path index
+
+    :type prefix: String
+    :param prefix: The prefix
+
+    :rtype: Tuple
+    :return: The lowest path and the first path past the prefix
+
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _glob_prefix(pattern):
+    """
+    Function to get the literal start of a glob pattern
+
+    :type pattern: String
+    :param pattern: The glob pattern
+
+    :rtype: String
+    :return: Everything before the first wildcard
+
+    """
+    for position, character in enumerate(pattern):
+        if character in '*?[':
+            return pattern[:position]
+
+    return pattern
+
+
+class ListingIndex(object):
+    """
+    Class for a persistent local index of a remote tree kept in a SQLite file
+
+    The index stores every entry of the listings along with the ETag and
+    getlastmodified of every collection.  A refresh only PROPFINDs collections
+    whose ETag or getlastmodified changed since the last one, so it relies on
+    the server changing those of a collection when anything below it changes,
+    as ownCloud and Nextcloud do.  Use full=True for servers that only change
+    them when the direct members change.  Queries run on the local file only.
+
+    Paths in the index are unquoted paths from the root of the Client, without
+    a trailing /.
+
+    :type database: String
+    :param database: The SQLite file, :memory: for an index that is not kept
+
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._connection = sqlite3.connect(database)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        for statement in SCHEMA:
+            self._connection.execute(statement)
+
+        self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def close(self):
+        """
+        Method to close the SQLite file
+
+        :rtype: None
+        :return: None
+
+        """
+        self._connection.close()
+
+    @staticmethod
+    def _key(path):
+        """
+        Method to turn an unquoted path into an index key
+
+        :type path: String
+        :param path: The path
+
+        :rtype: String
+        :return: The path with a leading / and no trailing /
+
+        """
+        return '/' + path.strip('/')
+
+    @staticmethod
+    def _path(key):
+        """
+        Method to turn the key of a collection back into a path to request
+
+        :type key: String
+        :param key: The key
+
+        :rtype: String
+        :return: The quoted path with a trailing /, so a # or ? in a name stays part of the path
+
+        """
+        return quote(key.rstrip('/')) + '/'
+
+    def refresh(self, client, remote_path='/', max_workers=8, full=False, parser_pool=None):
+        """
+        Method to bring the index of a remote tree up to date
+
+        An empty index, or full=True, is built with Client.walk.  Otherwise the
+        tree is crawled with Depth 1 PROPFINDs from remote_path down, skipping
+        collections whose ETag and getlastmodified did not change.  The refresh
+        is written in one transaction, so an interrupted refresh leaves the index
+        as it was.
+
+        :type client: Client
+        :param client: The Client to list with
+        :type remote_path: String
+        :param remote_path: The collection to index
+        :type max_workers: Integer
+        :param max_workers: The most PROPFINDs to have in flight
+        :type full: Boolean
+        :param full: If set to True every collection is listed again
+        :type parser_pool: concurrent.futures.Executor
+        :param parser_pool: A ProcessPoolExecutor to parse Depth 1 listings in
+
+        :rtype: Dict
+        :return: The collections listed, the collections skipped, the entries written and the entries removed
+
+        """
+        root = self._key(unquote(client._href_to_path(client._get_url(remote_path))))
+        base_path = urlsplit(client.base_url).path.rstrip('/')
+        stats = dict(listed=0, skipped=0, written=0, removed=0)
+        try:
+            if full or self.get(root) is None:
+                self.__rebuild(client, base_path, root, max_workers, parser_pool, stats)
+
+            else:
+                self.__crawl(client, base_path, root, max_workers, parser_pool, stats)
+
+        except BaseException:
+            self._connection.rollback()
+            raise
+
+        self._connection.commit()
+        LOGGER.debug('Method refresh indexed {root} {stats}'.format(root=root, stats=stats))
+        return stats
+
+    def _href_key(self, base_path, href):
+        """
+        Method to get the index key of a listed resource, like Client._href_to_path with the base path worked out once
+
+        :type base_path: String
+        :param base_path: The path of the Client base url without a trailing /
+        :type href: String
+        :param href: The href, a path or a full url
+
+        :rtype: String
+        :return: The key
+
+        """
+        path = urlsplit(href).path
+        if base_path and (path == base_path or path.startswith(base_path + '/')):
+            path = path[len(base_path):]
+
+        return self._key(unquote(path))
+
+    def __rebuild(self, client, base_path, root, max_workers, parser_pool, stats):
+        """
+        Method to replace the index of a tree with a fresh walk
+
+        :type client: Client
+        :param client: The Client to list with
+        :type base_path: String
+        :param base_path: The path of the Client base url without a trailing /
+        :type root: String
+        :param root: The key of the collection to index
+        :type max_workers: Integer
+        :param max_workers: The most PROPFINDs to have in flight if the tree has to be crawled
+        :type parser_pool: concurrent.futures.Executor
+        :param parser_pool: A ProcessPoolExecutor to parse listings in if the tree has to be crawled
+        :type stats: Dict
+        :param stats: The counters to update
+
+        :rtype: None
+        :return: None
+
+        """
+        stats['removed'] += self.__remove_tree(root)
+        rows = []
+        for file_data in client.walk(self._path(root), max_workers=max_workers, parser_pool=parser_pool):
+            key = self._href_key(base_path, file_data.resource_url)
+            if key != root and not key.startswith(root.rstrip('/') + '/'):
+                continue
+
+            rows.append(self.__row(key, file_data))
+            if file_data.is_dir():
+                stats['listed'] += 1
+                self._connection.execute('INSERT OR REPLACE INTO collections VALUES (?, ?, ?)',
+                                         (key, file_data.etag, file_data.modified_time))
+
+            if len(rows) >= _WRITE_BATCH:
+                stats['written'] += self.__write(rows)
+                rows = []
+
+        stats['written'] += self.__write(rows)
+
+    def __crawl(self, client, base_path, root, max_workers, parser_pool, stats):
+        """
+        Method to list again the collections of a tree that changed
+
+        :type client: Client
+        :param client: The Client to list with
+        :type base_path: String
+        :param base_path: The path of the Client base url without a trailing /
+        :type root: String
+        :param root: The key of the collection to index
+        :type max_workers: Integer
+        :param max_workers: The most PROPFINDs to have in flight
+        :type parser_pool: concurrent.futures.Executor
+        :param parser_pool: A ProcessPoolExecutor to parse listings in
+        :type stats: Dict
+        :param stats: The counters to update
+
+        :rtype: None
+        :return: None
+
+        """
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {executor.submit(client.resource_list, self._path(root), parser_pool=parser_pool): root}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    try:
+                        listing = future.result()
+
+                    except OperationFailed as e:
+                        if key == root or e.actual_code != 404:
+                            raise
+
+                        stats['removed'] += self.__remove_tree(key)
+                        continue
+
+                    stats['listed'] += 1
+                    for child_key in self.__store_listing(base_path, key, listing, stats):
+                        pending[executor.submit(client.resource_list, self._path(child_key),
+                                                parser_pool=parser_pool)] = child_key
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+            executor.shutdown(wait=False)
+
+    def __store_listing(self, base_path, key, listing, stats):
+        """
+        Method to write a Depth 1 listing and find the member collections that changed
+
+        :type base_path: String
+        :param base_path: The path of the Client base url without a trailing /
+        :type key: String
+        :param key: The key of the listed collection
+        :type listing: List
+        :param listing: The FileData objects of the listing
+        :type stats: Dict
+        :param stats: The counters to update
+
+        :rtype: List
+        :return: The keys of the member collections to list
+
+        """
+        connection = self._connection
+        known_members = dict(connection.execute('SELECT path, collection FROM entries WHERE parent = ?', (key,)))
+        rows = []
+        changed = []
+        members = set()
+        for file_data in listing:
+            entry_key = self._href_key(base_path, file_data.resource_url)
+            if entry_key == key:
+                rows.append(self.__row(key, file_data))
+                connection.execute('INSERT OR REPLACE INTO collections VALUES (?, ?, ?)',
+                                   (key, file_data.etag, file_data.modified_time))
+                continue
+
+            if posixpath.dirname(entry_key) != key:
+                continue
+
+            members.add(entry_key)
+            rows.append(self.__row(entry_key, file_data))
+            if known_members.get(entry_key) and not file_data.is_dir():
+                stats['removed'] += self.__remove_tree(entry_key)
+
+            elif file_data.is_dir():
+                known = connection.execute('SELECT etag, modified_time FROM collections WHERE path = ?',
+                                           (entry_key,)).fetchone()
+                validators = (file_data.etag, file_data.modified_time)
+                if known is None or validators == (None, None) or tuple(known) != validators:
+                    changed.append(entry_key)
+
+                else:
+                    stats['skipped'] += 1
+
+        for old_key in known_members:
+            if old_key not in members:
+                stats['removed'] += self.__remove_tree(old_key)
+
+        stats['written'] += self.__write(rows)
+        return changed
+
+    def __remove_tree(self, key):
+        """
+        Method to remove an entry and everything below it
+
+        :type key: String
+        :param key: The key
+
+        :rtype: Integer
+        :return: The number of entries removed
+
+        """
+        low, high = _prefix_bounds(key.rstrip('/') + '/')
+        removed = 0
+        for table in ('entries', 'collections'):
+            cursor = self._connection.execute('DELETE FROM {table} WHERE path = ? OR (path >= ? AND path < ?)'.format(
+                table=table), (key, low, high))
+            if table == 'entries':
+                removed = cursor.rowcount
+
+        return removed
+
+    @staticmethod
+    def __row(key, file_data):
+        """
+        Method to build an entries row
+
+        :type key: String
+        :param key: The index key
+        :type file_data: FileData
+        :param file_data: The resource
+
+        :rtype: Tuple
+        :return: The row
+
+        """
+        return (key, posixpath.dirname(key) if key != '/' else '', file_data.resource_url, file_data.resource_name,
+                1 if file_data.is_dir() else 0, file_data.file_size, file_data.modified_epoch,
+                file_data.modified_time, file_data.creation_time, file_data.content_type, file_data.etag)
+
+    def __write(self, rows):
+        """
+        Method to write entries rows, replacing the ones with the same path
+
+        :type rows: List
+        :param rows: The rows
+
+        :rtype: Integer
+        :return: The number of rows written
+
+        """
+        self._connection.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    @staticmethod
+    def _file_data(row):
+        """
+        Method to build a FileData object from a query row
+
+        :type row: Tuple
+        :param row: The row, in the _COLUMNS order
+
+        :rtype: FileData
+        :return: A FileData object
+
+        """
+        return FileData(*row[:6], etag=row[6], collection=bool(row[7]))
+
+    def get(self, path):
+        """
+        Method to look up one entry
+
+        :type path: String
+        :param path: The path from the root of the Client
+
+        :rtype: FileData
+        :return: A FileData object, None if the path is not in the index
+
+        """
+        row = self._connection.execute('SELECT {columns} FROM entries WHERE path = ?'.format(columns=_COLUMNS),
+                                       (self._key(path),)).fetchone()
+        return self._file_data(row) if row is not None else None
+
+    def children(self, path):
+        """
+        Method to list the members of a collection from the index
+
+        :type path: String
+        :param path: The path of the collection
+
+        :rtype: List
+        :return: A list of FileData objects ordered by path
+
+        """
+        return [self._file_data(row) for row in self._connection.execute(
+            'SELECT {columns} FROM entries WHERE parent = ? ORDER BY path'.format(columns=_COLUMNS),
+            (self._key(path),))]
+
+    def query(self, prefix=None, pattern=None, min_size=None, max_size=None, modified_after=None,
+              modified_before=None, dirs=None, order_by='path', reverse=False, limit=None, as_table=False):
+        """
+        Method to find the entries matching all of the given conditions
+
+        :type prefix: String
+        :param prefix: Keep paths starting with this, "/docs/" for everything below /docs
+        :type pattern: String
+        :param pattern: Keep paths matching this case sensitive glob, * also matches /
+        :type min_size: Integer
+        :param min_size: Smallest file size to keep
+        :type max_size: Integer
+        :param max_size: Largest file size to keep
+        :type modified_after: Float
+        :param modified_after: Keep entries modified at or after this epoch time
+        :type modified_before: Float
+        :param modified_before: Keep entries modified before this epoch time
+        :type dirs: Boolean
+        :param dirs: True for only directories, False for only files, None for both
+        :type order_by: String
+        :param order_by: One of ORDER_COLUMNS
+        :type reverse: Boolean
+        :param reverse: True for descending order
+        :type limit: Integer
+        :param limit: The most entries to return
+        :type as_table: Boolean
+        :param as_table: If set to True a columnar ResourceTable is returned
+
+        :rtype: Generator
+        :return: A generator of FileData objects, or a ResourceTable
+
+        :raises ValueError: If order_by is not one of ORDER_COLUMNS
+
+        """
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError('Method query can not order by {order_by}, use one of {columns}'.format(
+                order_by=order_by, columns=ORDER_COLUMNS))
+
+        conditions = []
+        parameters = []
+        for literal in (prefix, _glob_prefix(pattern) if pattern else None):
+            if literal:
+                conditions.append('path >= ? AND path < ?')
+                parameters.extend(_prefix_bounds(literal))
+
+        for condition, value in (('path GLOB ?', pattern), ('file_size >= ?', min_size),
+                                 ('file_size <= ?', max_size), ('modified_epoch >= ?', modified_after),
+                                 ('modified_epoch < ?', modified_before),
+                                 ('collection = ?', None if dirs is None else int(bool(dirs)))):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+
+        statement = 'SELECT {columns} FROM entries{where} ORDER BY {order_by}{direction}'.format(
+            columns=_COLUMNS, where=' WHERE ' + ' AND '.join(conditions) if conditions else '', order_by=order_by,
+            direction=' DESC' if reverse else '')
+        if limit is not None:
+            statement += ' LIMIT ?'
+            parameters.append(limit)
+
+        cursor = self._connection.execute(statement, parameters)
+        if as_table:
+            table = ResourceTable()
+            for row in cursor:
+                table.append_values(*row[:6], etag=row[6], collection=bool(row[7]))
+
+            return table
+
+        return (self._file_data(row) for row in cursor)
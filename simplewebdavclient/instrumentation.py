@@ -0,0 +1,496 @@
+import logging
+import threading
+from bisect import bisect_left
+from .exceptions import MissingDependency
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+
+def body_size(body):
+    """
+    Function to get the size of a request body without reading it
+
+    :type body: Object
+    :param body: The request body
+
+    :rtype: Integer
+    :return: The size in bytes, None if it cannot be known up front
+
+    """
+    if body is None:
+        return 0
+
+    if isinstance(body, memoryview):
+        return body.nbytes
+
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+
+    return None
+
+
+class RequestEvent(object):
+    """
+    Class to store what happened to one request
+
+    :type method: String
+    :param method: The HTTP method
+    :type url: String
+    :param url: The url
+    :type status_code: Integer
+    :param status_code: The final status, None if the request failed
+    :type elapsed: Float
+    :param elapsed: Seconds until the response headers arrived, retries included
+    :type bytes_sent: Integer
+    :param bytes_sent: The request body size, 0 if it was streamed with an unknown size
+    :type bytes_received: Integer
+    :param bytes_received: The response body bytes read, after content decoding, up to where the body was left
+    :type retries: Integer
+    :param retries: The times the request was sent again
+    :type error: Exception
+    :param error: The transport error, None if the server answered
+
+    """
+
+    __slots__ = ('method', 'url', 'status_code', 'elapsed', 'bytes_sent', 'bytes_received', 'retries', 'error')
+
+    def __init__(self, method, url, status_code, elapsed, bytes_sent=0, bytes_received=0, retries=0, error=None):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.retries = retries
+        self.error = error
+
+    def __repr__(self):
+        return '{class_name}(method={method!r}, url={url!r}, status_code={status_code}, ' \
+               'elapsed={elapsed:.3f})'.format(class_name=type(self).__name__, method=self.method, url=self.url,
+                                               status_code=self.status_code, elapsed=self.elapsed)
+
+
+class CountingBody(object):
+    """
+    Class to wrap the raw body of a streamed response and count the bytes read from it
+
+    Reads through iter_content, read and readinto are counted, so chunked
+    bodies and bodies abandoned half way are counted as they were read.  The
+    callback runs once, when the body runs out or the response is closed.
+
+    :type raw: urllib3.response.HTTPResponse
+    :param raw: The raw body of the response
+    :type on_done: Callable
+    :param on_done: Called with the number of bytes read
+
+    """
+
+    def __init__(self, raw, on_done):
+        self._raw = raw
+        self._on_done = on_done
+        self.bytes_read = 0
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def _count(self, size):
+        """
+        Method to add bytes read, no bytes means the body ran out
+
+        :type size: Integer
+        :param size: The bytes read
+
+        :rtype: None
+        :return: None
+
+        """
+        self.bytes_read += size
+        if not size:
+            self._done()
+
+    def _done(self):
+        """
+        Method to run the callback the first time the body is finished with
+
+        :rtype: None
+        :return: None
+
+        """
+        on_done, self._on_done = self._on_done, None
+        if on_done is not None:
+            on_done(self.bytes_read)
+
+    def read(self, *args, **kwargs):
+        data = self._raw.read(*args, **kwargs)
+        self._count(len(data))
+        return data
+
+    def readinto(self, buffer):
+        count = self._raw.readinto(buffer)
+        self._count(count)
+        return count
+
+    def stream(self, *args, **kwargs):
+        try:
+            for chunk in self._raw.stream(*args, **kwargs):
+                self.bytes_read += len(chunk)
+                yield chunk
+
+        finally:
+            self._done()
+
+    def release_conn(self):
+        self._raw.release_conn()
+        self._done()
+
+    def close(self):
+        self._raw.close()
+        self._done()
+
+
+class Instrumentation(object):
+    """
+    Class for the hooks a Client calls around every request, override the ones you need
+
+    Hooks run on the thread sending the request and must be thread safe
+
+    """
+
+    def before_request(self, method, url, headers):
+        """
+        Method called before a request is sent, headers can be added to
+
+        :type method: String
+        :param method: The HTTP method
+        :type url: String
+        :param url: The url
+        :type headers: Dict
+        :param headers: The request headers
+
+        :rtype: None
+        :return: None
+
+        """
+
+    def after_request(self, event):
+        """
+        Method called once the response body was read or the response closed, or the request failed
+
+        A streamed response that is never read to the end nor closed is not reported
+
+        :type event: RequestEvent
+        :param event: What happened
+
+        :rtype: None
+        :return: None
+
+        """
+
+    def after_parse(self, url, elapsed, entries):
+        """
+        Method called after a multistatus body was parsed
+
+        :type url: String
+        :param url: The url listed
+        :type elapsed: Float
+        :param elapsed: Seconds spent parsing XML, network waits not included
+        :type entries: Integer
+        :param entries: The number of response elements
+
+        :rtype: None
+        :return: None
+
+        """
+
+
+class InstrumentationGroup(Instrumentation):
+    """
+    Class to call several Instrumentation objects in turn
+
+    :type instrumentations: Iterable
+    :param instrumentations: Instrumentation objects
+
+    """
+
+    def __init__(self, instrumentations):
+        self.instrumentations = list(instrumentations)
+
+    def before_request(self, method, url, headers):
+        for instrumentation in self.instrumentations:
+            instrumentation.before_request(method, url, headers)
+
+    def after_request(self, event):
+        for instrumentation in self.instrumentations:
+            instrumentation.after_request(event)
+
+    def after_parse(self, url, elapsed, entries):
+        for instrumentation in self.instrumentations:
+            instrumentation.after_parse(url, elapsed, entries)
+
+
+class Histogram(object):
+    """
+    Class for a fixed bucket histogram
+
+    :type buckets: Tuple
+    :param buckets: Sorted bucket upper bounds, the last one should be infinity
+
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """
+        Method to add a value
+
+        :type value: Float
+        :param value: The value
+
+        :rtype: None
+        :return: None
+
+        """
+        self.counts[min(bisect_left(self.buckets, value), len(self.buckets) - 1)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, fraction):
+        """
+        Method to estimate a quantile as the upper bound of the bucket it falls in
+
+        :type fraction: Float
+        :param fraction: 0.5 for the median, 0.99 for the 99th percentile
+
+        :rtype: Float
+        :return: The estimate, None if nothing was observed
+
+        """
+        if not self.count:
+            return None
+
+        rank = fraction * self.count
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            if running >= rank:
+                return bound
+
+        return self.buckets[-1]
+
+    def snapshot(self):
+        """
+        Method to get the histogram as plain data
+
+        :rtype: Dict
+        :return: The count, sum, mean, estimated p50 and p99 and the count in every bucket
+
+        """
+        return dict(count=self.count, sum=self.sum, mean=self.sum / self.count if self.count else None,
+                    p50=self.quantile(0.5), p99=self.quantile(0.99),
+                    buckets=dict(zip(self.buckets, self.counts)))
+
+
+class MetricsAggregator(Instrumentation):
+    """
+    Class to collect request metrics in memory
+
+    Latency histograms, status counts and error counts are kept per method,
+    bytes, retries and XML parsing time in totals
+
+    :type buckets: Tuple
+    :param buckets: Latency bucket upper bounds in seconds
+
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Method to zero every metric
+
+        :rtype: None
+        :return: None
+
+        """
+        with self._lock:
+            self.latency = {}
+            self.status_counts = {}
+            self.errors = {}
+            self.bytes_sent = 0
+            self.bytes_received = 0
+            self.retries = 0
+            self.parse_seconds = 0.0
+            self.parsed_entries = 0
+            self.parses = 0
+
+    def after_request(self, event):
+        with self._lock:
+            histogram = self.latency.get(event.method)
+            if histogram is None:
+                histogram = self.latency[event.method] = Histogram(self.buckets)
+
+            histogram.observe(event.elapsed)
+            if event.error is not None:
+                self.errors[event.method] = self.errors.get(event.method, 0) + 1
+
+            else:
+                status_counts = self.status_counts.setdefault(event.method, {})
+                status_counts[event.status_code] = status_counts.get(event.status_code, 0) + 1
+
+            self.bytes_sent += event.bytes_sent
+            self.bytes_received += event.bytes_received
+            self.retries += event.retries
+
+    def after_parse(self, url, elapsed, entries):
+        with self._lock:
+            self.parse_seconds += elapsed
+            self.parsed_entries += entries
+            self.parses += 1
+
+    def snapshot(self):
+        """
+        Method to get every metric as plain data
+
+        :rtype: Dict
+        :return: The metrics
+
+        """
+        with self._lock:
+            return dict(
+                latency=dict((method, histogram.snapshot()) for method, histogram in self.latency.items()),
+                status_counts=dict((method, dict(counts)) for method, counts in self.status_counts.items()),
+                errors=dict(self.errors),
+                bytes_sent=self.bytes_sent,
+                bytes_received=self.bytes_received,
+                retries=self.retries,
+                parse_seconds=self.parse_seconds,
+                parsed_entries=self.parsed_entries,
+                parses=self.parses,
+            )
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """
+    Class to export request metrics with prometheus_client, it needs prometheus_client installed
+
+    :type registry: prometheus_client.CollectorRegistry
+    :param registry: The registry to add the metrics to, defaults to the global one
+    :type namespace: String
+    :param namespace: The prefix of the metric names
+    :type buckets: Tuple
+    :param buckets: Latency bucket upper bounds in seconds
+
+    :raises MissingDependency: If prometheus_client is not installed
+
+    """
+
+    def __init__(self, registry=None, namespace='webdav', buckets=LATENCY_BUCKETS):
+        try:
+            import prometheus_client
+
+        except ImportError:
+            raise MissingDependency('Class: {class_name} needs prometheus_client, install it with '
+                                    'pip install simplewebdavclient[prometheus]'.format(class_name=type(self)))
+
+        options = dict(namespace=namespace)
+        if registry is not None:
+            options['registry'] = registry
+
+        self.latency = prometheus_client.Histogram('request_duration_seconds', 'WebDav request latency',
+                                                   ['method'], buckets=buckets, **options)
+        self.responses = prometheus_client.Counter('responses', 'WebDav responses', ['method', 'status'], **options)
+        self.errors = prometheus_client.Counter('request_errors', 'WebDav transport errors', ['method'], **options)
+        self.bytes_sent = prometheus_client.Counter('sent_bytes', 'WebDav request body bytes', **options)
+        self.bytes_received = prometheus_client.Counter('received_bytes', 'WebDav response body bytes', **options)
+        self.retries = prometheus_client.Counter('retries', 'WebDav request retries', ['method'], **options)
+        self.parse_seconds = prometheus_client.Counter('parse_seconds', 'Seconds parsing multistatus XML',
+                                                       **options)
+        self.parsed_entries = prometheus_client.Counter('parsed_entries', 'Multistatus entries parsed', **options)
+
+    def after_request(self, event):
+        self.latency.labels(event.method).observe(event.elapsed)
+        if event.error is not None:
+            self.errors.labels(event.method).inc()
+
+        else:
+            self.responses.labels(event.method, str(event.status_code)).inc()
+
+        self.bytes_sent.inc(event.bytes_sent)
+        self.bytes_received.inc(event.bytes_received)
+        if event.retries:
+            self.retries.labels(event.method).inc(event.retries)
+
+    def after_parse(self, url, elapsed, entries):
+        self.parse_seconds.inc(elapsed)
+        self.parsed_entries.inc(entries)
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Class to export request metrics with OpenTelemetry, it needs opentelemetry-api installed
+
+    :type meter: opentelemetry.metrics.Meter
+    :param meter: The meter to make the instruments with, defaults to one from the global provider
+
+    :raises MissingDependency: If opentelemetry-api is not installed
+
+    """
+
+    def __init__(self, meter=None):
+        try:
+            from opentelemetry import metrics
+
+        except ImportError:
+            raise MissingDependency('Class: {class_name} needs opentelemetry-api, install it with '
+                                    'pip install simplewebdavclient[opentelemetry]'.format(class_name=type(self)))
+
+        if meter is None:
+            meter = metrics.get_meter(__name__)
+
+        self.latency = meter.create_histogram('webdav.request.duration', unit='s')
+        self.responses = meter.create_counter('webdav.responses')
+        self.errors = meter.create_counter('webdav.request.errors')
+        self.bytes_sent = meter.create_counter('webdav.sent', unit='By')
+        self.bytes_received = meter.create_counter('webdav.received', unit='By')
+        self.retries = meter.create_counter('webdav.retries')
+        self.parse_seconds = meter.create_counter('webdav.parse.duration', unit='s')
+        self.parsed_entries = meter.create_counter('webdav.parse.entries')
+
+    def after_request(self, event):
+        attributes = {'http.method': event.method}
+        self.latency.record(event.elapsed, attributes)
+        if event.error is not None:
+            self.errors.add(1, attributes)
+
+        else:
+            self.responses.add(1, dict(attributes, **{'http.status_code': event.status_code}))
+
+        self.bytes_sent.add(event.bytes_sent)
+        self.bytes_received.add(event.bytes_received)
+        if event.retries:
+            self.retries.add(event.retries, attributes)
+
+    def after_parse(self, url, elapsed, entries):
+        self.parse_seconds.add(elapsed)
+        self.parsed_entries.add(entries)
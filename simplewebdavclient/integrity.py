@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import os
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+# ownCloud and Nextcloud keep file checksums like "SHA1:<hex> MD5:<hex>" in this property
+CHECKSUMS_PROPERTY = '{http://owncloud.org/ns}checksums'
+
+# hashlib algorithm name to the label servers use in checksums
+CHECKSUM_LABELS = {'md5': 'MD5', 'sha1': 'SHA1', 'sha256': 'SHA256'}
+
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+
+def parse_checksums(value):
+    """
+    Function to parse a checksums property
+
+    :type value: String
+    :param value: Checksums like "SHA1:<hex> MD5:<hex>"
+
+    :rtype: Dict
+    :return: A dictionary of hashlib algorithm name to lower case hex digest
+
+    """
+    checksums = {}
+    for item in (value or '').split():
+        label, _, digest = item.partition(':')
+        if digest:
+            checksums[label.lower()] = digest.lower()
+
+    return checksums
+
+
+def remote_checksum(file_data, algorithm):
+    """
+    Function to find a server side digest of a resource
+
+    The checksums property is used when it was received, an MD5 ETag when the
+    algorithm is md5 and the ETag is 32 hex digits
+
+    :type file_data: FileData
+    :param file_data: The resource
+    :type algorithm: String
+    :param algorithm: The hashlib algorithm name, one of CHECKSUM_LABELS
+
+    :rtype: String
+    :return: The lower case hex digest, None if the server did not send one
+
+    """
+    digest = parse_checksums(file_data.get_property(CHECKSUMS_PROPERTY)).get(algorithm)
+    if digest is None and algorithm == 'md5' and file_data.etag:
+        etag = file_data.etag.lower()
+        if etag.startswith('w/'):
+            return None
+
+        etag = etag.strip('"')
+        if len(etag) == 32 and _HEX_DIGITS.issuperset(etag):
+            return etag
+
+    return digest
+
+
+def checksum_header(algorithm, digest):
+    """
+    Function to build an OC-Checksum header value for the server to keep
+
+    :type algorithm: String
+    :param algorithm: The hashlib algorithm name, one of CHECKSUM_LABELS
+    :type digest: String
+    :param digest: The hex digest
+
+    :rtype: String
+    :return: The header value
+
+    """
+    return '{label}:{digest}'.format(label=CHECKSUM_LABELS[algorithm], digest=digest)
+
+
+class HashingReader(object):
+    """
+    Class to wrap a binary file so it is hashed while a request body is read from it
+
+    The length is the file size so requests sends a Content-Length, and seeking
+    back to the start, as a retry does, starts the hash again
+
+    :type file: File Object
+    :param file: A binary file open at its start
+    :type algorithm: String
+    :param algorithm: The hashlib algorithm name
+
+    """
+
+    def __init__(self, file, algorithm):
+        self.file = file
+        self.algorithm = algorithm
+        self.hash = hashlib.new(algorithm)
+        self.size = os.fstat(file.fileno()).st_size
+
+    def __len__(self):
+        return self.size
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.hash.update(data)
+        return data
+
+    def tell(self):
+        return self.file.tell()
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """
+        Method to move back to the start of the file, the hash starts again
+
+        :type offset: Integer
+        :param offset: Must be 0
+        :type whence: Integer
+        :param whence: Must be os.SEEK_SET
+
+        :rtype: Integer
+        :return: The new position
+
+        :raises ValueError: If asked to move anywhere else
+
+        """
+        if offset != 0 or whence != os.SEEK_SET:
+            raise ValueError('Class: {class_name} can only seek back to the start'.format(class_name=type(self)))
+
+        self.hash = hashlib.new(self.algorithm)
+        return self.file.seek(0)
+
+    def hexdigest(self):
+        return self.hash.hexdigest()
+
+
+class UploadResult(object):
+    """
+    Class to store what an upload that skips identical files did
+
+    :type remote_path: String
+    :param remote_path: The remote path
+    :type uploaded: Boolean
+    :param uploaded: False if the remote copy was already identical
+    :type reason: String
+    :param reason: missing, size, checksum or modified if uploaded, unchanged or checksum if skipped
+    :type checksum: String
+    :param checksum: The hex digest of the local file, None if it was not hashed
+    :type etag: String
+    :param etag: The ETag of the remote copy, None if the server did not send one
+
+    """
+
+    __slots__ = ('remote_path', 'uploaded', 'reason', 'checksum', 'etag')
+
+    def __init__(self, remote_path, uploaded, reason, checksum=None, etag=None):
+        self.remote_path = remote_path
+        self.uploaded = uploaded
+        self.reason = reason
+        self.checksum = checksum
+        self.etag = etag
+
+    def __repr__(self):
+        return '{class_name}(remote_path={remote_path!r}, uploaded={uploaded}, reason={reason!r})'.format(
+            class_name=type(self).__name__, remote_path=self.remote_path, uploaded=self.uploaded, reason=self.reason)
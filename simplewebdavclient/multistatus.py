@@ -0,0 +1,384 @@
+import logging
+from xml.sax.saxutils import quoteattr
+try:
+    import xml.etree.cElementTree as xml
+
+except ImportError:
+    import xml.etree.ElementTree as xml
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+RESPONSE_TAG = '{DAV:}response'
+HREF_TAG = '{DAV:}href'
+PROPSTAT_TAG = '{DAV:}propstat'
+PROP_TAG = '{DAV:}prop'
+STATUS_TAG = '{DAV:}status'
+RESOURCETYPE_TAG = '{DAV:}resourcetype'
+COLLECTION_TAG = '{DAV:}collection'
+
+# Namespaced property tag to FileData field
+PROPERTY_TAGS = {
+    '{DAV:}displayname': 'resource_name',
+    '{DAV:}getcontentlength': 'file_size',
+    '{DAV:}getlastmodified': 'modified_time',
+    '{DAV:}creationdate': 'creation_time',
+    '{DAV:}getcontenttype': 'content_type',
+    '{DAV:}getetag': 'etag',
+    RESOURCETYPE_TAG: 'collection',
+}
+
+# Properties asked for when the caller does not choose any
+DEFAULT_PROPERTIES = tuple(PROPERTY_TAGS)
+
+PROPNAME_BODY = (b'<?xml version="1.0" encoding="utf-8"?>'
+                 b'<D:propfind xmlns:D="DAV:"><D:propname/></D:propfind>')
+
+
+class MultistatusStreamParser(object):
+    """
+    Class to incrementally parse a WebDav multistatus body
+
+    Data is fed in as it arrives from the server, and every {DAV:}response
+    element is handed back as soon as it is closed.  Handed back elements
+    are detached from the tree on the next feed, so memory use stays flat
+    no matter how large the listing is.
+
+    """
+
+    def __init__(self):
+        self._parser = xml.XMLPullParser(events=('start', 'end'))
+        self._root = None
+
+    def feed(self, data):
+        """
+        Method to feed a chunk of the multistatus body to the parser
+
+        :type data: Bytes
+        :param data: A chunk of the response body
+
+        :rtype: List
+        :return: A list of completed {DAV:}response elements
+
+        """
+        self._parser.feed(data)
+        return self._completed_responses()
+
+    def close(self):
+        """
+        Method to signal the end of the multistatus body
+
+        :rtype: List
+        :return: A list of completed {DAV:}response elements
+
+        """
+        self._parser.close()
+        return self._completed_responses()
+
+    def _completed_responses(self):
+        """
+        Method to collect the responses closed since the last call
+
+        :rtype: List
+        :return: A list of completed {DAV:}response elements
+
+        """
+        if self._root is not None:
+            # Responses handed out on the previous call are done with
+            self._root.clear()
+
+        completed = []
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                if self._root is None:
+                    self._root = element
+
+            elif element.tag == RESPONSE_TAG:
+                completed.append(element)
+
+        return completed
+
+
+def iter_response_elements(chunks):
+    """
+    Function to lazily yield {DAV:}response elements from a multistatus body
+
+    :type chunks: Iterable
+    :param chunks: An iterable of bytes chunks of the response body
+
+    :rtype: Generator
+    :return: A generator of {DAV:}response elements
+
+    """
+    parser = MultistatusStreamParser()
+    for chunk in chunks:
+        if chunk:
+            for element in parser.feed(chunk):
+                yield element
+
+    for element in parser.close():
+        yield element
+
+
+def status_ok(status):
+    """
+    Function to check if a multistatus status line is a success
+
+    :type status: String
+    :param status: A status line like "HTTP/1.1 200 OK"
+
+    :rtype: Boolean
+    :return: True or False
+
+    """
+    if not status:
+        return True
+
+    parts = status.split(None, 2)
+    return len(parts) > 1 and parts[1].startswith('2')
+
+
+def extract_status(element):
+    """
+    Function to extract the href and status of a {DAV:}response element
+
+    :type element: Element
+    :param element: The {DAV:}response element
+
+    :rtype: Tuple
+    :return: The href and the status line, None if the response has no status of its own
+
+    """
+    href = None
+    status = None
+    for child in element:
+        if child.tag == HREF_TAG and href is None:
+            href = child.text
+
+        elif child.tag == STATUS_TAG:
+            status = child.text
+
+    return href, status
+
+
+def failed_responses(elements):
+    """
+    Function to collect the resources a multistatus body reports as failed
+
+    :type elements: Iterable
+    :param elements: The {DAV:}response elements of the body
+
+    :rtype: List
+    :return: A list of (href, status line) tuples
+
+    """
+    failures = []
+    for element in elements:
+        href, status = extract_status(element)
+        if status is not None and not status_ok(status):
+            failures.append((href, status))
+
+    return failures
+
+
+def extract_properties(element, tag_table=None, extra_tags=None):
+    """
+    Function to extract the properties of a {DAV:}response element in one pass
+
+    Only the direct children are visited, properties from propstat blocks
+    with a non 2xx status are ignored
+
+    :type element: Element
+    :param element: The {DAV:}response element
+    :type tag_table: Dict
+    :param tag_table: Mapping of namespaced property tag to field name, defaults to PROPERTY_TAGS
+    :type extra_tags: Set
+    :param extra_tags: Namespaced property tags to collect in a dictionary stored as properties
+
+    :rtype: Dict
+    :return: A dictionary of field name to text, the href is stored as resource_url and a resourcetype as a Boolean
+
+    """
+    if tag_table is None:
+        tag_table = PROPERTY_TAGS
+
+    properties = {}
+    if extra_tags:
+        properties['properties'] = {}
+
+    for child in element:
+        tag = child.tag
+        if tag == PROPSTAT_TAG:
+            prop = None
+            ok = True
+            for item in child:
+                if item.tag == PROP_TAG:
+                    prop = item
+
+                elif item.tag == STATUS_TAG:
+                    ok = status_ok(item.text)
+
+            if ok and prop is not None:
+                for item in prop:
+                    field = tag_table.get(item.tag)
+                    if field is not None:
+                        if item.tag == RESOURCETYPE_TAG:
+                            properties[field] = item.find(COLLECTION_TAG) is not None
+
+                        else:
+                            properties[field] = item.text
+
+                    elif extra_tags and item.tag in extra_tags:
+                        # Properties like oc:checksums nest their value in child elements
+                        properties['properties'][item.tag] = item.text if not len(item) else \
+                            ' '.join(text.strip() for text in item.itertext() if text.strip())
+
+        elif tag == HREF_TAG and 'resource_url' not in properties:
+            properties['resource_url'] = child.text
+
+    return properties
+
+
+def file_record(element, extra_tags=None):
+    """
+    Function to get the FileData arguments from a {DAV:}response element
+
+    :type element: Element
+    :param element: The {DAV:}response element
+    :type extra_tags: Set
+    :param extra_tags: Namespaced property tags to keep besides the FileData fields
+
+    :rtype: Tuple
+    :return: The resource url, name, size, modified time, creation time, content type, other properties, etag
+             and collection flag
+
+    """
+    properties = extract_properties(element, extra_tags=extra_tags)
+    return (properties.get('resource_url'),
+            properties.get('resource_name'),
+            int(properties.get('file_size') or 0),
+            properties.get('modified_time') or '',
+            properties.get('creation_time') or '',
+            properties.get('content_type') or '',
+            properties.get('properties'),
+            properties.get('etag'),
+            properties.get('collection'))
+
+
+def parse_file_records(body, extra_tags=None):
+    """
+    Function to parse a whole multistatus body into FileData arguments
+
+    Records are plain tuples, so the function can run in a process pool and
+    hand back its result cheaply
+
+    :type body: Bytes
+    :param body: The multistatus body
+    :type extra_tags: Set
+    :param extra_tags: Namespaced property tags to keep besides the FileData fields
+
+    :rtype: List
+    :return: A list of file_record tuples
+
+    """
+    return [file_record(element, extra_tags) for element in iter_response_elements((body,))]
+
+
+def extract_property_names(element):
+    """
+    Function to extract the property names from a propname {DAV:}response element
+
+    :type element: Element
+    :param element: The {DAV:}response element
+
+    :rtype: Tuple
+    :return: The href and a list of namespaced property names
+
+    """
+    href = None
+    names = []
+    for child in element:
+        if child.tag == PROPSTAT_TAG:
+            prop = child.find(PROP_TAG)
+            if prop is not None and status_ok(child.findtext(STATUS_TAG)):
+                names.extend(item.tag for item in prop)
+
+        elif child.tag == HREF_TAG and href is None:
+            href = child.text
+
+    return href, names
+
+
+def split_property_name(name):
+    """
+    Function to split a property name into its namespace and local name
+
+    :type name: String or Tuple
+    :param name: A name like "{DAV:}getetag", a (namespace, name) tuple, or a bare DAV: name
+
+    :rtype: Tuple
+    :return: The namespace and the local name
+
+    """
+    if isinstance(name, tuple):
+        return name
+
+    if name.startswith('{'):
+        namespace, local_name = name[1:].split('}', 1)
+        return namespace, local_name
+
+    return 'DAV:', name
+
+
+def property_tag(name):
+    """
+    Function to get the namespaced tag of a property name
+
+    :type name: String or Tuple
+    :param name: A name like "{DAV:}getetag", a (namespace, name) tuple, or a bare DAV: name
+
+    :rtype: String
+    :return: A tag like "{DAV:}getetag"
+
+    """
+    return '{{{0}}}{1}'.format(*split_property_name(name))
+
+
+def build_propfind_body(properties=None):
+    """
+    Function to build a PROPFIND request body asking for only some properties
+
+    :type properties: Iterable
+    :param properties: The property names, defaults to DEFAULT_PROPERTIES
+
+    :rtype: Bytes
+    :return: The request body
+
+    """
+    if properties is None:
+        properties = DEFAULT_PROPERTIES
+
+    prefixes = {'DAV:': 'D'}
+    props = []
+    for name in properties:
+        namespace, local_name = split_property_name(name)
+        if namespace not in prefixes:
+            prefixes[namespace] = 'ns{0}'.format(len(prefixes))
+
+        props.append('<{0}:{1}/>'.format(prefixes[namespace], local_name))
+
+    declarations = ' '.join('xmlns:{0}={1}'.format(prefix, quoteattr(namespace))
+                            for namespace, prefix in prefixes.items())
+    body = '<?xml version="1.0" encoding="utf-8"?><D:propfind {0}><D:prop>{1}</D:prop></D:propfind>'.format(
+        declarations, ''.join(props))
+    return body.encode('utf-8')
+
+
+DEFAULT_PROPFIND_BODY = build_propfind_body()
@@ -0,0 +1,132 @@
+import io
+import logging
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+
+class RemoteFile(io.RawIOBase):
+    """
+    Class for a raw readable stream over a resource on the WebDav server
+
+    The first GET is sent straight away so missing resources fail early.  The
+    stream is seekable when the server answers with Accept-Ranges bytes and a
+    Content-Length, seeking closes the current response and the next read
+    sends a Range request guarded by If-Range.  Use Client.open_remote to get
+    a buffered stream.
+
+    :type client: Client
+    :param client: The Client to send requests with
+    :type remote_path: String
+    :param remote_path: The path
+
+    """
+
+    def __init__(self, client, remote_path):
+        super(RemoteFile, self).__init__()
+        self.client = client
+        self.remote_path = remote_path
+        self.position = 0
+        self.size = None
+        self.validator = None
+        self.accepts_ranges = False
+        self._response = None
+        self._open()
+
+    def _open(self):
+        """
+        Method to send the GET for the current position
+
+        :rtype: None
+        :return: None
+
+        """
+        headers = {'Accept-Encoding': 'identity'}
+        expected_codes = 200
+        if self.position:
+            headers['Range'] = 'bytes={position}-'.format(position=self.position)
+            if self.validator:
+                headers['If-Range'] = self.validator
+
+            # A 200 means the resource changed since it was opened
+            expected_codes = 206
+
+        response = self.client._send('GET', self.remote_path, expected_codes, headers=headers, stream=True)
+        if response.status_code == 200:
+            length = response.headers.get('Content-Length')
+            self.size = int(length) if length is not None else None
+            self.validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            self.accepts_ranges = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+
+        self._response = response
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return self.accepts_ranges and self.size is not None
+
+    def tell(self):
+        return self.position
+
+    def readinto(self, buffer):
+        if self.closed:
+            raise ValueError('I/O operation on closed file.')
+
+        if self.size is not None and self.position >= self.size:
+            return 0
+
+        if self._response is None:
+            self._open()
+
+        count = self._response.raw.readinto(buffer)
+        self.position += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if not self.seekable():
+            raise io.UnsupportedOperation('{path} does not accept byte ranges'.format(path=self.remote_path))
+
+        if whence == io.SEEK_SET:
+            position = offset
+
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+
+        else:
+            raise ValueError('Invalid whence {whence}'.format(whence=whence))
+
+        if position < 0:
+            raise ValueError('Negative seek position {position}'.format(position=position))
+
+        if position != self.position:
+            self._close_response()
+            self.position = position
+
+        return self.position
+
+    def close(self):
+        self._close_response()
+        super(RemoteFile, self).close()
+
+    def _close_response(self):
+        """
+        Method to close the current response, if any
+
+        :rtype: None
+        :return: None
+
+        """
+        if self._response is not None:
+            self._response.close()
+            self._response = None
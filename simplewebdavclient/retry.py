@@ -0,0 +1,286 @@
+import logging
+import random
+import threading
+import time
+from numbers import Number
+import requests
+from .dates import parse_http_date
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+# Statuses a busy or restarting server answers with
+RETRY_STATUS_CODES = frozenset((429, 502, 503, 504))
+
+# Methods that do the same thing when sent twice, PUT only with a body that can be sent again
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PROPFIND', 'PUT', 'DELETE'))
+
+# Transport errors worth another try
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class RetryAttempt(object):
+    """
+    Class to store the timing of one attempt of a request
+
+    :type attempt: Integer
+    :param attempt: The attempt number, starting at 1
+    :type status_code: Integer
+    :param status_code: The status the server answered with, None if the request failed
+    :type error: Exception
+    :param error: The transport error, None if the server answered
+    :type elapsed: Float
+    :param elapsed: Seconds the attempt took
+    :type delay: Float
+    :param delay: Seconds slept before the next attempt, 0 for the last one
+
+    """
+
+    __slots__ = ('attempt', 'status_code', 'error', 'elapsed', 'delay')
+
+    def __init__(self, attempt, status_code, error, elapsed, delay):
+        self.attempt = attempt
+        self.status_code = status_code
+        self.error = error
+        self.elapsed = elapsed
+        self.delay = delay
+
+    def __repr__(self):
+        return '{class_name}(attempt={attempt}, status_code={status_code}, error={error!r}, elapsed={elapsed:.3f}, ' \
+               'delay={delay:.3f})'.format(class_name=type(self).__name__, attempt=self.attempt,
+                                            status_code=self.status_code, error=self.error, elapsed=self.elapsed,
+                                            delay=self.delay)
+
+
+class RetryPolicy(object):
+    """
+    Class to retry requests that failed for a passing reason
+
+    Only idempotent methods are retried, PUT only when its body is bytes or a
+    seekable file object.  Waits grow exponentially with full jitter, a
+    Retry-After from the server is used when it is longer.  Retries draw from
+    a token budget refilled by every request, so a server that is down is not
+    hammered with retries.  One RetryPolicy can be shared by many Clients.
+
+    :type max_attempts: Integer
+    :param max_attempts: The most times a request is sent, 1 turns retries off
+    :type backoff_factor: Float
+    :param backoff_factor: Seconds the first wait is at most, it doubles every attempt
+    :type max_backoff: Float
+    :param max_backoff: The longest wait in seconds, a longer Retry-After ends the retries
+    :type status_codes: Iterable
+    :param status_codes: The statuses to retry
+    :type methods: Iterable
+    :param methods: The methods to retry
+    :type budget_ratio: Float
+    :param budget_ratio: Retry tokens added by every request, 0.2 allows one retry per five requests
+    :type budget_max_tokens: Float
+    :param budget_max_tokens: The most retry tokens saved up, and the tokens to start with
+
+    """
+
+    def __init__(self, max_attempts=4, backoff_factor=0.5, max_backoff=30.0, status_codes=RETRY_STATUS_CODES,
+                 methods=IDEMPOTENT_METHODS, budget_ratio=0.2, budget_max_tokens=10.0):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.budget_ratio = budget_ratio
+        self.budget_max_tokens = budget_max_tokens
+        self.tokens = budget_max_tokens
+        self.retries = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def is_retryable(self, method, body=None):
+        """
+        Method to check if a request may be sent again
+
+        :type method: String
+        :param method: The HTTP method
+        :type body: Object
+        :param body: The request body
+
+        :rtype: Boolean
+        :return: True or False
+
+        """
+        if method.upper() not in self.methods:
+            return False
+
+        return method.upper() != 'PUT' or self.is_rewindable(body)
+
+    @staticmethod
+    def is_rewindable(body):
+        """
+        Method to check if a request body can be sent a second time
+
+        :type body: Object
+        :param body: The request body
+
+        :rtype: Boolean
+        :return: True or False
+
+        """
+        if body is None or isinstance(body, (bytes, bytearray, memoryview, str)):
+            return True
+
+        seekable = getattr(body, 'seekable', None)
+        return seekable is not None and seekable()
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Method to work out the wait before the next attempt
+
+        :type attempt: Integer
+        :param attempt: The attempt that just failed, starting at 1
+        :type retry_after: String
+        :param retry_after: The Retry-After header, seconds or an HTTP date
+
+        :rtype: Float
+        :return: Seconds to wait, None if the server asked for a longer wait than max_backoff
+
+        """
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1)))
+        server_delay = self.parse_retry_after(retry_after)
+        if server_delay is not None:
+            if server_delay > self.max_backoff:
+                return None
+
+            delay = max(delay, server_delay)
+
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Method to read a Retry-After header
+
+        :type value: String
+        :param value: Seconds or an HTTP date
+
+        :rtype: Float
+        :return: Seconds to wait, None if there is no usable value
+
+        """
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        epoch = parse_http_date(value)
+        if epoch is None:
+            return None
+
+        return max(0.0, epoch - time.time())
+
+    def _deposit(self):
+        """
+        Method to add the retry tokens a new request earns
+
+        :rtype: None
+        :return: None
+
+        """
+        with self._lock:
+            self.tokens = min(self.budget_max_tokens, self.tokens + self.budget_ratio)
+
+    def _withdraw(self):
+        """
+        Method to take a retry token
+
+        :rtype: Boolean
+        :return: False if the budget is spent
+
+        """
+        with self._lock:
+            if self.tokens < 1:
+                self.exhausted += 1
+                return False
+
+            self.tokens -= 1
+            self.retries += 1
+            return True
+
+    def call(self, method, send, body=None, expected_code=()):
+        """
+        Method to send a request, retrying it while the policy allows
+
+        A seekable body is moved back to where it started before every retry
+
+        :type method: String
+        :param method: The HTTP method
+        :type send: Callable
+        :param send: Called with no arguments to send the request, returns a requests.response
+        :type body: Object
+        :param body: The request body
+        :type expected_code: Number
+        :param expected_code: Expected HTTP Status Codes, these are never retried
+
+        :rtype: requests.response Object
+        :return: The last response, its attempts attribute is a list of RetryAttempt objects
+
+        """
+        expected_codes = (expected_code,) if isinstance(expected_code, Number) else expected_code
+        retryable = self.max_attempts > 1 and self.is_retryable(method, body)
+        position = body.tell() if retryable and hasattr(body, 'seek') else None
+        self._deposit()
+        attempts = []
+        attempt = 1
+        while True:
+            start = time.perf_counter()
+            try:
+                response = send()
+
+            except RETRY_EXCEPTIONS as e:
+                elapsed = time.perf_counter() - start
+                delay = self.backoff(attempt) if retryable and attempt < self.max_attempts else None
+                if delay is None or not self._withdraw():
+                    raise
+
+                attempts.append(RetryAttempt(attempt, None, e, elapsed, delay))
+
+            else:
+                elapsed = time.perf_counter() - start
+                status_code = response.status_code
+                delay = None
+                if retryable and attempt < self.max_attempts and status_code in self.status_codes \
+                        and status_code not in expected_codes:
+                    delay = self.backoff(attempt, response.headers.get('Retry-After'))
+
+                if delay is None or not self._withdraw():
+                    attempts.append(RetryAttempt(attempt, status_code, None, elapsed, 0.0))
+                    response.attempts = attempts
+                    return response
+
+                attempts.append(RetryAttempt(attempt, status_code, None, elapsed, delay))
+                response.close()
+
+            LOGGER.debug('Method call retrying {method} after {attempt} in {delay:.3f}s'.format(
+                method=method, attempt=attempts[-1], delay=delay))
+            time.sleep(delay)
+            if position is not None:
+                body.seek(position)
+
+            attempt += 1
+
+    def stats(self):
+        """
+        Method to get the retry counters
+
+        :rtype: Dict
+        :return: The retries made, the retries refused by the budget and the tokens left
+
+        """
+        with self._lock:
+            return dict(retries=self.retries, exhausted=self.exhausted, tokens=self.tokens)
@@ -1,10 +1,24 @@
 import logging
-import requests
-from numbers import Number
-import xml.etree.cElementTree as xml
-from urllib.parse import urlparse
-from .exceptions import CouldNotDetermineProtocol, OperationFailed
-from .checkers import check_tcp_udp_port_number
+import hashlib
+import os
+import io
+import mmap
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse, unquote
+from .exceptions import OperationFailed, BufferTooSmall, MultiStatusFailed
+from .multistatus import MultistatusStreamParser, failed_responses, extract_property_names, build_propfind_body,\
+    parse_file_records, DEFAULT_PROPFIND_BODY, DEFAULT_PROPERTIES, PROPNAME_BODY
+from .filedata import FileData, ResourceTable
+from .transport import Transport
+from .remotefile import RemoteFile
+from .baseclient import BaseClient
+from .bulk import run_concurrently
+from .sync import sync, unchanged
+from .collectioncache import CollectionCache, split_path
+from .instrumentation import CountingBody, RequestEvent, body_size
+from .integrity import CHECKSUMS_PROPERTY, CHECKSUM_LABELS, HashingReader, UploadResult, remote_checksum, \
+    checksum_header
 __author__ = 'Benjamin P. Trachtenberg'
 __copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
 __credits__ = 'Benjamin P. Trachtenberg'
@@ -16,110 +30,14 @@ __maintainer__ = 'Benjamin P. Trachtenberg'
 __email__ = 'e_ben_75-python@yahoo.com'
 LOGGER = logging.getLogger(__name__)
 
+# Added to a local path to keep the validator of a resumable download
+RESUME_SUFFIX = '.resume'
 
-class FileData(object):
-    """
-    Class to store a file info
-
-    :type resource_url: String
-    :param resource_url: The resource URL
-    :type resource_name: String
-    :param resource_name: The name of the resource
-    :type file_size: String
-    :param file_size: The file size
-    :type modified_time: String
-    :param modified_time: The modified date/time
-    :type creation_time: String
-    :param creation_time: The creation date/time
-    :type content_type: String
-    :param content_type: The content type
-
-    """
-
-    def __init__(self, resource_url, resource_name, file_size, modified_time, creation_time, content_type):
-        self.resource_url = resource_url
-        self.resource_name = resource_name
-        self.file_size = file_size
-        self.modified_time = modified_time
-        self.creation_time = creation_time
-        self.content_type = content_type
-
-    def get_resource_url(self):
-        """
-        Method to get the WebDav resource url
-
-        :rtype: String
-        :return: A resource url
-
-        """
-        return self.resource_url
-
-    def get_resource_name(self):
-        """
-        Method to get the WebDav resource name
-
-        :rtype: String
-        :return: A resource name
-
-        """
-        return self.resource_name
-
-    def get_file_size(self):
-        """
-        Method to get the WebDav resource file size
+# Files at least this big are memory mapped when uploaded
+MMAP_THRESHOLD_BYTES = 1 * 1024 * 1024
 
-        :rtype: String
-        :return: A resource file size
 
-        """
-        return self.file_size
-
-    def get_modified_time(self):
-        """
-        Method to get the WebDav resource modified date and time
-
-        :rtype: String
-        :return: A resource modified date and time
-
-        """
-        return self.modified_time
-
-    def get_creation_time(self):
-        """
-        Method to get the WebDav resource creation date and time
-
-        :rtype: String
-        :return: A resource creation date and time
-
-        """
-        return self.creation_time
-
-    def get_content_type(self):
-        """
-        Method to get the WebDav resource content type
-
-        :rtype: String
-        :return: A resource content type
-
-        """
-        return self.content_type
-
-    def is_dir(self):
-        """
-        Method to check to see if WebDav resource is a directory
-
-        :rtype: Boolean
-        :return: True or False
-
-        """
-        if self.resource_url.endswith('/'):
-            return True
-
-        else:
-            return False
-
-
-class Client(object):
+class Client(BaseClient):
     """
     Class for WebDav Client
 
@@ -141,44 +59,71 @@ class Client(object):
     :param path: The path to the resource
     :type cert: String
     :param cert: Session cert
+    :type transport: Transport
+    :param transport: A Transport to share with other Clients, when set the pool and timeout options are not used
+    :type pool_connections: Integer
+    :param pool_connections: The number of hosts to keep connection pools for
+    :type pool_maxsize: Integer
+    :param pool_maxsize: The most connections to keep per host
+    :type pool_block: Boolean
+    :param pool_block: If set to True requests wait for a free connection instead of opening extra ones
+    :type connect_timeout: Float
+    :param connect_timeout: Seconds to wait for a connection, None waits forever
+    :type read_timeout: Float
+    :param read_timeout: Seconds to wait between bytes from the server, None waits forever
+    :type keep_alive: Boolean
+    :param keep_alive: If set to False connections are closed after every request
+    :type download_chunk_size_bytes: Integer
+    :param download_chunk_size_bytes: The size of the pieces downloads are read and written in
+    :type cache: ResponseCache
+    :param cache: A cache to revalidate listings, existence checks and downloads with, None turns caching off
+    :type collection_cache: CollectionCache
+    :param collection_cache: A cache of directories known to exist, keyed by base url, to share with other Clients
+    :type retry: RetryPolicy
+    :param retry: A policy to retry failed idempotent requests with, None sends every request once
+    :type instrumentation: Instrumentation
+    :param instrumentation: Hooks called around every request and multistatus parse, like a MetricsAggregator
 
     :raises CouldNotDetermineProtocol: If protocol is not http or https
 
     """
 
     def __init__(self, host, port=None, auth=None, username=None, password=None,
-                 protocol='http', verify_ssl=True, path=None, cert=None):
-        if not port:
-            if protocol == 'http':
-                port = 80
-
-            elif protocol == 'https':
-                port = 443
-
-            else:
-                raise CouldNotDetermineProtocol('Class: {class_name} could not determine port for '
-                                                '{protocol} port given was '
-                                                '{port}'.format(class_name=type(self), protocol=protocol, port=port))
-
-        check_tcp_udp_port_number(port)
-
-        self.base_url = '{protocol}://{host}:{port}'.format(protocol=protocol, host=host, port=port)
-        if path:
-            self.base_url = '{base_url}/{path}'.format(base_url=self.base_url, path=path)
-
-        self.current_working_directory = '/'
-        self.session = requests.session()
-        self.session.verify = verify_ssl
-        self.session.stream = True
-
-        if cert:
-            self.session.cert = cert
+                 protocol='http', verify_ssl=True, path=None, cert=None, transport=None,
+                 pool_connections=10, pool_maxsize=10, pool_block=False, connect_timeout=None,
+                 read_timeout=None, keep_alive=True, download_chunk_size_bytes=1 * 1024 * 1024, cache=None,
+                 collection_cache=None, retry=None, instrumentation=None):
+        super(Client, self).__init__(host, port=port, auth=auth, username=username, password=password,
+                                     protocol=protocol, verify_ssl=verify_ssl, path=path, cert=cert)
+        self.owns_transport = transport is None
+        if transport is None:
+            transport = Transport(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block,
+                                  connect_timeout=connect_timeout, read_timeout=read_timeout, keep_alive=keep_alive)
+
+        self.transport = transport
+        self.session = transport.session
+        self.download_chunk_size_bytes = download_chunk_size_bytes
+        self.cache = cache
+        self.collection_cache = collection_cache if collection_cache is not None else CollectionCache()
+        self.retry = retry
+        self.instrumentation = instrumentation
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Method to close the pooled connections, a shared Transport is left open
 
-        if auth:
-            self.session.auth = auth
+        :rtype: None
+        :return: None
 
-        elif username and password:
-            self.session.auth = (username, password)
+        """
+        if self.owns_transport:
+            self.transport.close()
 
     def _send(self, method, path, expected_code, **kwargs):
         """
@@ -198,53 +143,94 @@ class Client(object):
 
         """
         url = self._get_url(path)
-        response = self.session.request(method, url, allow_redirects=False, **kwargs)
-        if isinstance(expected_code, Number) and response.status_code != expected_code\
-                or not isinstance(expected_code, Number) and response.status_code not in expected_code:
-            raise OperationFailed(method, path, expected_code, response.status_code)
+        kwargs.setdefault('verify', self.verify_ssl)
+        if self.cert:
+            kwargs.setdefault('cert', self.cert)
+
+        if self.auth:
+            kwargs.setdefault('auth', self.auth)
+
+        if self.instrumentation is None:
+            response = self.__request(method, url, expected_code, kwargs)
+
+        else:
+            response = self.__instrumented_request(method, url, expected_code, kwargs)
+
+        self._check_status(method, path, expected_code, response.status_code)
 
         return response
 
-    def _get_url(self, path):
+    def __request(self, method, url, expected_code, kwargs):
         """
-        Method used to get a good url
+        Method to send a request, with retries when there is a RetryPolicy
 
-        :type path: String
-        :param path: Path from the root directory
+        :type method: String
+        :param method: WebDav Method
+        :type url: String
+        :param url: The url
+        :type expected_code: Number
+        :param expected_code: Expected HTTP Status Codes
+        :type kwargs: Dict
+        :param kwargs: Key Word Arguments for requests
 
-        :rtype: String
-        :return: A good url
+        :rtype: requests.response Object
+        :return: A response
 
         """
-        path = str(path).strip()
-        if path.startswith('/'):
-            return self.base_url + path
+        if self.retry is None:
+            return self.transport.request(method, url, allow_redirects=False, **kwargs)
 
-        return "".join((self.base_url, self.current_working_directory, path))
+        return self.retry.call(method, lambda: self.transport.request(method, url, allow_redirects=False, **kwargs),
+                               body=kwargs.get('data'), expected_code=expected_code)
 
-    def change_current_working_directory(self, path):
+    def __instrumented_request(self, method, url, expected_code, kwargs):
         """
-        Method to change your current working directory
+        Method to send a request between the instrumentation hooks
 
-        :type path: String
-        :param path: Path from your root
+        :type method: String
+        :param method: WebDav Method
+        :type url: String
+        :param url: The url
+        :type expected_code: Number
+        :param expected_code: Expected HTTP Status Codes
+        :type kwargs: Dict
+        :param kwargs: Key Word Arguments for requests
 
-        :rtype: None
-        :return: None
+        :rtype: requests.response Object
+        :return: A response
 
         """
-        path = path.strip()
-        if not path:
-            return
-        stripped_path = '/'.join(part for part in path.split('/') if part) + '/'
-        if stripped_path == '/':
-            self.current_working_directory = stripped_path
+        kwargs['headers'] = headers = dict(kwargs.get('headers') or {})
+        self.instrumentation.before_request(method, url, headers)
+        bytes_sent = body_size(kwargs.get('data'))
+        start = time.perf_counter()
+        try:
+            response = self.__request(method, url, expected_code, kwargs)
+
+        except Exception as e:
+            self.instrumentation.after_request(RequestEvent(method, url, None, time.perf_counter() - start,
+                                                            bytes_sent or 0, error=e))
+            raise
 
-        elif path.startswith('/'):
-            self.current_working_directory = '/' + stripped_path
+        elapsed = time.perf_counter() - start
+        if bytes_sent is None:
+            bytes_sent = int(response.request.headers.get('Content-Length') or 0)
+
+        retries = len(response.attempts) - 1 if hasattr(response, 'attempts') else 0
+        event = RequestEvent(method, url, response.status_code, elapsed, bytes_sent, 0, retries)
+
+        def on_done(bytes_received):
+            event.bytes_received = bytes_received
+            self.instrumentation.after_request(event)
+
+        if kwargs.get('stream'):
+            # The body is still on the connection, the event is sent once it has been read or the response closed
+            response.raw = CountingBody(response.raw, on_done)
 
         else:
-            self.current_working_directory += stripped_path
+            on_done(len(response.content))
+
+        return response
 
     def directory_create(self, path, safe=False):
         """
@@ -260,12 +246,20 @@ class Client(object):
 
         """
         expected_codes = 201 if not safe else (201, 301, 405)
-        self._send('MKCOL', path, expected_codes)
+        response = self._send('MKCOL', path, expected_codes)
+        if response.status_code in (201, 405):
+            self.collection_cache.add(self.base_url, split_path(self._absolute_path(path)),
+                                      created=response.status_code == 201)
 
     def directories_create(self, path):
         """
         Method to create nested directories
 
+        Directories this Client has seen are skipped without a request.  The
+        deepest unknown directory is tried first and parents are only tried
+        when the server answers 409, so a tree that mostly exists costs one MKCOL.
+        Below a directory this Client made the missing ones are made straight away.
+
         :type path: String
         :param path: Path from your root
 
@@ -273,28 +267,85 @@ class Client(object):
         :return: None
 
         """
-        directories = [d for d in path.split('/') if d]
-        if not directories:
+        # Build paths from the root so the working directory is never changed
+        parts = split_path(self._absolute_path(path))
+        known, created = self.collection_cache.lookup(self.base_url, parts)
+        if known == len(parts):
             return
 
-        if path.startswith('/'):
-            directories[0] = '/' + directories[0]
+        depth = known + 1 if created else len(parts)
+        while not self.__collection_create(parts[:depth], conflict_ok=depth > 1):
+            depth -= 1
+            if depth == known:
+                # A directory the cache knew was removed by someone else
+                self.collection_cache.discard(self.base_url, parts[:known])
+                known = self.collection_cache.known_depth(self.base_url, parts)
 
-        old_working_directory = self.current_working_directory
-        try:
-            for directory in directories:
-                try:
-                    self.directory_create(directory, safe=True)
+        for missing_depth in range(depth + 1, len(parts) + 1):
+            self.__collection_create(parts[:missing_depth], conflict_ok=False)
 
-                except OperationFailed as e:
-                    if e.actual_code == 409:
-                        raise
+    def __collection_create(self, parts, conflict_ok):
+        """
+        Method to make one directory of a nested path, once across threads
 
-                finally:
-                    self.change_current_working_directory(directory)
+        :type parts: Tuple
+        :param parts: The names in the path
+        :type conflict_ok: Boolean
+        :param conflict_ok: If set to True a 409 for a missing parent is returned instead of raised
 
-        finally:
-            self.change_current_working_directory(old_working_directory)
+        :rtype: Boolean
+        :return: False if the parent is missing, otherwise True
+
+        :raises OperationFailed: If the server refuses the MKCOL for any other reason
+
+        """
+        with self.collection_cache.path_lock(self.base_url, parts):
+            if self.collection_cache.known_depth(self.base_url, parts) == len(parts):
+                return True
+
+            path = '/' + '/'.join(parts)
+            expected_codes = (201, 301, 405, 409) if conflict_ok else (201, 301, 405)
+            response = self._send('MKCOL', path, expected_codes)
+            if response.status_code == 409:
+                return False
+
+            # A 301 points somewhere else, only a made or an existing collection is remembered
+            if response.status_code in (201, 405):
+                self.collection_cache.add(self.base_url, parts, created=response.status_code == 201)
+
+            return True
+
+    def directories_create_many(self, paths, max_workers=8):
+        """
+        Method to create many nested directories at once
+
+        Paths inside other paths in the list are dropped, the parents shared by
+        several paths are created first, then every path is created concurrently
+
+        :type paths: Iterable
+        :param paths: Paths from your root
+        :type max_workers: Integer
+        :param max_workers: The most MKCOLs to run at once
+
+        :rtype: List
+        :return: A list of BulkResult objects, one for each deepest path, sorted by path
+
+        """
+        wanted = set(split_path(self._absolute_path(path)) for path in paths)
+        wanted.discard(())
+        parents = set(parts[:depth] for parts in wanted for depth in range(1, len(parts)))
+        leaves = sorted(parts for parts in wanted if parts not in parents
+                        and self.collection_cache.known_depth(self.base_url, parts) < len(parts))
+
+        shared_counts = {}
+        for parts in leaves:
+            for depth in range(1, len(parts)):
+                shared_counts[parts[:depth]] = shared_counts.get(parts[:depth], 0) + 1
+
+        shared = set(parts for parts, count in shared_counts.items() if count > 1)
+        deepest_shared = sorted(shared - set(parts[:-1] for parts in shared))
+        run_concurrently(lambda parts: self.directories_create('/' + '/'.join(parts)), deepest_shared, max_workers)
+        return run_concurrently(lambda parts: self.directories_create('/' + '/'.join(parts)), leaves, max_workers)
 
     def directory_delete(self, path, safe=False):
         """
@@ -308,10 +359,14 @@ class Client(object):
         :rtype: None
         :return: None
 
+        :raises MultiStatusFailed: If some of the resources in the directory could not be deleted
+
         """
         path = str(path).rstrip('/') + '/'
-        expected_codes = (200, 204) if not safe else (200, 204, 404)
-        self._send('DELETE', path, expected_codes)
+        expected_codes = (200, 204, 207) if not safe else (200, 204, 207, 404)
+        response = self._send('DELETE', path, expected_codes)
+        self.collection_cache.discard(self.base_url, split_path(self._absolute_path(path)))
+        self.__check_multistatus('DELETE', path, (200, 204), response)
 
     def resource_delete(self, path):
         """
@@ -323,16 +378,198 @@ class Client(object):
         :rtype: None
         :return: None
 
+        :raises MultiStatusFailed: If the resource is a directory and some of it could not be deleted
+
+        """
+        expected_codes = (200, 204, 207)
+        response = self._send('DELETE', path, expected_codes)
+        self.collection_cache.discard(self.base_url, split_path(self._absolute_path(path)))
+        self.__check_multistatus('DELETE', path, (200, 204), response)
+
+    def delete_many(self, paths, max_workers=8, progress=None):
+        """
+        Method to delete many resources at once over the connection pool
+
+        Paths ending in / are deleted as directories
+
+        :type paths: Iterable
+        :param paths: Paths from your root
+        :type max_workers: Integer
+        :param max_workers: The most DELETEs to run at once
+        :type progress: Callable
+        :param progress: Called as progress(completed, total, bulk_result) after every delete
+
+        :rtype: List
+        :return: A list of BulkResult objects in the same order as paths
+
+        """
+        return run_concurrently(lambda path: self.directory_delete(path) if str(path).endswith('/')
+                                else self.resource_delete(path), paths, max_workers, progress)
+
+    def delete_tree(self, path, max_workers=8, progress=None):
+        """
+        Method to delete a directory tree bottom up with many small DELETEs
+
+        The tree is listed first, then every file is deleted concurrently, then
+        the directories deepest first, each depth concurrently, and the top
+        directory last.  No single request has to delete a large tree, so none
+        can block for long, and progress is reported for every resource.
+        Directories above a resource that could not be deleted are left in place
+        without a request, and the total progress reports drops by their number.
+
+        :type path: String
+        :param path: Path from your root
+        :type max_workers: Integer
+        :param max_workers: The most DELETEs to run at once
+        :type progress: Callable
+        :param progress: Called as progress(completed, total, bulk_result) after every delete
+
+        :rtype: List
+        :return: A list of BulkResult objects, files first then directories deepest first
+
+        """
+        root = self._absolute_path(path).rstrip('/') + '/'
+        files = []
+        levels = {}
+        for file_data in self.walk(root, max_workers=max_workers):
+            # Keep the href percent encoded, a # or ? in a name would otherwise end the path
+            resource_path = self._href_to_path(file_data.resource_url)
+            if self._href_key(resource_path) == self._href_key(root):
+                continue
+
+            if file_data.is_dir():
+                directory = resource_path.rstrip('/') + '/'
+                levels.setdefault(directory.count('/'), []).append(directory)
+
+            else:
+                files.append(resource_path)
+
+        batches = [files] + [levels[depth] for depth in sorted(levels, reverse=True)] + [[root]]
+        total = sum(len(batch) for batch in batches)
+        results = []
+        for index, batch in enumerate(batches):
+            batch_progress = None
+            if progress is not None:
+                done = len(results)
+                batch_progress = lambda completed, _, result, done=done: progress(done + completed, total, result)
+
+            batch_results = self.delete_many(batch, max_workers, batch_progress)
+            results.extend(batch_results)
+            failed = [unquote(result.item) for result in batch_results if not result.ok]
+            if failed:
+                # The directories above a failure stay, so they are taken out of the later batches and the total
+                batches[index + 1:] = [[item for item in later if not any(failure.startswith(unquote(item))
+                                                                          for failure in failed)]
+                                       for later in batches[index + 1:]]
+                total = len(results) + sum(len(later) for later in batches[index + 1:])
+
+        return results
+
+    def copy(self, source_path, destination_path, depth='infinity', overwrite=True):
+        """
+        Method to copy a resource or directory on the server, no data goes through the client
+
+        :type source_path: String
+        :param source_path: Path from your root
+        :type destination_path: String
+        :param destination_path: Path from your root
+        :type depth: Integer or String
+        :param depth: 0 to copy only a directory and its properties, infinity to copy everything in it
+        :type overwrite: Boolean
+        :param overwrite: If set to False the copy fails with 412 when the destination exists
+
+        :rtype: None
+        :return: None
+
+        :raises MultiStatusFailed: If some of the resources in a directory could not be copied
+
+        """
+        self.__copy_or_move('COPY', source_path, destination_path, depth, overwrite)
+
+    def move(self, source_path, destination_path, overwrite=True):
+        """
+        Method to move or rename a resource or directory on the server, no data goes through the client
+
+        :type source_path: String
+        :param source_path: Path from your root
+        :type destination_path: String
+        :param destination_path: Path from your root
+        :type overwrite: Boolean
+        :param overwrite: If set to False the move fails with 412 when the destination exists
+
+        :rtype: None
+        :return: None
+
+        :raises MultiStatusFailed: If some of the resources in a directory could not be moved
+
+        """
+        self.collection_cache.discard(self.base_url, split_path(self._absolute_path(source_path)))
+        self.__copy_or_move('MOVE', source_path, destination_path, 'infinity', overwrite)
+
+    def __copy_or_move(self, method, source_path, destination_path, depth, overwrite):
+        """
+        Method to send a COPY or MOVE and check a multistatus answer for failures
+
+        :type method: String
+        :param method: COPY or MOVE
+        :type source_path: String
+        :param source_path: Path from your root
+        :type destination_path: String
+        :param destination_path: Path from your root
+        :type depth: Integer or String
+        :param depth: The Depth header
+        :type overwrite: Boolean
+        :param overwrite: The Overwrite header
+
+        :rtype: None
+        :return: None
+
+        """
+        expected_codes = (201, 204, 207)
+        headers = {'Destination': self._destination_url(destination_path), 'Depth': str(depth),
+                   'Overwrite': 'T' if overwrite else 'F'}
+        response = self._send(method, source_path, expected_codes, headers=headers)
+        self.__check_multistatus(method, source_path, (201, 204), response)
+
+    def __check_multistatus(self, method, path, success_codes, response):
         """
-        expected_codes = (200, 204)
-        self._send('DELETE', path, expected_codes)
+        Method to raise the failures a 207 answer lists, and release the response
+
+        :type method: String
+        :param method: WebDav Method
+        :type path: String
+        :param path: WebDav Path to resource
+        :type success_codes: Tuple
+        :param success_codes: The codes a complete success is answered with
+        :type response: requests.response Object
+        :param response: The response
+
+        :rtype: None
+        :return: None
+
+        :raises MultiStatusFailed: If the multistatus lists failed resources
+
+        """
+        try:
+            if response.status_code == 207:
+                failures = failed_responses(self._iter_multistatus(response))
+                if failures:
+                    raise MultiStatusFailed(method, path, success_codes, 207, failures)
+
+        finally:
+            response.close()
 
     def upload(self, local_path_or_fileobj, remote_path):
         """
         Method to upload files to WebDav Server
 
-        :type local_path_or_fileobj: String
-        :param local_path_or_fileobj: The path
+        Paths to large files are memory mapped and sent without copying them
+        into Python.  Bytes, bytearray and memoryview buffers and binary file
+        objects are sent with a Content-Length.  Any other iterable of bytes
+        chunks, like a generator, is sent with chunked transfer encoding.
+
+        :type local_path_or_fileobj: String, File Object, Bytes or Iterable
+        :param local_path_or_fileobj: The path, a binary file object, a buffer, or an iterable of bytes chunks
         :type remote_path: String
         :param remote_path: The path
 
@@ -341,52 +578,1033 @@ class Client(object):
 
         """
         expected_codes = (200, 201, 204)
+        if not self._is_local_path(local_path_or_fileobj):
+            self._send('PUT', remote_path, expected_codes, data=self._upload_body(local_path_or_fileobj))
+            return
+
         with open(local_path_or_fileobj, 'rb') as file:
-            self._send('PUT', remote_path, expected_codes, data=file)
+            size = os.fstat(file.fileno()).st_size
+            if size < MMAP_THRESHOLD_BYTES:
+                self._send('PUT', remote_path, expected_codes, data=file)
+                return
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                self._send('PUT', remote_path, expected_codes, data=view)
+
+    @staticmethod
+    def _upload_body(source):
+        """
+        Method to turn an upload source that is not a path into a request body
+
+        :type source: File Object, Bytes or Iterable
+        :param source: A binary file object, a buffer, or an iterable of bytes chunks
+
+        :rtype: Object
+        :return: Something requests can send as data
 
-    def download(self, remote_path, local_path_or_fileobj):
+        """
+        if isinstance(source, memoryview) and source.format != 'B':
+            # Lengths are counted in bytes, not items
+            return source.cast('B')
+
+        if isinstance(source, (bytes, bytearray, memoryview)) or hasattr(source, 'read'):
+            return source
+
+        # Lists and tuples would be form encoded by requests, any iterator is streamed chunked
+        return iter(source)
+
+    def upload_if_changed(self, local_path, remote_path, checksum=None):
+        """
+        Method to upload a local file unless the remote copy is already identical
+
+        With checksum set and a server digest of that kind available, from
+        oc:checksums or an MD5 ETag, files of the same size are compared by
+        content.  Otherwise they count as identical when the sizes match and the
+        remote copy is not older than the local file.  The PUT carries
+        If-None-Match: * for a new file and If-Match with the ETag for an
+        existing one, so a change made by someone else in between fails with 412
+        instead of being overwritten.  The local file is read once, it is hashed
+        while it is sent when there was nothing to compare first.
+
+        :type local_path: String
+        :param local_path: The local path
+        :type remote_path: String
+        :param remote_path: The path
+        :type checksum: String
+        :param checksum: A hashlib algorithm from CHECKSUM_LABELS to compare and report content with
+
+        :rtype: UploadResult
+        :return: What was done
+
+        :raises OperationFailed: If the upload failed, with 412 if the remote copy changed meanwhile
+
+        """
+        properties = self.__checksum_properties(checksum)
+        return self.__upload_if_changed(local_path, remote_path, self.__stat(remote_path, properties), checksum)
+
+    def upload_many_if_changed(self, pairs, max_workers=8, checksum=None, create_directories=True, progress=None):
+        """
+        Method to upload many local files at once skipping the ones already identical
+
+        The remote copies are looked up with stat_many, one listing per parent
+        directory, then the files are compared and uploaded like
+        upload_if_changed does
+
+        :type pairs: Iterable
+        :param pairs: (local_path, remote_path) tuples
+        :type max_workers: Integer
+        :param max_workers: The most requests to run at once
+        :type checksum: String
+        :param checksum: A hashlib algorithm from CHECKSUM_LABELS to compare and report content with
+        :type create_directories: Boolean
+        :param create_directories: If set to False parent directories are expected to exist
+        :type progress: Callable
+        :param progress: Called as progress(completed, total, bulk_result) after every file
+
+        :rtype: List
+        :return: A list of BulkResult objects holding UploadResult objects, in the same order as pairs
+
+        """
+        pairs = list(pairs)
+        errors = {}
+        remote_files = self.stat_many([remote_path for _, remote_path in pairs], max_workers,
+                                      self.__checksum_properties(checksum), errors)
+        if create_directories:
+            self.__create_parent_directories([remote_path for _, remote_path in pairs
+                                              if remote_path in remote_files and remote_files[remote_path] is None],
+                                             max_workers)
+
+        def upload(pair):
+            if pair[1] in errors:
+                raise errors[pair[1]]
+
+            return self.__upload_if_changed(pair[0], pair[1], remote_files[pair[1]], checksum)
+
+        return run_concurrently(upload, pairs, max_workers, progress)
+
+    @staticmethod
+    def __checksum_properties(checksum):
+        """
+        Method to get the properties to look remote copies up with
+
+        :type checksum: String
+        :param checksum: A hashlib algorithm from CHECKSUM_LABELS, or None
+
+        :rtype: Tuple
+        :return: The properties, None for the defaults
+
+        :raises ValueError: If the algorithm is not one of CHECKSUM_LABELS
+
+        """
+        if checksum is None:
+            return None
+
+        if checksum not in CHECKSUM_LABELS:
+            raise ValueError('Method upload_if_changed can not compare {checksum} checksums, use one of '
+                             '{labels}'.format(checksum=checksum, labels=tuple(CHECKSUM_LABELS)))
+
+        return DEFAULT_PROPERTIES + (CHECKSUMS_PROPERTY,)
+
+    def __upload_if_changed(self, local_path, remote_path, remote_file, checksum):
+        """
+        Method to compare a local file with what is known of its remote copy and upload it if they differ
+
+        :type local_path: String
+        :param local_path: The local path
+        :type remote_path: String
+        :param remote_path: The path
+        :type remote_file: FileData
+        :param remote_file: The remote copy, None if there is none
+        :type checksum: String
+        :param checksum: A hashlib algorithm from CHECKSUM_LABELS, or None
+
+        :rtype: UploadResult
+        :return: What was done
+
+        """
+        with open(local_path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            headers = {}
+            if remote_file is None:
+                reason = 'missing'
+                headers['If-None-Match'] = '*'
+
+            else:
+                if remote_file.etag and not remote_file.etag.startswith('W/'):
+                    headers['If-Match'] = remote_file.etag
+
+                elif remote_file.modified_time:
+                    headers['If-Unmodified-Since'] = remote_file.modified_time
+
+                remote_digest = remote_checksum(remote_file, checksum) if checksum else None
+                if remote_file.file_size != stat.st_size:
+                    reason = 'size'
+
+                elif remote_digest is not None:
+                    return self.__upload_if_digest_differs(file, stat.st_size, remote_path, remote_file, checksum,
+                                                           remote_digest, headers)
+
+                elif unchanged((stat.st_size, stat.st_mtime),
+                               (remote_file.file_size, remote_file.modified_epoch, remote_file.etag), None, 'push'):
+                    return UploadResult(remote_path, False, 'unchanged', etag=remote_file.etag)
+
+                else:
+                    reason = 'modified'
+
+            body = file if checksum is None else HashingReader(file, checksum)
+            response = self._send('PUT', remote_path, (200, 201, 204), headers=headers, data=body)
+            return UploadResult(remote_path, True, reason, body.hexdigest() if checksum else None,
+                                response.headers.get('ETag'))
+
+    def __upload_if_digest_differs(self, file, size, remote_path, remote_file, checksum, remote_digest, headers):
+        """
+        Method to hash a local file and upload the same data only if it differs from the server digest
+
+        Large files are memory mapped, so the data hashed is the data sent and the file is read once
+
+        :type file: File Object
+        :param file: The local file open at its start
+        :type size: Integer
+        :param size: The file size
+        :type remote_path: String
+        :param remote_path: The path
+        :type remote_file: FileData
+        :param remote_file: The remote copy
+        :type checksum: String
+        :param checksum: A hashlib algorithm from CHECKSUM_LABELS
+        :type remote_digest: String
+        :param remote_digest: The hex digest the server has
+        :type headers: Dict
+        :param headers: The conditional headers for the PUT
+
+        :rtype: UploadResult
+        :return: What was done
+
+        """
+        if size < MMAP_THRESHOLD_BYTES:
+            return self.__put_if_digest_differs(file.read(), remote_path, remote_file, checksum, remote_digest,
+                                                headers)
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return self.__put_if_digest_differs(view, remote_path, remote_file, checksum, remote_digest, headers)
+
+    def __put_if_digest_differs(self, data, remote_path, remote_file, checksum, remote_digest, headers):
+        """
+        Method to upload a buffer only if its digest differs from the server digest
+
+        :type data: Bytes or memoryview
+        :param data: The whole file
+        :type remote_path: String
+        :param remote_path: The path
+        :type remote_file: FileData
+        :param remote_file: The remote copy
+        :type checksum: String
+        :param checksum: A hashlib algorithm from CHECKSUM_LABELS
+        :type remote_digest: String
+        :param remote_digest: The hex digest the server has
+        :type headers: Dict
+        :param headers: The conditional headers for the PUT
+
+        :rtype: UploadResult
+        :return: What was done
+
+        """
+        digest = hashlib.new(checksum, data).hexdigest()
+        if digest == remote_digest:
+            return UploadResult(remote_path, False, 'checksum', digest, remote_file.etag)
+
+        # Servers that keep checksums store this one, the next comparison does not need to fall back
+        headers['OC-Checksum'] = checksum_header(checksum, digest)
+        response = self._send('PUT', remote_path, (200, 201, 204), headers=headers, data=data)
+        return UploadResult(remote_path, True, 'checksum', digest, response.headers.get('ETag'))
+
+    def download(self, remote_path, local_path_or_fileobj, resume=False, segments=1):
         """
         Method to download files from WebDav server
 
+        The target can be a local path, a writable binary file object, or a
+        bytearray or writable memoryview that the body is read straight into.
+        With resume set, the ETag or Last-Modified of the resource is kept next to
+        the partial file until the download completes, a later call picks up from
+        the end of the partial file with a Range request guarded by If-Range.  With
+        segments set above 1, a resource that accepts byte ranges is fetched as that
+        many ranges in parallel, each written in place into a preallocated file.
+
         :type remote_path: String
         :param remote_path: The path
-        :type local_path_or_fileobj: String
-        :param local_path_or_fileobj: The path
+        :type local_path_or_fileobj: String, File Object or Buffer
+        :param local_path_or_fileobj: The path, a writable binary file object, or a writable buffer
+        :type resume: Boolean
+        :param resume: If set to True a partial file left by an earlier resumable download is continued, paths only
+        :type segments: Integer
+        :param segments: The number of byte ranges to fetch in parallel, paths only
+
+        :rtype: Integer
+        :return: The number of bytes read into a buffer target, otherwise None
+
+        :raises BufferTooSmall: If the body does not fit in a buffer target
+
+        """
+        if isinstance(local_path_or_fileobj, (bytearray, memoryview)):
+            return self.__download_into(remote_path, local_path_or_fileobj)
+
+        if self.cache is not None and not resume and segments <= 1:
+            content = self.__cached_get(remote_path)
+            if not self._is_local_path(local_path_or_fileobj):
+                self.__write_content(content, local_path_or_fileobj)
+                return
+
+            with open(local_path_or_fileobj, 'wb') as file:
+                self.__write_content(content, file)
+
+            return
+
+        if not self._is_local_path(local_path_or_fileobj):
+            response = self._send('GET', remote_path, 200, stream=True)
+            self.__write_response(response, local_path_or_fileobj)
+            return
+
+        if segments > 1 and self.__download_segments(remote_path, local_path_or_fileobj, segments):
+            return
+
+        headers = {}
+        mode = 'wb'
+        validator_path = None
+        if resume:
+            validator_path = os.fspath(local_path_or_fileobj) + RESUME_SUFFIX
+            if os.path.exists(validator_path) and os.path.exists(local_path_or_fileobj):
+                with open(validator_path, 'r') as file:
+                    validator = file.read()
+
+                offset = os.path.getsize(local_path_or_fileobj)
+                if validator and offset:
+                    headers = {'Range': 'bytes={offset}-'.format(offset=offset), 'If-Range': validator}
+
+        expected_codes = (200, 206, 416) if headers else 200
+        response = self._send('GET', remote_path, expected_codes, headers=headers, stream=True)
+        if response.status_code == 416:
+            # The partial file does not fit the resource any more, start again
+            response.close()
+            response = self._send('GET', remote_path, 200, stream=True)
+
+        if response.status_code == 206:
+            mode = 'ab'
+
+        elif resume:
+            validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            if validator:
+                with open(validator_path, 'w') as file:
+                    file.write(validator)
+
+        with open(local_path_or_fileobj, mode) as file:
+            self.__write_response(response, file)
+
+        if resume and os.path.exists(validator_path):
+            os.remove(validator_path)
+
+    def __download_segments(self, remote_path, local_path, segments):
+        """
+        Method to download a resource as byte ranges fetched in parallel
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type local_path: String
+        :param local_path: The path
+        :type segments: Integer
+        :param segments: The number of byte ranges
+
+        :rtype: Boolean
+        :return: False if the resource is too small or does not accept byte ranges
+
+        """
+        minimum_segment_size_bytes = 1 * 1024 * 1024
+        response = self._send('HEAD', remote_path, 200)
+        size = int(response.headers.get('Content-Length') or 0)
+        if response.headers.get('Accept-Ranges', '').lower() != 'bytes' or size < 2 * minimum_segment_size_bytes:
+            return False
+
+        segments = min(segments, size // minimum_segment_size_bytes)
+        validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+        segment_size = -(-size // segments)
+        with open(local_path, 'wb') as file:
+            file.truncate(size)
+
+        def fetch(start):
+            end = min(start + segment_size, size) - 1
+            headers = {'Range': 'bytes={start}-{end}'.format(start=start, end=end)}
+            if validator:
+                headers['If-Range'] = validator
+
+            # A 200 means the resource changed since the HEAD
+            segment_response = self._send('GET', remote_path, 206, headers=headers, stream=True)
+            with open(local_path, 'r+b') as segment_file:
+                segment_file.seek(start)
+                self.__write_response(segment_response, segment_file)
+
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            list(executor.map(fetch, range(0, size, segment_size)))
+
+        return True
+
+    def __download_into(self, remote_path, buffer):
+        """
+        Method to read a resource straight into a writable buffer
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type buffer: Buffer
+        :param buffer: A bytearray or writable memoryview
+
+        :rtype: Integer
+        :return: The number of bytes read
+
+        :raises BufferTooSmall: If the body does not fit in the buffer
+
+        """
+        with memoryview(buffer) as buffer_view, buffer_view.cast('B') as view:
+            response = self._send('GET', remote_path, 200, headers={'Accept-Encoding': 'identity'}, stream=True)
+            try:
+                length = response.headers.get('Content-Length')
+                if length is not None and int(length) > len(view):
+                    raise BufferTooSmall('Method download {path} is {length} bytes, the buffer holds '
+                                         '{size}'.format(path=remote_path, length=length, size=len(view)))
+
+                if response.headers.get('Content-Encoding', 'identity') != 'identity':
+                    # Compressed bodies have to be decoded, so they are copied in
+                    position = 0
+                    for chunk in response.iter_content(self.download_chunk_size_bytes):
+                        if position + len(chunk) > len(view):
+                            raise BufferTooSmall('Method download {path} does not fit in a buffer of {size} '
+                                                 'bytes'.format(path=remote_path, size=len(view)))
+
+                        view[position:position + len(chunk)] = chunk
+                        position += len(chunk)
+
+                    return position
+
+                position = 0
+                while position < len(view):
+                    count = response.raw.readinto(view[position:])
+                    if not count:
+                        return position
+
+                    position += count
+
+                if response.raw.read(1):
+                    raise BufferTooSmall('Method download {path} does not fit in a buffer of {size} '
+                                         'bytes'.format(path=remote_path, size=len(view)))
+
+                return position
+
+            finally:
+                response.close()
+
+    def __cached_get(self, remote_path):
+        """
+        Method to GET a resource revalidating a cached body
+
+        :type remote_path: String
+        :param remote_path: The path
+
+        :rtype: Bytes or requests.response Object
+        :return: The body, or a streamed response if the body cannot be cached
+
+        """
+        key = ('GET', self._get_url(remote_path))
+        entry = self.cache.get(key)
+        headers = entry.conditional_headers() if entry else {}
+        expected_codes = (200, 304) if entry else 200
+        response = self._send('GET', remote_path, expected_codes, headers=headers, stream=True)
+        if response.status_code == 304:
+            response.close()
+            self.cache.record(True)
+            return entry.value
+
+        self.cache.record(False)
+        length = response.headers.get('Content-Length')
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if length is None or int(length) > self.cache.max_entry_bytes or not (etag or last_modified):
+            self.cache.invalidate(key)
+            return response
+
+        content = response.content
+        self.cache.put(key, etag, last_modified, content, len(content))
+        return content
+
+    def __write_content(self, content, file):
+        """
+        Method to write a body or a streamed response to a file
+
+        :type content: Bytes or requests.response Object
+        :param content: The body, or a streamed response
+        :type file: File Object
+        :param file: The file to write to
 
         :rtype: None
         :return: None
 
+        """
+        if isinstance(content, bytes):
+            file.write(content)
+
+        else:
+            self.__write_response(content, file)
+
+    def open_remote(self, remote_path, chunk_size=None):
+        """
+        Method to open a resource on the WebDav server as a readable stream
+
+        The body is read from the pooled connection as it is consumed.  The stream
+        is seekable when the server accepts byte ranges, a seek opens a new Range
+        request guarded by If-Range.
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type chunk_size: Integer
+        :param chunk_size: The read buffer size, defaults to download_chunk_size_bytes
+
+        :rtype: io.BufferedReader
+        :return: A readable binary stream
 
         """
-        download_chunk_size_bytes = 1 * 1024 * 1024
-        expected_codes = 200
-        response = self._send('GET', remote_path, expected_codes, stream=True)
-        with open(local_path_or_fileobj, 'wb') as file:
-            for chunk in response.iter_content(download_chunk_size_bytes):
+        return io.BufferedReader(RemoteFile(self, remote_path), chunk_size or self.download_chunk_size_bytes)
+
+    def __write_response(self, response, file):
+        """
+        Method to write a streamed response body to a file
+
+        :type response: requests.response Object
+        :param response: A response
+        :type file: File Object
+        :param file: The file to write to
+
+        :rtype: None
+        :return: None
+
+        """
+        try:
+            for chunk in response.iter_content(self.download_chunk_size_bytes):
                 file.write(chunk)
 
-    def resource_list(self, remote_path='.'):
+        finally:
+            response.close()
+
+    def upload_many(self, pairs, max_workers=8, create_directories=True, progress=None):
+        """
+        Method to upload many files at once over the connection pool
+
+        Missing parent directories are created once each before the uploads start.
+        Keep max_workers at or below pool_maxsize so every worker keeps its connection.
+
+        :type pairs: Iterable
+        :param pairs: (local_path_or_fileobj, remote_path) tuples
+        :type max_workers: Integer
+        :param max_workers: The most uploads to run at once
+        :type create_directories: Boolean
+        :param create_directories: If set to False parent directories are expected to exist
+        :type progress: Callable
+        :param progress: Called as progress(completed, total, bulk_result) after every file
+
+        :rtype: List
+        :return: A list of BulkResult objects in the same order as pairs
+
+        """
+        pairs = list(pairs)
+        if create_directories:
+            self.__create_parent_directories([remote_path for _, remote_path in pairs], max_workers)
+
+        return run_concurrently(lambda pair: self.upload(*pair), pairs, max_workers, progress)
+
+    def download_many(self, pairs, max_workers=8, progress=None):
+        """
+        Method to download many files at once over the connection pool
+
+        Missing local parent directories are created once each
+
+        :type pairs: Iterable
+        :param pairs: (remote_path, local_path) tuples
+        :type max_workers: Integer
+        :param max_workers: The most downloads to run at once
+        :type progress: Callable
+        :param progress: Called as progress(completed, total, bulk_result) after every file
+
+        :rtype: List
+        :return: A list of BulkResult objects in the same order as pairs
+
+        """
+        pairs = list(pairs)
+        local_directories = set(os.path.dirname(local_path) for _, local_path in pairs
+                                if self._is_local_path(local_path))
+        for local_directory in local_directories:
+            if local_directory:
+                os.makedirs(local_directory, exist_ok=True)
+
+        return run_concurrently(lambda pair: self.download(*pair), pairs, max_workers, progress)
+
+    def copy_many(self, pairs, max_workers=8, depth='infinity', overwrite=True, progress=None):
+        """
+        Method to run many server side copies at once over the connection pool
+
+        :type pairs: Iterable
+        :param pairs: (source_path, destination_path) tuples
+        :type max_workers: Integer
+        :param max_workers: The most copies to run at once
+        :type depth: Integer or String
+        :param depth: 0 to copy only directories and their properties, infinity to copy everything in them
+        :type overwrite: Boolean
+        :param overwrite: If set to False copies onto existing destinations fail
+        :type progress: Callable
+        :param progress: Called as progress(completed, total, bulk_result) after every copy
+
+        :rtype: List
+        :return: A list of BulkResult objects in the same order as pairs
+
+        """
+        return run_concurrently(lambda pair: self.copy(pair[0], pair[1], depth=depth, overwrite=overwrite), pairs,
+                                max_workers, progress)
+
+    def move_many(self, pairs, max_workers=8, overwrite=True, progress=None):
+        """
+        Method to run many server side moves at once over the connection pool
+
+        :type pairs: Iterable
+        :param pairs: (source_path, destination_path) tuples
+        :type max_workers: Integer
+        :param max_workers: The most moves to run at once
+        :type overwrite: Boolean
+        :param overwrite: If set to False moves onto existing destinations fail
+        :type progress: Callable
+        :param progress: Called as progress(completed, total, bulk_result) after every move
+
+        :rtype: List
+        :return: A list of BulkResult objects in the same order as pairs
+
+        """
+        return run_concurrently(lambda pair: self.move(pair[0], pair[1], overwrite=overwrite), pairs, max_workers,
+                                progress)
+
+    def __create_parent_directories(self, remote_paths, max_workers):
+        """
+        Method to create the parent directories of many paths, each one once
+
+        A failure is left to show up on the items that need the directory
+
+        :type remote_paths: List
+        :param remote_paths: The paths that need parents
+        :type max_workers: Integer
+        :param max_workers: The most MKCOLs to run at once
+
+        :rtype: None
+        :return: None
+
+        """
+        parents = set()
+        for remote_path in remote_paths:
+            parent = self._absolute_path(remote_path).rsplit('/', 1)[0]
+            if parent:
+                parents.add(parent)
+
+        self.directories_create_many(parents, max_workers)
+
+    def sync(self, local_dir, remote_dir, direction='push', delete=False, dry_run=False, state_file=None,
+             max_workers=8, progress=None):
+        """
+        Method to mirror a local directory and a remote directory
+
+        Both sides are indexed, compared by size, modified time and ETag, and only
+        the directories, transfers and deletes needed are run, concurrently.  With
+        a state file later runs only move what changed.
+
+        :type local_dir: String
+        :param local_dir: The local directory
+        :type remote_dir: String
+        :param remote_dir: The remote directory
+        :type direction: String
+        :param direction: push to copy local changes to the server, pull for the other way round
+        :type delete: Boolean
+        :param delete: If set to True things missing from the source are deleted from the destination
+        :type dry_run: Boolean
+        :param dry_run: If set to True the plan is returned without doing anything
+        :type state_file: String
+        :param state_file: A local path to keep the sync state in
+        :type max_workers: Integer
+        :param max_workers: The most requests to run at once
+        :type progress: Callable
+        :param progress: Called as progress(completed, total, bulk_result) after every transfer
+
+        :rtype: SyncPlan
+        :return: The plan, with the results of every step unless it was a dry run
+
+        """
+        return sync(self, local_dir, remote_dir, direction=direction, delete=delete, dry_run=dry_run,
+                    state_file=state_file, max_workers=max_workers, progress=progress)
+
+    def resource_list(self, remote_path='.', as_table=False, properties=None, parser_pool=None):
         """
         Method to list resources on the WebDav server
 
         :type remote_path: String
         :param remote_path: The path
+        :type as_table: Boolean
+        :param as_table: If set to True a columnar ResourceTable is returned
+        :type properties: Iterable
+        :param properties: The properties to ask for, defaults to the ones FileData stores
+        :type parser_pool: concurrent.futures.Executor
+        :param parser_pool: A ProcessPoolExecutor to parse the body in, the response cache is not used with it
+
+        :type: List
+        :return: A list of FileData objects, or a ResourceTable
+
+        """
+        if parser_pool is not None:
+            if properties is not None:
+                properties = list(properties)
+
+            records = self.__pooled_file_records(self._propfind(remote_path, properties), properties, parser_pool)
+            if as_table:
+                table = ResourceTable()
+                for record in records:
+                    table.append_values(*record)
+
+                return table
+
+            return [FileData(*record) for record in records]
+
+        if as_table:
+            table = ResourceTable()
+            for element in self._iter_response_elements(remote_path, properties):
+                table.append_values(*self._file_values(element))
+
+            return table
+
+        if self.cache is not None:
+            return self.__cached_resource_list(remote_path, properties)
+
+        return list(self.iter_resources(remote_path, properties))
+
+    def __pooled_file_records(self, response, properties, parser_pool):
+        """
+        Method to read a whole listing and parse it in a pool of parser processes
+
+        XML parsing holds the GIL, handing the raw body to another process lets
+        many threads crawling collections use more than one core.  The time
+        waiting on the pool is reported to the instrumentation as parse time.
+
+        :type response: requests.response Object
+        :param response: A PROPFIND response
+        :type properties: List
+        :param properties: The properties asked for, None for the defaults
+        :type parser_pool: concurrent.futures.Executor
+        :param parser_pool: The pool to parse in
+
+        :rtype: List
+        :return: A list of FileData argument tuples
+
+        """
+        try:
+            body = response.content
+
+        finally:
+            response.close()
+
+        start = time.perf_counter()
+        records = parser_pool.submit(parse_file_records, body, self._extra_tags(properties)).result()
+        if self.instrumentation is not None:
+            self.instrumentation.after_parse(response.url, time.perf_counter() - start, len(records))
+
+        return records
+
+    def __cached_resource_list(self, remote_path, properties):
+        """
+        Method to list resources revalidating a cached listing
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: Iterable
+        :param properties: The properties to ask for, defaults to the ones FileData stores
 
         :type: List
         :return: A list of FileData objects
 
         """
-        headers = {'Depth': '1'}
-        expected_codes = (207, 301)
-        response = self._send('PROPFIND', remote_path, expected_codes, headers=headers)
+        approximate_entry_size_bytes = 256
+        if properties is not None:
+            properties = list(properties)
+
+        key = ('PROPFIND', self._get_url(remote_path), None if properties is None else tuple(properties))
+        entry = self.cache.get(key)
+        headers = entry.conditional_headers() if entry else None
+        expected_codes = (207, 301, 304) if entry else (207, 301)
+        response = self._propfind(remote_path, properties, expected_codes=expected_codes, headers=headers)
+        if response.status_code == 304:
+            response.close()
+            self.cache.record(True)
+            return list(entry.value)
+
+        self.cache.record(False)
+        listing = list(self.__iter_file_data(response, properties))
+        self.cache.put(key, response.headers.get('ETag'), response.headers.get('Last-Modified'), listing,
+                       len(listing) * approximate_entry_size_bytes)
+        return list(listing)
+
+    def iter_resources(self, remote_path='.', properties=None, depth=1):
+        """
+        Method to lazily list resources on the WebDav server
+
+        The multistatus body is streamed and parsed incrementally, each FileData
+        object is yielded as soon as its response element has been received.
+        Requested properties FileData has no field for are available with
+        FileData.get_property
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: Iterable
+        :param properties: The properties to ask for, defaults to the ones FileData stores
+        :type depth: Integer or String
+        :param depth: The Depth header, 0, 1 or infinity
+
+        :rtype: Generator
+        :return: A generator of FileData objects
+
+        """
+        if properties is not None:
+            properties = list(properties)
+
+        response = self._propfind(remote_path, properties, depth=depth)
+        yield from self.__iter_file_data(response, properties)
+
+    def walk(self, remote_path='.', properties=None, max_workers=8, parser_pool=None):
+        """
+        Method to recursively list a tree on the WebDav server
+
+        A single Depth infinity PROPFIND is tried first.  If the server refuses it
+        with 403, as servers not allowing infinite depth do, the tree is crawled
+        breadth first with Depth 1 PROPFINDs spread over a pool of worker threads.
+        Every resource is yielded once, collections are listed once even when the
+        server redirects.
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: Iterable
+        :param properties: The properties to ask for, defaults to the ones FileData stores
+        :type max_workers: Integer
+        :param max_workers: The most Depth 1 PROPFINDs to have in flight when crawling
+        :type parser_pool: concurrent.futures.Executor
+        :param parser_pool: A ProcessPoolExecutor to parse the Depth 1 listings in when crawling
+
+        :rtype: Generator
+        :return: A generator of FileData objects
+
+        """
+        if properties is not None:
+            properties = list(properties)
+
+        response = self._propfind(remote_path, properties, depth='infinity', expected_codes=(207, 301, 403))
+        if response.status_code != 403:
+            yield from self.__iter_file_data(response, properties)
+            return
+
+        response.close()
+        LOGGER.debug('Method walk infinite depth refused for {path} crawling with Depth 1'.format(path=remote_path))
+        yield from self.__walk_depth_one(remote_path, properties, max_workers, parser_pool)
+
+    def __iter_file_data(self, response, properties):
+        """
+        Method to lazily build FileData objects from a streamed multistatus response
+
+        :type response: requests.response Object
+        :param response: A PROPFIND response
+        :type properties: List
+        :param properties: The properties asked for, None for the defaults
+
+        :rtype: Generator
+        :return: A generator of FileData objects
+
+        """
+        extra_tags = self._extra_tags(properties)
+        for element in self._iter_multistatus(response):
+            yield self.__file_object_builder(element, extra_tags)
+
+    def __walk_depth_one(self, remote_path, properties, max_workers, parser_pool=None):
+        """
+        Method to crawl a tree with concurrent Depth 1 PROPFINDs
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: Iterable
+        :param properties: The properties to ask for
+        :type max_workers: Integer
+        :param max_workers: The most PROPFINDs to have in flight
+        :type parser_pool: concurrent.futures.Executor
+        :param parser_pool: A ProcessPoolExecutor to parse the listings in
+
+        :rtype: Generator
+        :return: A generator of FileData objects
+
+        """
+        seen = set()
+        listed = {self._href_key(urlparse(self._get_url(remote_path)).path)}
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {executor.submit(self.__list_collection, remote_path, properties, parser_pool)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, listing = future.result()
+                    # A redirected collection was listed at the url it points to
+                    listed.add(self._href_key(url))
+                    for file_data in listing:
+                        key = self._href_key(file_data.resource_url)
+                        if key in seen:
+                            continue
+
+                        seen.add(key)
+                        yield file_data
+                        if file_data.is_dir() and key not in listed:
+                            listed.add(key)
+                            pending.add(executor.submit(self.__list_collection,
+                                                        self._href_to_path(file_data.resource_url), properties,
+                                                        parser_pool))
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+            executor.shutdown(wait=False)
+
+    def __list_collection(self, remote_path, properties, parser_pool=None):
+        """
+        Method to list one collection of a crawl
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: List
+        :param properties: The properties to ask for, None for the defaults
+        :type parser_pool: concurrent.futures.Executor
+        :param parser_pool: A ProcessPoolExecutor to parse the listing in
+
+        :rtype: Tuple
+        :return: The url the listing came from once redirects were followed, and a list of FileData objects
+
+        """
+        response = self._propfind(remote_path, properties)
+        if parser_pool is None:
+            return response.url, list(self.__iter_file_data(response, properties))
+
+        return response.url, [FileData(*record) for record in self.__pooled_file_records(response, properties,
+                                                                                            parser_pool)]
+
+    def property_names(self, remote_path='.', depth=0):
+        """
+        Method to find out which properties the WebDav server has for resources
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type depth: Integer
+        :param depth: 0 for only the resource, 1 to include its members
+
+        :rtype: Dict
+        :return: A dictionary of href to a list of namespaced property names
+
+        """
+        return dict(extract_property_names(element)
+                    for element in self._iter_response_elements(remote_path, body=PROPNAME_BODY, depth=depth))
+
+    def _iter_response_elements(self, remote_path, properties=None, body=None, depth=1):
+        """
+        Method to send a PROPFIND and lazily yield the response elements
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: Iterable
+        :param properties: The properties to ask for, defaults to the ones FileData stores
+        :type body: Bytes
+        :param body: A complete request body, overrides properties
+        :type depth: Integer
+        :param depth: The Depth header
+
+        :rtype: Generator
+        :return: A generator of {DAV:}response elements
+
+        """
+        response = self._propfind(remote_path, properties, body, depth)
+        yield from self._iter_multistatus(response)
+
+    def _propfind(self, remote_path, properties=None, body=None, depth=1, expected_codes=(207, 301), headers=None):
+        """
+        Method to send a PROPFIND following redirects, the body is left unread
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: Iterable
+        :param properties: The properties to ask for, defaults to the ones FileData stores
+        :type body: Bytes
+        :param body: A complete request body, overrides properties
+        :type depth: Integer
+        :param depth: The Depth header
+        :type expected_codes: Tuple
+        :param expected_codes: Expected HTTP Status Codes, 301 is always followed
+        :type headers: Dict
+        :param headers: Other headers to send
+
+        :rtype: requests.response Object
+        :return: A response, its url is the one the last redirect pointed to
+
+        """
+        if body is None:
+            body = DEFAULT_PROPFIND_BODY if properties is None else build_propfind_body(properties)
+
+        request_headers = {'Depth': str(depth), 'Content-Type': 'application/xml; charset="utf-8"'}
+        if headers:
+            request_headers.update(headers)
+
+        response = self._send('PROPFIND', remote_path, expected_codes, headers=request_headers, data=body, stream=True)
 
         # Redirect
         if response.status_code == 301:
+            response.close()
             url = urlparse(response.headers['location'])
-            return self.resource_list(url.path)
+            return self._propfind(url.path, properties, body, depth, expected_codes, headers)
 
-        tree = xml.fromstring(response.content)
-        return [self.__file_object_builder(element) for element in tree.findall('{DAV:}response')]
+        return response
+
+    def _iter_multistatus(self, response):
+        """
+        Method to lazily yield the response elements of a streamed multistatus response
+
+        Only the time spent in the XML parser is reported to the instrumentation
+
+        :type response: requests.response Object
+        :param response: A PROPFIND response
+
+        :rtype: Generator
+        :return: A generator of {DAV:}response elements
+
+        """
+        propfind_chunk_size_bytes = 64 * 1024
+        parser = MultistatusStreamParser()
+        parse_seconds = 0.0
+        entries = 0
+        try:
+            for chunk in response.iter_content(propfind_chunk_size_bytes):
+                if chunk:
+                    start = time.perf_counter()
+                    elements = parser.feed(chunk)
+                    parse_seconds += time.perf_counter() - start
+                    entries += len(elements)
+                    yield from elements
+
+            start = time.perf_counter()
+            elements = parser.close()
+            parse_seconds += time.perf_counter() - start
+            entries += len(elements)
+            yield from elements
+
+        finally:
+            response.close()
+            if self.instrumentation is not None:
+                self.instrumentation.after_parse(response.url, parse_seconds, entries)
 
     def resource_exists(self, remote_path):
         """
@@ -399,63 +1617,185 @@ class Client(object):
         :return: True or False
 
         """
+        if self.cache is not None:
+            return self.__cached_resource_exists(remote_path)
+
         expected_codes = (200, 301, 404)
         response = self._send('HEAD', remote_path, expected_codes)
         return True if response.status_code != 404 else False
 
-    def get_current_working_directory(self):
+    def exists_many(self, remote_paths, max_workers=8, errors=None):
+        """
+        Method to verify if many resources exist with one listing per parent directory
+
+        Paths are grouped by parent and every parent holding more than one of
+        them is listed once with a Depth 1 PROPFIND, concurrently.  Paths alone
+        in their parent, and those in parents that cannot be listed, are checked
+        with concurrent HEADs.  A path that can not be checked does not stop the
+        others, it is left out of the answer.
+
+        :type remote_paths: Iterable
+        :param remote_paths: The paths
+        :type max_workers: Integer
+        :param max_workers: The most requests to run at once
+        :type errors: Dict
+        :param errors: A dictionary to get the exception of every path that could not be checked
+
+        :rtype: Dict
+        :return: A dictionary of path to True or False
+
         """
-        Method to get current working directory
+        found = self.__lookup_many(remote_paths, max_workers, None, self.resource_exists, errors)
+        return dict((remote_path, value is not None and value is not False) for remote_path, value in found.items())
 
-        :rtype: String
-        :return: The current working directory
+    def stat_many(self, remote_paths, max_workers=8, properties=None, errors=None):
+        """
+        Method to get the FileData of many resources with one listing per parent directory
+
+        Paths are grouped by parent and every parent holding more than one of
+        them is listed once with a Depth 1 PROPFIND, concurrently.  Paths alone
+        in their parent, and those in parents that cannot be listed, are asked
+        for with concurrent Depth 0 PROPFINDs.  A path that can not be looked up
+        does not stop the others, it is left out of the answer.
+
+        :type remote_paths: Iterable
+        :param remote_paths: The paths
+        :type max_workers: Integer
+        :param max_workers: The most requests to run at once
+        :type properties: Iterable
+        :param properties: The properties to ask for, defaults to the ones FileData stores
+        :type errors: Dict
+        :param errors: A dictionary to get the exception of every path that could not be looked up
+
+        :rtype: Dict
+        :return: A dictionary of path to a FileData object, None for paths that do not exist
 
         """
-        return self.current_working_directory
+        if properties is not None:
+            properties = list(properties)
 
-    def get_base_url(self):
+        return self.__lookup_many(remote_paths, max_workers, properties,
+                                  lambda remote_path: self.__stat(remote_path, properties), errors)
+
+    def __stat(self, remote_path, properties):
         """
-        Method to get base url
+        Method to get the FileData of one resource
+
+        :type remote_path: String
+        :param remote_path: The path
+        :type properties: List
+        :param properties: The properties to ask for, None for the defaults
 
-        :rtype: String
-        :return: The base url
+        :rtype: FileData
+        :return: A FileData object, None if the resource does not exist
 
         """
-        return self.base_url
+        try:
+            listing = list(self.iter_resources(remote_path, properties, depth=0))
 
-    @staticmethod
-    def get_xml_element(element, element_name, default=None):
+        except OperationFailed as e:
+            if e.actual_code == 404:
+                return None
+
+            raise
+
+        return listing[0] if listing else None
+
+    def __lookup_many(self, remote_paths, max_workers, properties, probe, errors):
         """
-        Method to retrieve the data from the xml tree
+        Method to look paths up in listings of their parents, probing one by one where that is cheaper
+
+        :type remote_paths: Iterable
+        :param remote_paths: The paths
+        :type max_workers: Integer
+        :param max_workers: The most requests to run at once
+        :type properties: List
+        :param properties: The properties to list, None for the defaults
+        :type probe: Callable
+        :param probe: Called with a path to look it up alone
+        :type errors: Dict
+        :param errors: A dictionary to get the exception of every path that could not be looked up, or None
+
+        :rtype: Dict
+        :return: A dictionary of path to a FileData object or what probe returned, None if missing
 
-        :type element: String
-        :param element: The xml element
-        :type element_name: String
-        :param element_name: The property
-        :type default: String
-        :param default: What to set default to
+        """
+        groups = {}
+        for remote_path in remote_paths:
+            parent = self._absolute_path(remote_path).rstrip('/').rsplit('/', 1)[0] + '/'
+            groups.setdefault(parent, []).append(remote_path)
+
+        found = {}
+        probes = [members[0] for members in groups.values() if len(members) == 1]
+        parents = [parent for parent, members in groups.items() if len(members) > 1]
+        listings = run_concurrently(lambda parent: self.resource_list(parent, properties=properties), parents,
+                                    max_workers)
+        for listing in listings:
+            members = groups[listing.item]
+            if listing.ok:
+                entries = dict((self._href_key(file_data.resource_url), file_data) for file_data in listing.result)
+                for remote_path in members:
+                    found[remote_path] = entries.get(self._href_key(self._get_url(remote_path)))
+
+            elif isinstance(listing.error, OperationFailed) and listing.error.actual_code == 404:
+                found.update((remote_path, None) for remote_path in members)
+
+            else:
+                LOGGER.debug('Method lookup could not list {parent} probing its members one by one'.format(
+                    parent=listing.item))
+                probes.extend(members)
 
-        :rtype: String
-        :return: A String
+        for result in run_concurrently(probe, probes, max_workers):
+            if result.ok:
+                found[result.item] = result.result
 
+            else:
+                LOGGER.debug('Method lookup could not look up {path} {error}'.format(path=result.item,
+                                                                                     error=result.error))
+                if errors is not None:
+                    errors[result.item] = result.error
+
+        return found
+
+    def __cached_resource_exists(self, remote_path):
         """
-        child = element.find('.//{DAV:}' + element_name)
-        return default if child is None else child.text
+        Method to verify if a resource exists revalidating a cached answer
+
+        :type remote_path: String
+        :param remote_path: The path
+
+        :rtype: Boolean
+        :return: True or False
+
+        """
+        key = ('HEAD', self._get_url(remote_path))
+        entry = self.cache.get(key)
+        headers = entry.conditional_headers() if entry else {}
+        expected_codes = (200, 301, 304, 404)
+        response = self._send('HEAD', remote_path, expected_codes, headers=headers)
+        if response.status_code == 304 and entry:
+            self.cache.record(True)
+            return True
+
+        self.cache.record(False)
+        if response.status_code == 404:
+            self.cache.invalidate(key)
+            return False
+
+        self.cache.put(key, response.headers.get('ETag'), response.headers.get('Last-Modified'), True, 0)
+        return True
 
-    def __file_object_builder(self, element):
+    def __file_object_builder(self, element, extra_tags=None):
         """
         Method to build FileData objects
 
         :type element: String
         :param element: The xml element
+        :type extra_tags: Set
+        :param extra_tags: Namespaced property tags to keep besides the FileData fields
 
         :rtype: FileData Object
         :return: A FileData object
 
         """
-        return FileData(resource_url=self.get_xml_element(element, 'href'),
-                        resource_name=self.get_xml_element(element, 'displayname'),
-                        file_size=int(self.get_xml_element(element, 'getcontentlength', 0)),
-                        modified_time=self.get_xml_element(element, 'getlastmodified', ''),
-                        creation_time=self.get_xml_element(element, 'creationdate', ''),
-                        content_type=self.get_xml_element(element, 'getcontenttype', ''))
+        return FileData(*self._file_values(element, extra_tags))
@@ -0,0 +1,420 @@
+import json
+import logging
+import os
+import posixpath
+import shutil
+from urllib.parse import quote, unquote
+from .bulk import run_concurrently
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+DIRECTIONS = ('push', 'pull')
+
+
+class SyncPlan(object):
+    """
+    Class to store what a sync has to do, relative paths use / as separator
+
+    :type direction: String
+    :param direction: push to copy local changes to the server, pull for the other way round
+
+    """
+
+    def __init__(self, direction):
+        self.direction = direction
+        self.directories = []
+        self.transfers = []
+        self.deletes = []
+        self.unchanged = []
+        self.results = []
+
+    def __repr__(self):
+        return '{class_name}(direction={direction!r}, directories={directories}, transfers={transfers}, ' \
+               'deletes={deletes}, unchanged={unchanged})'.format(class_name=type(self).__name__,
+                                                                  direction=self.direction,
+                                                                  directories=len(self.directories),
+                                                                  transfers=len(self.transfers),
+                                                                  deletes=len(self.deletes),
+                                                                  unchanged=len(self.unchanged))
+
+    def failures(self):
+        """
+        Method to get the results of the steps that failed
+
+        :rtype: List
+        :return: A list of BulkResult objects
+
+        """
+        return [result for result in self.results if not result.ok]
+
+
+def local_index(local_dir):
+    """
+    Function to index a local directory tree
+
+    :type local_dir: String
+    :param local_dir: The local directory
+
+    :rtype: Tuple
+    :return: A dictionary of relative file path to (size, mtime), and a set of relative directory paths
+
+    """
+    files = {}
+    directories = set()
+    for root, dir_names, file_names in os.walk(local_dir):
+        relative_root = os.path.relpath(root, local_dir).replace(os.sep, '/')
+        prefix = '' if relative_root == '.' else relative_root + '/'
+        for dir_name in dir_names:
+            directories.add(prefix + dir_name)
+
+        for file_name in file_names:
+            stat = os.stat(os.path.join(root, file_name))
+            files[prefix + file_name] = (stat.st_size, stat.st_mtime)
+
+    return files, directories
+
+
+def remote_index(client, remote_root, max_workers=8):
+    """
+    Function to index a remote tree with one walk
+
+    :type client: Client
+    :param client: The Client
+    :type remote_root: String
+    :param remote_root: The remote directory from the root, without a trailing /
+    :type max_workers: Integer
+    :param max_workers: The most listings to run at once if the tree has to be crawled
+
+    :rtype: Tuple
+    :return: A dictionary of relative file path to (size, mtime, etag), and a set of relative directory paths,
+        the relative paths are unquoted so they compare with local file names
+
+    """
+    files = {}
+    directories = set()
+    prefix = remote_root + '/'
+    for file_data in client.walk(remote_root + '/', max_workers=max_workers):
+        path = unquote(client._href_to_path(file_data.resource_url))
+        is_dir = file_data.is_dir()
+        path = path.rstrip('/')
+        if not path.startswith(prefix):
+            continue
+
+        relative_path = path[len(prefix):]
+        if is_dir:
+            directories.add(relative_path)
+
+        else:
+            files[relative_path] = (file_data.file_size, file_data.modified_epoch, file_data.etag)
+
+    return files, directories
+
+
+def load_state(state_file):
+    """
+    Function to read the state a previous sync left
+
+    :type state_file: String
+    :param state_file: The path of the state file
+
+    :rtype: Dict
+    :return: A dictionary of relative path to the sizes, times and etag last seen
+
+    """
+    if not state_file or not os.path.exists(state_file):
+        return {}
+
+    with open(state_file, 'r') as file:
+        return json.load(file).get('files', {})
+
+
+def save_state(state_file, state):
+    """
+    Function to write the sync state, replacing the old file in one step
+
+    :type state_file: String
+    :param state_file: The path of the state file
+    :type state: Dict
+    :param state: A dictionary of relative path to the sizes, times and etag last seen
+
+    :rtype: None
+    :return: None
+
+    """
+    temporary_file = state_file + '.tmp'
+    with open(temporary_file, 'w') as file:
+        json.dump({'version': 1, 'files': state}, file)
+
+    os.replace(temporary_file, state_file)
+
+
+def unchanged(local_file, remote_file, recorded, direction):
+    """
+    Function to check if a file is the same on both sides
+
+    A recorded state wins when both sides still look like they did after the
+    last sync, otherwise the sizes have to match and the destination must not
+    be older than the source
+
+    :type local_file: Tuple
+    :param local_file: (size, mtime)
+    :type remote_file: Tuple
+    :param remote_file: (size, mtime, etag)
+    :type recorded: Dict
+    :param recorded: The state of the file after the last sync, or None
+    :type direction: String
+    :param direction: push or pull
+
+    :rtype: Boolean
+    :return: True or False
+
+    """
+    local_size, local_mtime = local_file
+    remote_size, remote_mtime, etag = remote_file
+    if recorded and recorded.get('local_size') == local_size and recorded.get('local_mtime') == local_mtime:
+        if etag and recorded.get('etag'):
+            return recorded['etag'] == etag
+
+        if recorded.get('remote_size') == remote_size and recorded.get('remote_mtime') == remote_mtime:
+            return True
+
+    if local_size != remote_size or remote_mtime is None:
+        return False
+
+    if direction == 'push':
+        return remote_mtime >= int(local_mtime)
+
+    return int(local_mtime) >= remote_mtime
+
+
+def build_plan(local_files, local_directories, remote_files, remote_directories, state, direction, delete):
+    """
+    Function to work out the smallest set of steps to make the destination match the source
+
+    :type local_files: Dict
+    :param local_files: Relative path to (size, mtime)
+    :type local_directories: Set
+    :param local_directories: Relative directory paths
+    :type remote_files: Dict
+    :param remote_files: Relative path to (size, mtime, etag)
+    :type remote_directories: Set
+    :param remote_directories: Relative directory paths
+    :type state: Dict
+    :param state: The state left by the last sync
+    :type direction: String
+    :param direction: push or pull
+    :type delete: Boolean
+    :param delete: If set to True things missing from the source are deleted from the destination
+
+    :rtype: SyncPlan
+    :return: The plan
+
+    """
+    plan = SyncPlan(direction)
+    if direction == 'push':
+        source_files, source_directories = local_files, local_directories
+        destination_files, destination_directories = remote_files, remote_directories
+
+    else:
+        source_files, source_directories = remote_files, remote_directories
+        destination_files, destination_directories = local_files, local_directories
+
+    for relative_path in sorted(source_files):
+        local_file = local_files.get(relative_path)
+        remote_file = remote_files.get(relative_path)
+        if local_file is not None and remote_file is not None and \
+                unchanged(local_file, remote_file, state.get(relative_path), direction):
+            plan.unchanged.append(relative_path)
+
+        else:
+            plan.transfers.append(relative_path)
+
+    plan.directories = sorted(source_directories - destination_directories, key=lambda path: (path.count('/'), path))
+
+    if delete:
+        deleted_directories = destination_directories - source_directories
+        # Deleting a directory takes what is under it, so only the top ones are needed
+        top_directories = set(path for path in deleted_directories
+                              if not any(path.startswith(other + '/') for other in deleted_directories))
+        deleted_files = [path for path in destination_files if path not in source_files
+                         and not any(path.startswith(directory + '/') for directory in top_directories)]
+        plan.deletes = sorted(top_directories) + sorted(deleted_files)
+
+    return plan
+
+
+def sync(client, local_dir, remote_dir, direction='push', delete=False, dry_run=False, state_file=None,
+         max_workers=8, progress=None):
+    """
+    Function to mirror a local directory and a remote directory
+
+    Both sides are indexed, compared by size, modified time and ETag, and only
+    the steps needed are run, concurrently.  With a state file, what was seen
+    after the last run is used to tell unchanged files apart without relying
+    on clocks, so later runs only move what changed.
+
+    :type client: Client
+    :param client: The Client
+    :type local_dir: String
+    :param local_dir: The local directory
+    :type remote_dir: String
+    :param remote_dir: The remote directory
+    :type direction: String
+    :param direction: push to copy local changes to the server, pull for the other way round
+    :type delete: Boolean
+    :param delete: If set to True things missing from the source are deleted from the destination
+    :type dry_run: Boolean
+    :param dry_run: If set to True the plan is returned without doing anything
+    :type state_file: String
+    :param state_file: A local path to keep the sync state in
+    :type max_workers: Integer
+    :param max_workers: The most requests to run at once
+    :type progress: Callable
+    :param progress: Called as progress(completed, total, bulk_result) after every transfer
+
+    :rtype: SyncPlan
+    :return: The plan, with the results of every step unless it was a dry run
+
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError('direction has to be one of {directions}, not {direction}'.format(directions=DIRECTIONS,
+                                                                                            direction=direction))
+
+    remote_root = posixpath.normpath(client._absolute_path(remote_dir)).rstrip('/')
+    if direction == 'push' and not os.path.isdir(local_dir):
+        raise FileNotFoundError('Function sync local directory {local_dir} does not exist'.format(local_dir=local_dir))
+
+    local_files, local_directories = local_index(local_dir)
+    if direction == 'push' and not client.resource_exists(remote_root + '/'):
+        remote_files, remote_directories = {}, set()
+        if not dry_run:
+            client.directories_create(remote_root + '/')
+
+    else:
+        remote_files, remote_directories = remote_index(client, remote_root, max_workers)
+
+    state = load_state(state_file)
+    plan = build_plan(local_files, local_directories, remote_files, remote_directories, state, direction, delete)
+    LOGGER.debug('Function sync planned {plan}'.format(plan=plan))
+    if dry_run:
+        return plan
+
+    pulled = []
+
+    def local_path(relative_path):
+        return os.path.join(local_dir, *relative_path.split('/'))
+
+    def remote_path(relative_path):
+        # Relative paths are file names, quote them so # and ? stay part of the path
+        return remote_root + '/' + quote(relative_path)
+
+    if direction == 'push':
+        plan.results.extend(_create_remote_directories(client, [remote_path(path) for path in plan.directories],
+                                                       max_workers))
+        plan.results.extend(client.upload_many([(local_path(path), remote_path(path)) for path in plan.transfers],
+                                               max_workers=max_workers, progress=progress))
+        plan.results.extend(run_concurrently(
+            lambda path: client.directory_delete(remote_path(path)) if path in remote_directories
+            else client.resource_delete(remote_path(path)), plan.deletes, max_workers))
+
+    else:
+        os.makedirs(local_dir, exist_ok=True)
+        for path in plan.directories:
+            os.makedirs(local_path(path), exist_ok=True)
+
+        results = client.download_many([(remote_path(path), local_path(path)) for path in plan.transfers],
+                                       max_workers=max_workers, progress=progress)
+        for result, path in zip(results, plan.transfers):
+            remote_mtime = remote_files[path][1]
+            if result.ok and remote_mtime is not None:
+                # Give the copy the server's time so the next run sees it as unchanged
+                os.utime(local_path(path), (remote_mtime, remote_mtime))
+
+            if result.ok:
+                pulled.append(path)
+
+        plan.results.extend(results)
+        for path in plan.deletes:
+            if path in local_directories:
+                shutil.rmtree(local_path(path), ignore_errors=True)
+
+            elif os.path.exists(local_path(path)):
+                os.remove(local_path(path))
+
+    if state_file:
+        save_state(state_file, _next_state(plan, local_dir, local_files, remote_files, pulled))
+
+    return plan
+
+
+def _create_remote_directories(client, directories, max_workers):
+    """
+    Function to create remote directories, parents first, each depth concurrently
+
+    :type client: Client
+    :param client: The Client
+    :type directories: List
+    :param directories: Paths from the root, sorted parents first
+    :type max_workers: Integer
+    :param max_workers: The most MKCOLs to run at once
+
+    :rtype: List
+    :return: A list of BulkResult objects
+
+    """
+    results = []
+    levels = {}
+    for directory in directories:
+        levels.setdefault(directory.count('/'), []).append(directory)
+
+    for depth in sorted(levels):
+        results.extend(run_concurrently(lambda directory: client.directory_create(directory, safe=True),
+                                        levels[depth], max_workers))
+
+    return results
+
+
+def _next_state(plan, local_dir, local_files, remote_files, pulled):
+    """
+    Function to work out the state to keep after a sync
+
+    Pushed files are left out, the next run compares them by size and time and
+    then records the ETag the server gave them
+
+    :type plan: SyncPlan
+    :param plan: The plan that was run
+    :type local_dir: String
+    :param local_dir: The local directory
+    :type local_files: Dict
+    :param local_files: Relative path to (size, mtime) before the sync
+    :type remote_files: Dict
+    :param remote_files: Relative path to (size, mtime, etag) before the sync
+    :type pulled: List
+    :param pulled: Relative paths that were downloaded
+
+    :rtype: Dict
+    :return: The new state
+
+    """
+    next_state = {}
+    for path in plan.unchanged:
+        local_size, local_mtime = local_files[path]
+        remote_size, remote_mtime, etag = remote_files[path]
+        next_state[path] = dict(local_size=local_size, local_mtime=local_mtime, remote_size=remote_size,
+                                remote_mtime=remote_mtime, etag=etag)
+
+    for path in pulled:
+        stat = os.stat(os.path.join(local_dir, *path.split('/')))
+        remote_size, remote_mtime, etag = remote_files[path]
+        next_state[path] = dict(local_size=stat.st_size, local_mtime=stat.st_mtime, remote_size=remote_size,
+                                remote_mtime=remote_mtime, etag=etag)
+
+    return next_state
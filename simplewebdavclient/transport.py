@@ -0,0 +1,113 @@
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+LOGGER = logging.getLogger(__name__)
+
+
+class Transport(object):
+    """
+    Class for a pooled HTTP transport that Clients can share
+
+    One Transport can be handed to many Client objects pointing at the same host
+    with different paths, they then reuse the same kept alive connections.  Size
+    pool_maxsize to the number of threads that use it at once, otherwise
+    connections past the limit are thrown away after each request.
+
+    :type pool_connections: Integer
+    :param pool_connections: The number of hosts to keep connection pools for
+    :type pool_maxsize: Integer
+    :param pool_maxsize: The most connections to keep per host
+    :type pool_block: Boolean
+    :param pool_block: If set to True requests wait for a free connection instead of opening extra ones
+    :type connect_timeout: Float
+    :param connect_timeout: Seconds to wait for a connection, None waits forever
+    :type read_timeout: Float
+    :param read_timeout: Seconds to wait between bytes from the server, None waits forever
+    :type keep_alive: Boolean
+    :param keep_alive: If set to False connections are closed after every request
+
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, connect_timeout=None,
+                 read_timeout=None, keep_alive=True):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = (connect_timeout, read_timeout) if connect_timeout or read_timeout else None
+
+        self.session = requests.session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def request(self, method, url, **kwargs):
+        """
+        Method to send a request over the pooled session
+
+        :type method: String
+        :param method: The HTTP method
+        :type url: String
+        :param url: The url
+        :type kwargs: KWARGS
+        :param kwargs: Key Word Arguments for requests
+
+        :rtype: requests.response Object
+        :return: A response
+
+        """
+        if self.timeout is not None:
+            kwargs.setdefault('timeout', self.timeout)
+
+        return self.session.request(method, url, **kwargs)
+
+    def connection_stats(self):
+        """
+        Method to count the connections opened against the requests sent over them
+
+        A pooled connection the server closed is reopened in place by urllib3
+        and still counts as one
+
+        :rtype: Dict
+        :return: The connections opened and the requests sent, the difference is the number of reuses
+
+        """
+        connections = 0
+        requests_sent = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    connections += pool.num_connections
+                    requests_sent += pool.num_requests
+
+        return dict(connections=connections, requests=requests_sent, reused=requests_sent - connections)
+
+    def close(self):
+        """
+        Method to close all pooled connections
+
+        :rtype: None
+        :return: None
+
+        """
+        self.session.close()
@@ -0,0 +1,59 @@
+import pytest
+from benchmarks.server import StandInServer, Resource
+from simplewebdavclient import Client
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+@pytest.fixture(scope='session')
+def stand_in_server():
+    """
+    Fixture for an in-process WebDav stand-in server on a free local port, started once
+
+    :rtype: StandInServer
+    :return: The running server
+
+    """
+    with StandInServer() as stand_in:
+        yield stand_in
+
+
+@pytest.fixture
+def server(stand_in_server):
+    """
+    Fixture for the stand-in server holding nothing but an empty root collection, with no faults set up
+
+    :rtype: StandInServer
+    :return: The running server
+
+    """
+    with stand_in_server.lock:
+        stand_in_server.resources = {'/': Resource(collection=True)}
+        stand_in_server.locked = set()
+        stand_in_server.redirects = {}
+        stand_in_server.forbidden = set()
+        stand_in_server.finite_depth = False
+        stand_in_server.chunked = False
+        stand_in_server.latency = 0.0
+
+    return stand_in_server
+
+
+@pytest.fixture
+def client(server):
+    """
+    Fixture for a Client pointed at the stand-in server
+
+    :rtype: Client
+    :return: The Client
+
+    """
+    with Client('127.0.0.1', port=server.port) as webdav_client:
+        yield webdav_client
@@ -0,0 +1,271 @@
+import array
+import asyncio
+import io
+import pytest
+from simplewebdavclient.exceptions import OperationFailed, MultiStatusFailed, BufferTooSmall
+aiohttp = pytest.importorskip('aiohttp')
+from simplewebdavclient.asyncclient import AsyncClient  # noqa: E402
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def run(server, scenario):
+    """
+    Function to run a coroutine function with an AsyncClient pointed at the stand-in server
+
+    :type server: StandInServer
+    :param server: The running server
+    :type scenario: Callable
+    :param scenario: Called with the AsyncClient, returns a coroutine
+
+    :return: What the coroutine returned
+
+    """
+    async def main():
+        async with AsyncClient('127.0.0.1', port=server.port) as client:
+            return await scenario(client)
+
+    return asyncio.run(main())
+
+
+def test_directories_create_makes_every_level(server):
+    async def scenario(client):
+        await client.directories_create('/a/b/c/')
+        await client.directories_create('/a/b/c/')
+
+    run(server, scenario)
+    assert all(server.resources[path].collection for path in ('/a', '/a/b', '/a/b/c'))
+
+
+def test_directories_create_relative_to_working_directory(server):
+    async def scenario(client):
+        await client.directories_create('/a/')
+        await client.at('/a/').directories_create('b/c')
+
+    run(server, scenario)
+    assert server.resources['/a/b/c'].collection
+
+
+def test_directory_create_without_parent_fails(server):
+    async def scenario(client):
+        await client.directory_create('/missing/a')
+
+    with pytest.raises(OperationFailed) as error:
+        run(server, scenario)
+
+    assert error.value.actual_code == 409
+
+
+def test_upload_and_download(server, tmp_path):
+    local_file = tmp_path / 'upload.bin'
+    local_file.write_bytes(b'some bytes')
+    downloaded = tmp_path / 'download.bin'
+
+    async def scenario(client):
+        await client.directories_create('/d/')
+        await client.upload(str(local_file), '/d/file.bin')
+        await client.download('/d/file.bin', str(downloaded))
+
+    run(server, scenario)
+    assert server.resources['/d/file.bin'].data == b'some bytes'
+    assert downloaded.read_bytes() == b'some bytes'
+
+
+def test_upload_file_objects_buffers_and_async_iterables(server):
+    numbers = array.array('i', range(4))
+
+    async def chunks():
+        yield b'chunked '
+        yield b'body'
+
+    async def scenario(client):
+        await client.upload(io.BytesIO(b'file object'), '/file.bin')
+        await client.upload(b'bytes', '/bytes.bin')
+        await client.upload(bytearray(b'bytearray'), '/bytearray.bin')
+        await client.upload(memoryview(numbers), '/numbers.bin')
+        await client.upload(chunks(), '/chunked.bin')
+
+    run(server, scenario)
+    assert server.resources['/file.bin'].data == b'file object'
+    assert server.resources['/bytes.bin'].data == b'bytes'
+    assert server.resources['/bytearray.bin'].data == b'bytearray'
+    assert server.resources['/numbers.bin'].data == numbers.tobytes()
+    assert server.resources['/chunked.bin'].data == b'chunked body'
+
+
+def test_download_into_file_objects_and_buffers(server, tmp_path):
+    async def scenario(client):
+        await client.upload(b'some bytes', '/file.bin')
+        file = io.BytesIO()
+        await client.download('/file.bin', file)
+        buffer = bytearray(20)
+        count = await client.download('/file.bin', buffer)
+        await client.download('/file.bin', tmp_path / 'path.bin')
+        with pytest.raises(BufferTooSmall):
+            await client.download('/file.bin', bytearray(4))
+
+        return file.getvalue(), bytes(buffer[:count])
+
+    assert run(server, scenario) == (b'some bytes', b'some bytes')
+    assert (tmp_path / 'path.bin').read_bytes() == b'some bytes'
+
+
+def test_download_missing_fails(server, tmp_path):
+    async def scenario(client):
+        await client.download('/missing.bin', str(tmp_path / 'missing.bin'))
+
+    with pytest.raises(OperationFailed) as error:
+        run(server, scenario)
+
+    assert error.value.actual_code == 404
+
+
+def test_resource_list_and_iter_resources(server, tmp_path):
+    local_file = tmp_path / 'upload.bin'
+    local_file.write_bytes(b'12345')
+
+    async def scenario(client):
+        await client.directories_create('/d/sub/')
+        await client.upload(str(local_file), '/d/file.bin')
+        await client.upload(str(local_file), '/d/sub/nested.bin')
+        listing = await client.resource_list('/d/')
+        only_self = [file_data async for file_data in client.iter_resources('/d/', depth=0)]
+        everything = [file_data async for file_data in client.iter_resources('/d/', depth='infinity')]
+        return listing, only_self, everything
+
+    listing, only_self, everything = run(server, scenario)
+    entries = dict((file_data.resource_name, file_data) for file_data in listing)
+    assert sorted(entries) == ['d', 'file.bin', 'sub']
+    assert entries['sub'].is_dir() and not entries['file.bin'].is_dir()
+    assert entries['file.bin'].file_size == 5
+    assert entries['file.bin'].etag is not None
+    assert [file_data.resource_name for file_data in only_self] == ['d']
+    assert 'nested.bin' in [file_data.resource_name for file_data in everything]
+
+
+def test_resource_list_missing_fails(server):
+    async def scenario(client):
+        await client.resource_list('/missing/')
+
+    with pytest.raises(OperationFailed) as error:
+        run(server, scenario)
+
+    assert error.value.actual_code == 404
+
+
+def test_resource_exists(server, tmp_path):
+    local_file = tmp_path / 'upload.bin'
+    local_file.write_bytes(b'1')
+
+    async def scenario(client):
+        await client.upload(str(local_file), '/file.bin')
+        return await client.resource_exists('/file.bin'), await client.resource_exists('/missing.bin')
+
+    assert run(server, scenario) == (True, False)
+
+
+def test_deletes(server, tmp_path):
+    local_file = tmp_path / 'upload.bin'
+    local_file.write_bytes(b'1')
+
+    async def scenario(client):
+        await client.directories_create('/d/sub/')
+        await client.upload(str(local_file), '/d/file.bin')
+        await client.upload(str(local_file), '/d/sub/nested.bin')
+        await client.resource_delete('/d/file.bin')
+        await client.directory_delete('/d/sub')
+        await client.directory_delete('/d/sub', safe=True)
+        await client.resource_delete('/d/file.bin')
+
+    with pytest.raises(OperationFailed) as error:
+        run(server, scenario)
+
+    assert error.value.actual_code == 404
+    assert sorted(server.resources) == ['/', '/d']
+
+
+def test_deletes_raise_the_failures_a_multistatus_lists(server):
+    async def scenario(client):
+        await client.directories_create('/d/sub/')
+        await client.upload(b'1', '/d/sub/locked.bin')
+        await client.upload(b'2', '/d/free.bin')
+        server.locked.add('/d/sub/locked.bin')
+        errors = []
+        for delete in (client.directory_delete, client.resource_delete):
+            with pytest.raises(MultiStatusFailed) as error:
+                await delete('/d/')
+
+            errors.append(error.value)
+
+        return errors
+
+    for error in run(server, scenario):
+        assert error.actual_code == 207
+        assert error.failures == [('/d/sub/locked.bin', 'HTTP/1.1 423 Locked')]
+
+    assert set(server.resources) == {'/', '/d', '/d/sub', '/d/sub/locked.bin'}
+
+
+def test_copy(server, tmp_path):
+    local_file = tmp_path / 'upload.bin'
+    local_file.write_bytes(b'copied')
+
+    async def scenario(client):
+        await client.directories_create('/d/sub/')
+        await client.upload(str(local_file), '/d/sub/file.bin')
+        await client.copy('/d/sub/file.bin', '/d/file.bin')
+        await client.copy('/d/sub/', '/tree/')
+        await client.copy('/d/sub/', '/empty/', depth=0)
+        with pytest.raises(OperationFailed) as error:
+            await client.copy('/d/file.bin', '/d/sub/file.bin', overwrite=False)
+
+        return error.value.actual_code
+
+    assert run(server, scenario) == 412
+    assert server.resources['/d/file.bin'].data == b'copied'
+    assert server.resources['/d/sub/file.bin'].data == b'copied'
+    assert server.resources['/tree/file.bin'].data == b'copied'
+    assert server.resources['/empty'].collection and '/empty/file.bin' not in server.resources
+
+
+def test_move(server, tmp_path):
+    local_file = tmp_path / 'upload.bin'
+    local_file.write_bytes(b'moved')
+
+    async def scenario(client):
+        await client.directories_create('/d/sub/')
+        await client.upload(str(local_file), '/d/sub/file.bin')
+        await client.upload(str(local_file), '/other.bin')
+        await client.move('/d/sub/', '/renamed/')
+        with pytest.raises(OperationFailed) as error:
+            await client.move('/other.bin', '/renamed/file.bin', overwrite=False)
+
+        return error.value.actual_code
+
+    assert run(server, scenario) == 412
+    assert '/d/sub' not in server.resources and '/d/sub/file.bin' not in server.resources
+    assert server.resources['/renamed/file.bin'].data == b'moved'
+    assert '/other.bin' in server.resources
+
+
+def test_scoped_clients_share_the_session(server):
+    async def scenario(client):
+        scoped = client.at('/a/')
+        nested = scoped.at('b/')
+        await client.directories_create('/a/b/')
+        session = client._get_session()
+        assert scoped._get_session() is session and nested._get_session() is session
+        assert await nested.resource_exists('/a/b/')
+        await scoped.close()
+        assert not session.closed
+        return session
+
+    session = run(server, scenario)
+    assert session.closed
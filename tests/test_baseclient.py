@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def test_scoped_clients_resolve_paths_from_their_own_directory(server, client):
+    client.directories_create('/a/b/')
+    scoped = client.at('/a')
+    assert scoped.get_current_working_directory() == '/a/'
+    assert scoped.at('b').get_current_working_directory() == '/a/b/'
+    assert scoped.at('/').get_current_working_directory() == '/'
+    assert client.get_current_working_directory() == '/'
+    scoped.upload(b'data', 'file.txt')
+    scoped.at('b').directories_create('c/')
+    assert server.resources['/a/file.txt'].data == b'data'
+    assert server.resources['/a/b/c'].collection
+    assert scoped.get_current_working_directory() == '/a/'
+    assert scoped.transport is client.transport and scoped.collection_cache is client.collection_cache
+
+
+def test_closing_a_scoped_client_leaves_the_pool_open(server, client):
+    with client.at('/') as scoped:
+        scoped.upload(b'data', '/file.txt')
+
+    assert client.resource_exists('/file.txt')
+
+
+def test_scoped_clients_work_from_many_threads(server, client):
+    def work(index):
+        scoped = client.at('/dir-{0}'.format(index))
+        scoped.directories_create('sub/')
+        scoped.at('sub').upload(str(index).encode('utf-8'), 'file.txt')
+        return [file_data.resource_name for file_data in scoped.resource_list('sub')]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        listings = list(executor.map(work, range(32)))
+
+    assert all(sorted(listing) == ['file.txt', 'sub'] for listing in listings)
+    for index in range(32):
+        assert server.resources['/dir-{0}/sub/file.txt'.format(index)].data == str(index).encode('utf-8')
+
+    assert client.get_current_working_directory() == '/'
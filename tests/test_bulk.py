@@ -0,0 +1,47 @@
+from simplewebdavclient.bulk import BulkResult, run_concurrently
+from simplewebdavclient.exceptions import OperationFailed
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def test_upload_many_makes_parents_and_keeps_the_order(server, client):
+    pairs = [('file {0}'.format(index).encode('utf-8'), '/{0}/deeper/file-{1}.txt'.format(index % 3, index))
+             for index in range(12)]
+    calls = []
+    results = client.upload_many(pairs, max_workers=4, progress=lambda *args: calls.append(args))
+    assert [result.item for result in results] == pairs
+    assert all(isinstance(result, BulkResult) and result.ok for result in results)
+    assert sorted(completed for completed, _, _ in calls) == list(range(1, 13))
+    assert set(total for _, total, _ in calls) == {12}
+    for data, remote_path in pairs:
+        assert server.resources[remote_path].data == data
+
+
+def test_upload_many_reports_failures_per_item(server, client):
+    pairs = [(b'data', '/file.txt'), (b'data', '/missing/file.txt')]
+    results = client.upload_many(pairs, create_directories=False)
+    assert [result.ok for result in results] == [True, False]
+    assert isinstance(results[1].error, OperationFailed) and results[1].error.actual_code == 409
+    assert repr(results[1]) == "BulkResult(item=(b'data', '/missing/file.txt'), ok=False)"
+
+
+def test_download_many_to_local_paths(server, client, tmp_path):
+    client.upload_many([(b'one', '/a/one.txt'), (b'two', '/b/two.txt')])
+    pairs = [('/a/one.txt', str(tmp_path / 'a' / 'one.txt')), ('/b/two.txt', str(tmp_path / 'b' / 'two.txt')),
+             ('/missing.txt', str(tmp_path / 'missing.txt'))]
+    results = client.download_many(pairs)
+    assert [result.ok for result in results] == [True, True, False]
+    assert results[2].error.actual_code == 404
+    assert (tmp_path / 'a' / 'one.txt').read_bytes() == b'one'
+    assert (tmp_path / 'b' / 'two.txt').read_bytes() == b'two'
+
+
+def test_run_concurrently_without_items():
+    assert run_concurrently(lambda item: item, []) == []
@@ -0,0 +1,122 @@
+import time
+from io import BytesIO
+from types import SimpleNamespace
+import pytest
+from simplewebdavclient import Client, cache
+from simplewebdavclient.cache import ResponseCache
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache, 'time', SimpleNamespace(monotonic=lambda: now[0], time=time.time))
+    return now
+
+
+def test_least_recently_used_entry_is_evicted_past_max_entries():
+    response_cache = ResponseCache(max_entries=2)
+    response_cache.put('a', '"a"', None, 'A', 1)
+    response_cache.put('b', '"b"', None, 'B', 1)
+    assert response_cache.get('a').value == 'A'
+    response_cache.put('c', '"c"', None, 'C', 1)
+    assert response_cache.get('b') is None
+    assert [response_cache.get(key).value for key in ('a', 'c')] == ['A', 'C']
+    assert response_cache.stats()['evictions'] == 1
+
+
+def test_entries_are_evicted_past_max_bytes():
+    response_cache = ResponseCache(max_bytes=10)
+    response_cache.put('a', '"a"', None, 'A', 6)
+    response_cache.put('b', '"b"', None, 'B', 6)
+    assert response_cache.get('a') is None
+    assert len(response_cache) == 1 and response_cache.current_bytes == 6
+
+
+def test_replacing_an_entry_keeps_the_byte_count():
+    response_cache = ResponseCache()
+    response_cache.put('a', '"1"', None, 'old', 5)
+    response_cache.put('a', '"2"', None, 'new', 3)
+    assert response_cache.get('a').etag == '"2"'
+    assert response_cache.current_bytes == 3
+
+
+def test_entries_without_validators_or_too_big_are_not_kept():
+    response_cache = ResponseCache(max_entry_bytes=10)
+    response_cache.put('a', '"a"', None, 'A', 1)
+    response_cache.put('a', None, None, 'A', 1)
+    assert response_cache.get('a') is None
+    response_cache.put('b', None, 'Sun, 06 Nov 1994 08:49:37 GMT', 'B', 1)
+    response_cache.put('b', '"b"', None, 'B', 11)
+    assert response_cache.get('b') is None
+    assert response_cache.current_bytes == 0
+
+
+def test_entries_expire_after_ttl(clock):
+    response_cache = ResponseCache(ttl=30)
+    response_cache.put('a', '"a"', None, 'A', 4)
+    clock[0] += 30
+    assert response_cache.get('a').value == 'A'
+    clock[0] += 0.5
+    assert response_cache.get('a') is None
+    assert len(response_cache) == 0 and response_cache.current_bytes == 0
+
+
+def test_entries_are_kept_without_ttl(clock):
+    response_cache = ResponseCache()
+    response_cache.put('a', '"a"', None, 'A', 4)
+    clock[0] += 10 ** 6
+    assert response_cache.get('a').value == 'A'
+
+
+def test_conditional_headers():
+    response_cache = ResponseCache()
+    response_cache.put('a', '"a"', 'Sun, 06 Nov 1994 08:49:37 GMT', 'A', 1)
+    assert response_cache.get('a').conditional_headers() == {'If-None-Match': '"a"',
+                                                            'If-Modified-Since': 'Sun, 06 Nov 1994 08:49:37 GMT'}
+
+
+def test_invalidate_clear_and_counters():
+    response_cache = ResponseCache()
+    response_cache.put('a', '"a"', None, 'A', 1)
+    response_cache.put('b', '"b"', None, 'B', 1)
+    response_cache.invalidate('a')
+    assert response_cache.get('a') is None and len(response_cache) == 1
+    response_cache.record(True)
+    response_cache.record(False)
+    response_cache.clear()
+    assert response_cache.stats() == dict(hits=1, misses=1, evictions=0, entries=0, bytes=0)
+
+
+def test_downloads_are_served_from_the_cache_until_the_etag_changes(server):
+    with Client('127.0.0.1', port=server.port, cache=ResponseCache()) as client:
+        client.upload(b'first', '/file.txt')
+        for _ in range(3):
+            target = BytesIO()
+            client.download('/file.txt', target)
+            assert target.getvalue() == b'first'
+
+        assert (client.cache.hits, client.cache.misses) == (2, 1)
+        client.upload(b'second', '/file.txt')
+        target = BytesIO()
+        client.download('/file.txt', target)
+        assert target.getvalue() == b'second'
+        assert (client.cache.hits, client.cache.misses) == (2, 2)
+
+
+def test_existence_checks_are_revalidated(server):
+    with Client('127.0.0.1', port=server.port, cache=ResponseCache()) as client:
+        client.upload(b'data', '/file.txt')
+        assert client.resource_exists('/file.txt') and client.resource_exists('/file.txt')
+        assert (client.cache.hits, client.cache.misses) == (1, 1)
+        client.resource_delete('/file.txt')
+        assert not client.resource_exists('/file.txt')
+        assert client.cache.stats()['entries'] == 0
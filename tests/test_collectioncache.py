@@ -0,0 +1,155 @@
+import pytest
+from simplewebdavclient import Client
+from simplewebdavclient.collectioncache import CollectionCache, split_path
+from simplewebdavclient.exceptions import OperationFailed
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+ROOT = 'http://127.0.0.1:80'
+OTHER_ROOT = 'http://127.0.0.1:80/other'
+
+
+def mkcols(server, action):
+    """
+    Function to count the requests an action sends to the stand-in server
+
+    :type server: StandInServer
+    :param server: The running server
+    :type action: Callable
+    :param action: Called with no arguments
+
+    :rtype: Integer
+    :return: The number of requests
+
+    """
+    before = server.requests
+    action()
+    return server.requests - before
+
+
+def test_split_path():
+    assert split_path('/a//b/c/') == ('a', 'b', 'c')
+    assert split_path('/') == ()
+
+
+def test_lookup_finds_the_deepest_known_collection():
+    cache = CollectionCache()
+    cache.add(ROOT, ('a', 'b'))
+    assert cache.lookup(ROOT, ('a', 'b', 'c', 'd')) == (2, False)
+    assert cache.known_depth(ROOT, ('a',)) == 1
+    assert cache.known_depth(ROOT, ('x', 'b')) == 0
+    cache.add(ROOT, ('a', 'b', 'c'), created=True)
+    assert cache.lookup(ROOT, ('a', 'b', 'c', 'd')) == (3, True)
+
+
+def test_roots_are_kept_apart():
+    cache = CollectionCache()
+    cache.add(ROOT, ('a', 'b'))
+    assert cache.lookup(OTHER_ROOT, ('a', 'b')) == (0, False)
+    cache.add(OTHER_ROOT, ('a',))
+    cache.discard(ROOT, ())
+    assert cache.known_depth(ROOT, ('a', 'b')) == 0
+    assert cache.known_depth(OTHER_ROOT, ('a', 'b')) == 1
+
+
+def test_discard_forgets_the_subtree():
+    cache = CollectionCache()
+    cache.add(ROOT, ('a', 'b', 'c'))
+    cache.add(ROOT, ('a', 'x'))
+    cache.discard(ROOT, ('a', 'b'))
+    assert cache.known_depth(ROOT, ('a', 'b', 'c')) == 1
+    assert cache.known_depth(ROOT, ('a', 'x')) == 2
+    cache.discard(ROOT, ('missing', 'path'))
+    cache.discard(OTHER_ROOT, ('a',))
+    assert cache.known_depth(ROOT, ('a', 'x')) == 2
+    cache.clear()
+    assert cache.known_depth(ROOT, ('a', 'x')) == 0
+
+
+def test_path_lock_is_shared_until_the_collection_is_known():
+    cache = CollectionCache()
+    lock = cache.path_lock(ROOT, ('a',))
+    assert cache.path_lock(ROOT, ('a',)) is lock
+    assert cache.path_lock(OTHER_ROOT, ('a',)) is not lock
+    cache.add(ROOT, ('a',))
+    assert cache.path_lock(ROOT, ('a',)) is not lock
+
+
+def test_directories_create_walks_up_on_409(server, client):
+    assert mkcols(server, lambda: client.directories_create('/a/b/c/')) == 5
+    assert all(server.resources[path].collection for path in ('/a', '/a/b', '/a/b/c'))
+    assert mkcols(server, lambda: client.directories_create('/a/b/c/')) == 0
+
+
+def test_directories_create_costs_one_mkcol_when_the_parents_exist(server, client):
+    client.directories_create('/a/b/')
+    with Client('127.0.0.1', port=server.port) as other_client:
+        assert mkcols(server, lambda: other_client.directories_create('/a/b/c/')) == 1
+
+    assert server.resources['/a/b/c'].collection
+
+
+def test_directories_create_goes_straight_down_below_a_created_collection(server, client):
+    client.directories_create('/a/')
+    assert mkcols(server, lambda: client.directories_create('/a/b/c/')) == 2
+
+
+def test_directories_create_recovers_from_a_stale_cache(server, client):
+    client.directories_create('/a/b/')
+    with server.lock:
+        for path in ('/a', '/a/b'):
+            del server.resources[path]
+
+    client.directories_create('/a/b/c/')
+    assert all(server.resources[path].collection for path in ('/a', '/a/b', '/a/b/c'))
+
+
+def test_directory_delete_forgets_the_collection(server, client):
+    client.directories_create('/a/b/')
+    client.directory_delete('/a/')
+    assert client.collection_cache.known_depth(client.base_url, ('a', 'b')) == 0
+    assert mkcols(server, lambda: client.directories_create('/a/b/')) == 3
+
+
+def test_directory_create_without_parent_fails(client):
+    with pytest.raises(OperationFailed) as error:
+        client.directory_create('/missing/a')
+
+    assert error.value.actual_code == 409
+
+
+def test_directories_create_many_makes_shared_parents_once(server, client):
+    results = client.directories_create_many(['/a/b/c/', '/a/b/d', '/a/e/', '/a/b/', '/f'])
+    assert [result.item for result in results] == [('a', 'b', 'c'), ('a', 'b', 'd'), ('a', 'e'), ('f',)]
+    assert all(result.ok for result in results)
+    assert all(server.resources[path].collection for path in ('/a/b/c', '/a/b/d', '/a/e', '/f'))
+    assert mkcols(server, lambda: client.directories_create_many(['/a/b/c/', '/f/'])) == 0
+
+
+def test_directories_create_raises_when_the_server_refuses(server, client):
+    client.directories_create('/a/')
+    server.locked.add('/a/b')
+    with pytest.raises(OperationFailed) as error:
+        client.directories_create('/a/b/c/')
+
+    assert error.value.actual_code == 423
+    assert client.collection_cache.known_depth(client.base_url, ('a', 'b')) == 1
+    server.locked.clear()
+    client.directories_create('/a/b/c/')
+    assert server.resources['/a/b/c'].collection
+
+
+def test_clients_on_other_roots_can_share_the_cache(server, client):
+    client.directories_create('/one/a/b/')
+    client.directories_create('/two/')
+    with Client('127.0.0.1', port=server.port, path='/two', collection_cache=client.collection_cache) as other_client:
+        other_client.directories_create('/a/b/')
+
+    assert server.resources['/two/a/b'].collection
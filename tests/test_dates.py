@@ -0,0 +1,87 @@
+import calendar
+import random
+from datetime import timezone
+from email.utils import formatdate
+import pytest
+from simplewebdavclient.dates import epoch_from_fields, parse_http_date, parse_iso8601_date, epoch_to_datetime
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def test_epoch_from_fields_matches_timegm():
+    randomizer = random.Random(1)
+    for _ in range(2000):
+        fields = (randomizer.randint(1900, 2200), randomizer.randint(1, 12), randomizer.randint(1, 28),
+                  randomizer.randint(0, 23), randomizer.randint(0, 59), randomizer.randint(0, 59))
+        assert epoch_from_fields(*fields) == calendar.timegm(fields)
+
+    for fields in ((2000, 2, 29), (2100, 3, 1), (1970, 1, 1), (1969, 12, 31), (2024, 12, 31)):
+        assert epoch_from_fields(*fields) == calendar.timegm(fields + (0, 0, 0))
+
+
+@pytest.mark.parametrize('value, epoch', [
+    ('Sun, 06 Nov 1994 08:49:37 GMT', 784111777.0),
+    ('Tue, 29 Feb 2000 23:59:59 GMT', 951868799.0),
+    ('Sun, 6 Nov 1994 08:49:37 GMT', 784111777.0),
+    ('Sun, 06 Nov 1994 09:49:37 +0100', 784111777.0),
+    ('Sunday, 06-Nov-94 08:49:37 GMT', 784111777.0),
+])
+def test_parse_http_date(value, epoch):
+    assert parse_http_date(value) == epoch
+
+
+def test_parse_http_date_checks_the_time_of_a_cached_day():
+    assert parse_http_date('Sun, 06 Nov 1994 08:49:37 GMT') == 784111777.0
+    assert parse_http_date('Sun, 06 Nov 1994 25:49:37 GMT') is None
+
+
+def test_parse_http_date_agrees_with_formatdate():
+    randomizer = random.Random(2)
+    for _ in range(500):
+        epoch = float(randomizer.randint(0, 2 ** 32))
+        assert parse_http_date(formatdate(epoch, usegmt=True)) == epoch
+
+
+@pytest.mark.parametrize('value', [None, '', 'yesterday', 'Sun, 06 Xyz 1994 08:49:37 GMT',
+                                   'Thu, 31 Feb 2000 08:49:37 GMT', 'Tue, 29 Feb 2001 08:49:37 GMT',
+                                   'Sun, 00 Nov 1994 08:49:37 GMT', 'Sun, 06 Nov 1994 24:00:00 GMT',
+                                   'Sun, 06 Nov 1994 08:60:37 GMT', 'Sun, 06 Nov 1994 08:49:60 GMT'])
+def test_parse_http_date_gives_none_for_bad_dates(value):
+    assert parse_http_date(value) is None
+
+
+@pytest.mark.parametrize('value, epoch', [
+    ('1997-12-01T17:42:21Z', 880998141.0),
+    ('1997-12-01t17:42:21z', 880998141.0),
+    ('1997-12-01T17:42:21', 880998141.0),
+    ('1997-12-01 17:42:21Z', 880998141.0),
+    ('1997-12-01T17:42:21.25Z', 880998141.25),
+    ('1997-12-01T17:42:21,5Z', 880998141.5),
+    ('1997-12-01T19:42:21+02:00', 880998141.0),
+    ('1997-12-01T16:12:21-0130', 880998141.0),
+    ('1997-12-01T19:42:21.25+02:00', 880998141.25),
+    ('1997-12-01', 880934400.0),
+])
+def test_parse_iso8601_date(value, epoch):
+    assert parse_iso8601_date(value) == pytest.approx(epoch)
+
+
+@pytest.mark.parametrize('value', [None, '', 'yesterday', '1997-13-45T17:42:21Z', '2001-02-29T00:00:00Z',
+                                   '1997-12-01T24:00:00Z'])
+def test_parse_iso8601_date_gives_none_for_bad_dates(value):
+    assert parse_iso8601_date(value) is None
+
+
+def test_epoch_to_datetime():
+    assert epoch_to_datetime(None) is None
+    moment = epoch_to_datetime(880998141.0)
+    assert moment.tzinfo is timezone.utc
+    assert (moment.year, moment.month, moment.day, moment.hour, moment.minute, moment.second) == \
+        (1997, 12, 1, 17, 42, 21)
@@ -0,0 +1,100 @@
+import pytest
+from benchmarks.server import LARGE_BODY_BYTES, PATTERN
+from simplewebdavclient.exceptions import BufferTooSmall
+from simplewebdavclient.simplewebdavclient import RESUME_SUFFIX
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+SMALL_BODY = b'0123456789' * 100
+
+
+def pattern_body(size):
+    """
+    Function to build the body the stand-in server serves back for a large upload
+
+    :type size: Integer
+    :param size: The body size
+
+    :rtype: Bytes
+    :return: The body
+
+    """
+    return (PATTERN * (size // len(PATTERN) + 1))[:size]
+
+
+def test_download_to_a_path_object(client, tmp_path):
+    client.upload(SMALL_BODY, '/file.bin')
+    client.download('/file.bin', tmp_path / 'file.bin')
+    assert (tmp_path / 'file.bin').read_bytes() == SMALL_BODY
+
+
+def test_download_many_makes_parents_of_path_objects(client, tmp_path):
+    client.upload(SMALL_BODY, '/file.bin')
+    results = client.download_many([('/file.bin', tmp_path / 'new' / 'file.bin')])
+    assert [result.ok for result in results] == [True]
+    assert (tmp_path / 'new' / 'file.bin').read_bytes() == SMALL_BODY
+
+
+def test_segmented_download_fetches_byte_ranges(server, client, tmp_path):
+    size = 3 * LARGE_BODY_BYTES + 17
+    client.upload(bytes(size), '/large.bin')
+    requests = server.requests
+    client.download('/large.bin', tmp_path / 'large.bin', segments=3)
+    # A HEAD and one GET per segment
+    assert server.requests - requests == 4
+    assert (tmp_path / 'large.bin').read_bytes() == pattern_body(size)
+
+
+def test_segmented_download_of_a_small_file_is_one_get(server, client, tmp_path):
+    client.upload(SMALL_BODY, '/file.bin')
+    client.download('/file.bin', str(tmp_path / 'file.bin'), segments=4)
+    assert (tmp_path / 'file.bin').read_bytes() == SMALL_BODY
+
+
+def test_resume_continues_a_partial_file(server, client, tmp_path):
+    client.upload(SMALL_BODY, '/file.bin')
+    target = tmp_path / 'file.bin'
+    # The kept part is not what the server holds, so only a range request leaves it alone
+    target.write_bytes(b'x' * 100)
+    (tmp_path / ('file.bin' + RESUME_SUFFIX)).write_text(server.resources['/file.bin'].etag())
+    client.download('/file.bin', target, resume=True)
+    assert target.read_bytes() == b'x' * 100 + SMALL_BODY[100:]
+    assert not (tmp_path / ('file.bin' + RESUME_SUFFIX)).exists()
+
+
+def test_resume_starts_again_when_the_resource_changed(server, client, tmp_path):
+    client.upload(SMALL_BODY, '/file.bin')
+    target = tmp_path / 'file.bin'
+    target.write_bytes(b'x' * 100)
+    (tmp_path / ('file.bin' + RESUME_SUFFIX)).write_text('"stale"')
+    client.download('/file.bin', target, resume=True)
+    assert target.read_bytes() == SMALL_BODY
+
+
+def test_resume_starts_again_when_the_partial_file_is_too_long(server, client, tmp_path):
+    client.upload(SMALL_BODY, '/file.bin')
+    target = tmp_path / 'file.bin'
+    target.write_bytes(b'x' * (len(SMALL_BODY) + 1))
+    (tmp_path / ('file.bin' + RESUME_SUFFIX)).write_text(server.resources['/file.bin'].etag())
+    client.download('/file.bin', target, resume=True)
+    assert target.read_bytes() == SMALL_BODY
+
+
+def test_download_into_a_buffer(client):
+    client.upload(SMALL_BODY, '/file.bin')
+    buffer = bytearray(len(SMALL_BODY) + 10)
+    assert client.download('/file.bin', memoryview(buffer)) == len(SMALL_BODY)
+    assert bytes(buffer[:len(SMALL_BODY)]) == SMALL_BODY
+
+
+def test_download_into_a_buffer_too_small(client):
+    client.upload(SMALL_BODY, '/file.bin')
+    with pytest.raises(BufferTooSmall):
+        client.download('/file.bin', bytearray(len(SMALL_BODY) - 1))
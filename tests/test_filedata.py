@@ -0,0 +1,68 @@
+from simplewebdavclient.filedata import ResourceTable, UNKNOWN_TIME
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def make_listing(server, client):
+    """
+    Function to upload a directory of files with known sizes and modified times
+
+    :type server: StandInServer
+    :param server: The running server
+    :type client: Client
+    :param client: The Client
+
+    :rtype: None
+    :return: None
+
+    """
+    client.directories_create('/dir/sub/')
+    for name, size, mtime in (('small.txt', 1, 1000.0), ('medium.txt', 10, 2000.0), ('large.txt', 100, 3000.0)):
+        client.upload(b'x' * size, '/dir/' + name)
+        server.resources['/dir/' + name].mtime = mtime
+
+    server.resources['/dir'].mtime = 500.0
+    server.resources['/dir/sub'].mtime = 4000.0
+
+
+def test_table_listing_matches_the_file_data_listing(server, client):
+    make_listing(server, client)
+    table = client.resource_list('/dir/', as_table=True)
+    listing = client.resource_list('/dir/')
+    assert isinstance(table, ResourceTable) and len(table) == len(listing) == 5
+    for row, file_data in zip(table, listing):
+        assert (row.resource_url, row.file_size, row.modified_epoch, row.is_dir(), row.etag) == \
+            (file_data.resource_url, file_data.file_size, file_data.modified_epoch, file_data.is_dir(),
+             file_data.etag)
+
+
+def test_select_sort_and_take(server, client):
+    make_listing(server, client)
+    table = client.resource_list('/dir/', as_table=True)
+    files = table.select(dirs=False)
+    assert sorted(table.resource_names[index] for index in files) == ['large.txt', 'medium.txt', 'small.txt']
+    assert [table.resource_names[index] for index in table.select(min_size=5, max_size=50)] == ['medium.txt']
+    assert [table.resource_names[index] for index in table.select(modified_after=1500.0, modified_before=3500.0)] \
+        == ['medium.txt', 'large.txt']
+    largest_first = table.take(table.sort_indexes('file_sizes', reverse=True, indexes=files))
+    assert largest_first.resource_names == ['large.txt', 'medium.txt', 'small.txt']
+    assert list(largest_first.file_sizes) == [100, 10, 1]
+    assert [file_data.resource_name for file_data in table.take(table.select(dirs=True))] == ['dir', 'sub']
+
+
+def test_rows_without_a_modified_time():
+    table = ResourceTable()
+    table.append_values('/dir/', 'dir', 0, None, None, None)
+    table.append_values('/dir/file.txt', 'file.txt', 3, 'not a date', None, 'text/plain')
+    assert list(table.modified_epochs) == [UNKNOWN_TIME, UNKNOWN_TIME]
+    assert table[1].modified_epoch is None
+    assert table.select(modified_after=0.0) == []
+    assert [row.is_dir() for row in table] == [True, False]
+    assert ResourceTable.from_file_data(table).resource_urls == table.resource_urls
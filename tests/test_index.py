@@ -0,0 +1,84 @@
+from simplewebdavclient.index import ListingIndex
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def build_tree(client):
+    """
+    Function to upload the tree the index is built from
+
+    :type client: Client
+    :param client: The Client
+
+    :rtype: None
+    :return: None
+
+    """
+    client.upload_many([(b'a', '/docs/a.txt'), (b'bb', '/docs/sub/b.txt'), (b'ccc', '/img/c.png'),
+                        (b'dddd', '/docs/my file.txt')])
+
+
+def names(file_data_objects):
+    return [file_data.resource_name for file_data in file_data_objects]
+
+
+def test_first_refresh_indexes_the_whole_tree(server, client):
+    build_tree(client)
+    with ListingIndex(':memory:') as index:
+        stats = index.refresh(client)
+        assert stats == dict(listed=4, skipped=0, written=8, removed=0)
+        assert len(index) == 8
+        assert index.get('/docs/sub/b.txt').file_size == 2
+        assert index.get('/docs/my file.txt').file_size == 4
+        assert index.get('/missing.txt') is None
+        assert names(index.children('/docs')) == ['a.txt', 'my file.txt', 'sub']
+        assert names(index.query(prefix='/docs/', dirs=False)) == ['a.txt', 'my file.txt', 'b.txt']
+        assert names(index.query(pattern='*.txt', order_by='file_size', reverse=True, limit=2)) == \
+            ['my file.txt', 'b.txt']
+
+
+def test_refresh_lists_only_the_collections_that_changed(server, client):
+    build_tree(client)
+    with ListingIndex(':memory:') as index:
+        index.refresh(client)
+        client.upload(b'new', '/docs/sub/new.txt')
+        requests = server.requests
+        stats = index.refresh(client)
+        # /, /docs and /docs/sub changed, /img did not
+        assert (stats['listed'], stats['skipped'], stats['removed']) == (3, 1, 0)
+        assert server.requests - requests == 3
+        assert index.get('/docs/sub/new.txt').file_size == 3
+
+
+def test_refresh_removes_what_was_deleted(server, client):
+    build_tree(client)
+    with ListingIndex(':memory:') as index:
+        index.refresh(client)
+        client.directory_delete('/docs/sub/')
+        client.resource_delete('/img/c.png')
+        stats = index.refresh(client)
+        assert stats['removed'] == 3
+        assert index.get('/docs/sub') is None and index.get('/docs/sub/b.txt') is None
+        assert names(index.children('/img')) == []
+        assert len(index) == 5
+
+
+def test_an_unchanged_tree_is_checked_with_one_listing(server, client, tmp_path):
+    build_tree(client)
+    database = str(tmp_path / 'index.sqlite')
+    with ListingIndex(database) as index:
+        index.refresh(client)
+
+    # The index is kept in the file, a later run starts from it
+    with ListingIndex(database) as index:
+        requests = server.requests
+        assert index.refresh(client) == dict(listed=1, skipped=2, written=3, removed=0)
+        assert server.requests - requests == 1
+        assert index.refresh(client, full=True)['listed'] == 4
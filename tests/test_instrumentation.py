@@ -0,0 +1,73 @@
+import pytest
+from simplewebdavclient import Client, MetricsAggregator
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+DATA = bytes(range(256)) * 64
+
+
+@pytest.fixture
+def metrics(server):
+    """
+    Fixture for a MetricsAggregator with a Client reporting to it
+
+    :rtype: Tuple
+    :return: The MetricsAggregator and the Client
+
+    """
+    aggregator = MetricsAggregator()
+    with Client('127.0.0.1', port=server.port, instrumentation=aggregator) as webdav_client:
+        yield aggregator, webdav_client
+
+
+@pytest.mark.parametrize('chunked', [False, True])
+def test_listing_counts_the_multistatus_body(server, client, metrics, chunked):
+    aggregator, webdav_client = metrics
+    client.upload(DATA, '/one.bin')
+    client.upload(DATA, '/two.bin')
+    server.chunked = chunked
+    body = client._propfind('/').content
+    aggregator.reset()
+    assert len(webdav_client.resource_list('/')) == 3
+    assert aggregator.status_counts == {'PROPFIND': {207: 1}}
+    assert aggregator.bytes_received == len(body)
+
+
+@pytest.mark.parametrize('chunked', [False, True])
+def test_download_counts_the_body(server, client, metrics, tmp_path, chunked):
+    aggregator, webdav_client = metrics
+    client.upload(DATA, '/file.bin')
+    server.chunked = chunked
+    aggregator.reset()
+    webdav_client.download('/file.bin', tmp_path / 'file.bin')
+    assert aggregator.status_counts == {'GET': {200: 1}}
+    assert aggregator.bytes_received == len(DATA)
+
+
+def test_abandoned_body_counts_what_was_read_once_closed(server, client, metrics):
+    aggregator, webdav_client = metrics
+    client.upload(DATA, '/file.bin')
+    server.chunked = True
+    aggregator.reset()
+    with webdav_client.open_remote('/file.bin', chunk_size=1000) as stream:
+        assert stream.read(10) == DATA[:10]
+        assert aggregator.status_counts == {}
+
+    assert aggregator.status_counts == {'GET': {200: 1}}
+    assert 10 <= aggregator.bytes_received < len(DATA)
+
+
+def test_head_counts_no_body(server, client, metrics):
+    aggregator, webdav_client = metrics
+    client.upload(DATA, '/file.bin')
+    aggregator.reset()
+    assert webdav_client.resource_exists('/file.bin')
+    assert aggregator.status_counts == {'HEAD': {200: 1}}
+    assert aggregator.bytes_received == 0
@@ -0,0 +1,125 @@
+import os
+import hashlib
+import pytest
+from simplewebdavclient.exceptions import OperationFailed
+from simplewebdavclient.integrity import CHECKSUMS_PROPERTY
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def local_file(tmp_path, data, name='file.bin'):
+    """
+    Function to write a local file to upload
+
+    :type tmp_path: pathlib.Path
+    :param tmp_path: The directory
+    :type data: Bytes
+    :param data: The content
+    :type name: String
+    :param name: The file name
+
+    :rtype: String
+    :return: The local path
+
+    """
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def before_put(monkeypatch, client, action):
+    """
+    Function to run an action after the remote copy was looked up and before it is uploaded, like another writer would
+
+    :type monkeypatch: MonkeyPatch
+    :param monkeypatch: The pytest fixture
+    :type client: Client
+    :param client: The Client
+    :type action: Callable
+    :param action: Called with no arguments
+
+    :rtype: None
+    :return: None
+
+    """
+    stat = client._Client__stat
+
+    def stat_then_act(*args):
+        remote_file = stat(*args)
+        action()
+        return remote_file
+
+    monkeypatch.setattr(client, '_Client__stat', stat_then_act)
+
+
+def test_upload_if_changed_skips_an_identical_copy(server, client, tmp_path):
+    path = local_file(tmp_path, b'data')
+    result = client.upload_if_changed(path, '/file.bin')
+    assert (result.uploaded, result.reason, result.etag) == (True, 'missing', server.resources['/file.bin'].etag())
+    os.utime(path, (0, 0))
+    result = client.upload_if_changed(path, '/file.bin')
+    assert (result.uploaded, result.reason) == (False, 'unchanged')
+    local_file(tmp_path, b'more data')
+    result = client.upload_if_changed(path, '/file.bin')
+    assert (result.uploaded, result.reason) == (True, 'size')
+    assert server.resources['/file.bin'].data == b'more data'
+
+
+def test_upload_if_changed_compares_server_checksums(server, client, tmp_path):
+    path = local_file(tmp_path, b'data')
+    client.upload(b'data', '/file.bin')
+    server.resources['/file.bin'].properties[CHECKSUMS_PROPERTY] = 'SHA1:' + hashlib.sha1(b'data').hexdigest()
+    result = client.upload_if_changed(path, '/file.bin', checksum='sha1')
+    assert (result.uploaded, result.reason, result.checksum) == (False, 'checksum', hashlib.sha1(b'data').hexdigest())
+    local_file(tmp_path, b'date')
+    result = client.upload_if_changed(path, '/file.bin', checksum='sha1')
+    assert (result.uploaded, result.reason) == (True, 'checksum')
+    # The server keeps the checksum sent along, the next comparison uses it
+    assert server.resources['/file.bin'].properties[CHECKSUMS_PROPERTY] == \
+        'SHA1:' + hashlib.sha1(b'date').hexdigest()
+    assert not client.upload_if_changed(path, '/file.bin', checksum='sha1').uploaded
+
+
+def test_upload_if_changed_does_not_overwrite_a_new_remote_file(server, client, tmp_path, monkeypatch):
+    path = local_file(tmp_path, b'mine')
+    before_put(monkeypatch, client, lambda: client.upload(b'theirs', '/file.bin'))
+    with pytest.raises(OperationFailed) as error:
+        client.upload_if_changed(path, '/file.bin')
+
+    assert error.value.actual_code == 412
+    assert server.resources['/file.bin'].data == b'theirs'
+
+
+def test_upload_if_changed_does_not_overwrite_a_changed_remote_file(server, client, tmp_path, monkeypatch):
+    client.upload(b'old', '/file.bin')
+    path = local_file(tmp_path, b'mine')
+    before_put(monkeypatch, client, lambda: client.upload(b'theirs', '/file.bin'))
+    with pytest.raises(OperationFailed) as error:
+        client.upload_if_changed(path, '/file.bin', checksum='md5')
+
+    assert error.value.actual_code == 412
+    assert server.resources['/file.bin'].data == b'theirs'
+
+
+def test_upload_many_if_changed_reports_each_file(server, client, tmp_path):
+    client.directories_create('/dir/')
+    client.upload(b'same', '/dir/same.bin')
+    same = local_file(tmp_path, b'same', 'same.bin')
+    os.utime(same, (0, 0))
+    pairs = [(same, '/dir/same.bin'), (local_file(tmp_path, b'new', 'new.bin'), '/dir/new/new.bin')]
+    results = client.upload_many_if_changed(pairs)
+    assert [(result.result.uploaded, result.result.reason) for result in results] == [(False, 'unchanged'),
+                                                                                      (True, 'missing')]
+    assert server.resources['/dir/new/new.bin'].data == b'new'
+
+
+def test_unknown_checksums_are_refused(client, tmp_path):
+    with pytest.raises(ValueError):
+        client.upload_if_changed(local_file(tmp_path, b'data'), '/file.bin', checksum='crc32')
@@ -0,0 +1,61 @@
+from simplewebdavclient.exceptions import OperationFailed
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def make_files(client):
+    """
+    Function to upload the files the lookups are run against
+
+    :type client: Client
+    :param client: The Client
+
+    :rtype: None
+    :return: None
+
+    """
+    client.upload_many([(b'1', '/a/one.txt'), (b'22', '/a/my file.txt'), (b'3', '/b/three.txt'),
+                        (b'4', '/c/four.txt'), (b'5', '/c/denied.txt')])
+
+
+def test_exists_many_lists_each_parent_once(server, client):
+    make_files(client)
+    requests = server.requests
+    answer = client.exists_many(['/a/one.txt', '/a/my file.txt', '/a/missing.txt', '/b/three.txt', '/nope/x.txt',
+                                 '/nope/y.txt'])
+    assert answer == {'/a/one.txt': True, '/a/my file.txt': True, '/a/missing.txt': False, '/b/three.txt': True,
+                      '/nope/x.txt': False, '/nope/y.txt': False}
+    # A PROPFIND for /a/ and /nope/, a HEAD for /b/three.txt
+    assert server.requests - requests == 3
+
+
+def test_stat_many_gives_file_data_or_none(server, client):
+    make_files(client)
+    answer = client.stat_many(['/a/one.txt', '/a/my%20file.txt', '/a/missing.txt', '/b/three.txt', '/b/missing.txt',
+                               '/c/four.txt'])
+    assert set(answer) == {'/a/one.txt', '/a/my%20file.txt', '/a/missing.txt', '/b/three.txt', '/b/missing.txt',
+                           '/c/four.txt'}
+    assert (answer['/a/one.txt'].file_size, answer['/a/my%20file.txt'].file_size) == (1, 2)
+    assert answer['/b/three.txt'].etag == server.resources['/b/three.txt'].etag()
+    assert answer['/a/missing.txt'] is None and answer['/b/missing.txt'] is None
+
+
+def test_lookups_probe_the_members_of_a_parent_that_can_not_be_listed(server, client):
+    make_files(client)
+    server.forbidden.update(('/c', '/c/denied.txt'))
+    errors = {}
+    assert client.exists_many(['/c/four.txt', '/c/denied.txt', '/c/missing.txt'], errors=errors) == \
+        {'/c/four.txt': True, '/c/missing.txt': False}
+    assert list(errors) == ['/c/denied.txt']
+    assert isinstance(errors['/c/denied.txt'], OperationFailed) and errors['/c/denied.txt'].actual_code == 403
+    errors = {}
+    answer = client.stat_many(['/c/four.txt', '/c/denied.txt'], errors=errors)
+    assert list(answer) == ['/c/four.txt'] and answer['/c/four.txt'].file_size == 1
+    assert errors['/c/denied.txt'].actual_code == 403
@@ -0,0 +1,139 @@
+from xml.etree import ElementTree
+import pytest
+from simplewebdavclient.multistatus import MultistatusStreamParser, iter_response_elements, extract_properties,\
+    status_ok, extract_status, failed_responses, build_propfind_body, DEFAULT_PROPERTIES
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+BODY = (b'<?xml version="1.0" encoding="utf-8"?>'
+        b'<D:multistatus xmlns:D="DAV:">'
+        b'<D:response><D:href>/dir/</D:href><D:propstat><D:prop>'
+        b'<D:displayname>dir</D:displayname><D:resourcetype><D:collection/></D:resourcetype>'
+        b'<oc:fileid xmlns:oc="http://owncloud.org/ns">42</oc:fileid>'
+        b'</D:prop><D:status>HTTP/1.1 200 OK</D:status></D:propstat></D:response>'
+        b'<D:response><D:href>/dir/file%20one.txt</D:href><D:propstat><D:prop>'
+        b'<D:displayname>file one.txt</D:displayname><D:getcontentlength>12</D:getcontentlength>'
+        b'<D:getlastmodified>Sun, 06 Nov 1994 08:49:37 GMT</D:getlastmodified>'
+        b'<D:getetag>"abc"</D:getetag><D:resourcetype/>'
+        b'</D:prop><D:status>HTTP/1.1 200 OK</D:status></D:propstat><D:propstat><D:prop>'
+        b'<D:getcontenttype>text/plain</D:getcontenttype><D:creationdate>1997-12-01T17:42:21Z</D:creationdate>'
+        b'</D:prop><D:status>HTTP/1.1 404 Not Found</D:status></D:propstat></D:response>'
+        b'<D:response><D:href>/dir/locked</D:href><D:status>HTTP/1.1 423 Locked</D:status></D:response>'
+        b'</D:multistatus>')
+
+
+def chunks(data, size):
+    return [data[offset:offset + size] for offset in range(0, len(data), size)]
+
+
+def hrefs(elements):
+    return [element.findtext('{DAV:}href') for element in elements]
+
+
+@pytest.mark.parametrize('size', [1, 7, 64, len(BODY)])
+def test_stream_parser_gives_the_same_responses_for_any_split(size):
+    parser = MultistatusStreamParser()
+    found = []
+    for chunk in chunks(BODY, size):
+        found.extend(hrefs(parser.feed(chunk)))
+
+    found.extend(hrefs(parser.close()))
+    assert found == ['/dir/', '/dir/file%20one.txt', '/dir/locked']
+
+
+def test_stream_parser_hands_back_responses_as_they_close():
+    parser = MultistatusStreamParser()
+    first_end = BODY.index(b'</D:response>') + len(b'</D:response>')
+    assert hrefs(parser.feed(BODY[:first_end])) == ['/dir/']
+    assert parser.feed(BODY[first_end:first_end + 10]) == []
+
+
+def test_iter_response_elements_skips_empty_chunks():
+    elements = iter_response_elements([b''] + chunks(BODY, 100) + [b''])
+    assert hrefs(elements) == ['/dir/', '/dir/file%20one.txt', '/dir/locked']
+
+
+def test_extract_properties_skips_properties_of_failed_propstat_blocks():
+    _, file, _ = iter_response_elements(chunks(BODY, 5))
+    properties = extract_properties(file)
+    assert properties['resource_url'] == '/dir/file%20one.txt'
+    assert properties['resource_name'] == 'file one.txt'
+    assert properties['file_size'] == '12'
+    assert properties['modified_time'] == 'Sun, 06 Nov 1994 08:49:37 GMT'
+    assert properties['etag'] == '"abc"'
+    assert 'content_type' not in properties and 'creation_time' not in properties
+
+
+def test_extract_properties_keeps_extra_tags():
+    directory = next(iter_response_elements([BODY]))
+    properties = extract_properties(directory, extra_tags={'{http://owncloud.org/ns}fileid'})
+    assert properties['resource_name'] == 'dir'
+    assert properties['properties'] == {'{http://owncloud.org/ns}fileid': '42'}
+
+
+@pytest.mark.parametrize('status, ok', [
+    (None, True),
+    ('HTTP/1.1 200 OK', True),
+    ('HTTP/1.1 207 Multi-Status', True),
+    ('HTTP/1.1 404 Not Found', False),
+    ('HTTP/1.1 507 Insufficient Storage', False),
+    ('garbage', False),
+])
+def test_status_ok(status, ok):
+    assert status_ok(status) is ok
+
+
+def test_extract_status():
+    directory, _, locked = iter_response_elements([BODY])
+    assert extract_status(directory) == ('/dir/', None)
+    assert extract_status(locked) == ('/dir/locked', 'HTTP/1.1 423 Locked')
+
+
+def test_failed_responses_reports_responses_with_a_failed_status():
+    assert failed_responses(iter_response_elements([BODY])) == [('/dir/locked', 'HTTP/1.1 423 Locked')]
+
+
+CHECKSUMS = '{http://owncloud.org/ns}checksums'
+COLOR = ('http://example.com/a&b', 'color')
+
+
+def requested_tags(body):
+    return [item.tag for item in ElementTree.fromstring(body).find('{DAV:}prop')]
+
+
+def test_build_propfind_body_declares_every_namespace():
+    body = build_propfind_body(['{DAV:}getetag', 'displayname', CHECKSUMS, COLOR])
+    assert requested_tags(body) == ['{DAV:}getetag', '{DAV:}displayname', CHECKSUMS, '{http://example.com/a&b}color']
+
+
+def test_build_propfind_body_defaults_to_the_file_data_properties():
+    assert requested_tags(build_propfind_body()) == list(DEFAULT_PROPERTIES)
+
+
+def test_listings_carry_custom_namespace_properties(server, client):
+    client.upload(b'data', '/file.txt')
+    client.upload(b'other', '/other.txt')
+    server.resources['/file.txt'].properties.update({CHECKSUMS: 'SHA1:abc', '{http://example.com/a&b}color': 'red'})
+    properties = (name for name in DEFAULT_PROPERTIES + (CHECKSUMS, COLOR))
+    listing = dict((file_data.resource_name, file_data)
+                   for file_data in client.resource_list('/', properties=properties))
+    assert listing['file.txt'].get_property(CHECKSUMS) == 'SHA1:abc'
+    assert listing['file.txt'].get_property(COLOR) == 'red'
+    assert (listing['file.txt'].file_size, listing['file.txt'].etag) == (4, server.resources['/file.txt'].etag())
+    # The server answers 404 for properties a resource does not have
+    assert listing['other.txt'].get_property(CHECKSUMS, 'none') == 'none'
+
+
+def test_custom_properties_come_only_when_asked_for(server, client):
+    client.upload(b'data', '/file.txt')
+    server.resources['/file.txt'].properties[CHECKSUMS] = 'SHA1:abc'
+    file_data = client.resource_list('/file.txt', properties=['{DAV:}getcontentlength', CHECKSUMS])[0]
+    assert file_data.get_property(CHECKSUMS) == 'SHA1:abc'
+    assert client.resource_list('/file.txt')[0].get_property(CHECKSUMS) is None
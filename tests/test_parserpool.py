@@ -0,0 +1,82 @@
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from simplewebdavclient.index import ListingIndex
+from simplewebdavclient.multistatus import parse_file_records, file_record, iter_response_elements, \
+    DEFAULT_PROPERTIES
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+CHECKSUMS = '{http://owncloud.org/ns}checksums'
+
+
+@pytest.fixture(scope='module')
+def parser_pool():
+    """
+    Fixture for a pool of parser processes shared by the tests of this module
+
+    :rtype: ProcessPoolExecutor
+    :return: The pool
+
+    """
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def build_tree(server, client):
+    """
+    Function to upload a small tree with a custom property
+
+    :type server: StandInServer
+    :param server: The running server
+    :type client: Client
+    :param client: The Client
+
+    :rtype: None
+    :return: None
+
+    """
+    client.upload_many([(b'a', '/docs/a.txt'), (b'bb', '/docs/sub/b.txt'), (b'ccc', '/docs/my file.txt')])
+    server.resources['/docs/a.txt'].properties[CHECKSUMS] = 'SHA1:abc'
+
+
+def records(file_data_objects):
+    return [(file_data.resource_url, file_data.resource_name, file_data.file_size, file_data.etag,
+             file_data.is_dir(), file_data.get_property(CHECKSUMS)) for file_data in file_data_objects]
+
+
+def test_parse_file_records_matches_file_record(server, client):
+    build_tree(server, client)
+    response = client._propfind('/docs/', DEFAULT_PROPERTIES + (CHECKSUMS,))
+    body = response.content
+    extra_tags = {CHECKSUMS}
+    assert parse_file_records(body, extra_tags) == [file_record(element, extra_tags)
+                                                    for element in iter_response_elements((body,))]
+
+
+def test_pooled_listings_match_plain_listings(server, client, parser_pool):
+    build_tree(server, client)
+    properties = DEFAULT_PROPERTIES + (CHECKSUMS,)
+    plain = client.resource_list('/docs/', properties=properties)
+    pooled = client.resource_list('/docs/', properties=iter(properties), parser_pool=parser_pool)
+    assert records(pooled) == records(plain)
+    assert records(client.resource_list('/docs/', as_table=True, parser_pool=parser_pool)) == \
+        records(client.resource_list('/docs/', as_table=True))
+
+
+def test_pooled_crawls_match_plain_walks(server, client, parser_pool):
+    build_tree(server, client)
+    expected = sorted(records(client.walk('/')))
+    server.finite_depth = True
+    assert sorted(records(client.walk('/', parser_pool=parser_pool))) == expected
+    with ListingIndex(':memory:') as index:
+        index.refresh(client, parser_pool=parser_pool)
+        client.upload(b'new', '/docs/sub/new.txt')
+        assert index.refresh(client, parser_pool=parser_pool)['listed'] == 3
+        assert index.get('/docs/sub/new.txt').file_size == 3
@@ -0,0 +1,66 @@
+import io
+import pytest
+from benchmarks.server import LARGE_BODY_BYTES, PATTERN
+from simplewebdavclient.exceptions import OperationFailed
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+DATA = bytes(range(256)) * 64
+
+
+def test_open_remote_reads_the_whole_body_with_one_request(server, client):
+    client.upload(DATA, '/file.bin')
+    requests = server.requests
+    with client.open_remote('/file.bin', chunk_size=1000) as stream:
+        assert stream.read(10) == DATA[:10]
+        assert stream.read() == DATA[10:]
+        assert stream.read() == b''
+
+    assert server.requests - requests == 1
+
+
+def test_open_remote_seeks_with_range_requests(server, client):
+    client.upload(DATA, '/file.bin')
+    with client.open_remote('/file.bin', chunk_size=100) as stream:
+        assert stream.seekable()
+        assert stream.seek(5000) == 5000
+        assert stream.read(10) == DATA[5000:5010]
+        stream.seek(-20, io.SEEK_END)
+        assert stream.tell() == len(DATA) - 20
+        assert stream.read() == DATA[-20:]
+        stream.seek(1)
+        assert stream.read(3) == DATA[1:4]
+
+
+def test_open_remote_reads_ranges_of_large_bodies(server, client):
+    client.upload(bytes(3 * LARGE_BODY_BYTES), '/large.bin')
+    with client.open_remote('/large.bin') as stream:
+        offset = 2 * LARGE_BODY_BYTES + 300
+        stream.seek(offset)
+        assert stream.read(1000) == (PATTERN * 2)[offset % len(PATTERN):offset % len(PATTERN) + 1000]
+
+
+def test_open_remote_fails_when_the_resource_changes(server, client):
+    client.upload(DATA, '/file.bin')
+    with client.open_remote('/file.bin', chunk_size=100) as stream:
+        stream.read(10)
+        client.upload(b'changed', '/file.bin')
+        stream.seek(5000)
+        with pytest.raises(OperationFailed) as error:
+            stream.read(10)
+
+        assert error.value.actual_code == 200
+
+
+def test_open_remote_fails_early_for_a_missing_resource(client):
+    with pytest.raises(OperationFailed) as error:
+        client.open_remote('/missing.bin')
+
+    assert error.value.actual_code == 404
@@ -0,0 +1,149 @@
+import io
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+import pytest
+import requests
+from simplewebdavclient import retry
+from simplewebdavclient.retry import RetryPolicy
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {'Retry-After': retry_after} if retry_after is not None else {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSend(object):
+    """
+    Class for a send callable answering with a list of responses or exceptions in turn
+
+    :type answers: List
+    :param answers: FakeResponse objects or exceptions to raise
+
+    """
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = 0
+
+    def __call__(self):
+        answer = self.answers[min(self.calls, len(self.answers) - 1)]
+        self.calls += 1
+        if isinstance(answer, Exception):
+            raise answer
+
+        return answer
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(retry, 'time', SimpleNamespace(perf_counter=time.perf_counter, time=time.time,
+                                                       sleep=slept.append))
+    return slept
+
+
+def test_retries_a_retryable_status(sleeps):
+    policy = RetryPolicy(backoff_factor=0.1)
+    busy = FakeResponse(503)
+    send = FakeSend(busy, FakeResponse(200))
+    response = policy.call('GET', send)
+    assert response.status_code == 200
+    assert [attempt.status_code for attempt in response.attempts] == [503, 200]
+    assert busy.closed
+    assert len(sleeps) == 1 and 0 <= sleeps[0] <= 0.1
+    assert policy.stats()['retries'] == 1
+
+
+def test_gives_up_after_max_attempts(sleeps):
+    policy = RetryPolicy(max_attempts=3)
+    send = FakeSend(FakeResponse(502))
+    response = policy.call('PROPFIND', send)
+    assert response.status_code == 502
+    assert send.calls == 3 and len(sleeps) == 2
+    assert response.attempts[-1].delay == 0.0
+
+
+def test_waits_as_long_as_retry_after_asks(sleeps):
+    policy = RetryPolicy(backoff_factor=0.1)
+    response = policy.call('GET', FakeSend(FakeResponse(429, '3'), FakeResponse(200)))
+    assert response.status_code == 200
+    assert sleeps == [3.0]
+
+
+def test_retry_after_longer_than_max_backoff_ends_the_retries(sleeps):
+    policy = RetryPolicy(max_backoff=5.0)
+    send = FakeSend(FakeResponse(503, '60'), FakeResponse(200))
+    assert policy.call('GET', send).status_code == 503
+    assert send.calls == 1 and sleeps == []
+
+
+def test_parse_retry_after():
+    assert RetryPolicy.parse_retry_after(None) is None
+    assert RetryPolicy.parse_retry_after(' 7 ') == 7.0
+    assert RetryPolicy.parse_retry_after('soon') is None
+    assert RetryPolicy.parse_retry_after(formatdate(time.time() + 30, usegmt=True)) == pytest.approx(30, abs=2)
+    assert RetryPolicy.parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+
+
+def test_expected_codes_are_not_retried(sleeps):
+    send = FakeSend(FakeResponse(503), FakeResponse(200))
+    assert RetryPolicy().call('GET', send, expected_code=(200, 503)).status_code == 503
+    assert send.calls == 1
+
+
+@pytest.mark.parametrize('method, body', [
+    ('POST', None),
+    ('MOVE', None),
+    ('PUT', iter([b'chunk'])),
+])
+def test_requests_that_can_not_be_sent_again_are_not_retried(sleeps, method, body):
+    send = FakeSend(FakeResponse(503), FakeResponse(200))
+    assert RetryPolicy().call(method, send, body=body).status_code == 503
+    assert send.calls == 1
+
+
+def test_seekable_bodies_are_rewound(sleeps):
+    body = io.BytesIO(b'0123456789')
+    body.seek(2)
+    positions = []
+
+    def send():
+        positions.append(body.tell())
+        body.read()
+        return FakeResponse(503 if len(positions) == 1 else 201)
+
+    assert RetryPolicy().call('PUT', send, body=body).status_code == 201
+    assert positions == [2, 2]
+
+
+def test_transport_errors_are_retried_then_raised(sleeps):
+    send = FakeSend(requests.exceptions.ConnectionError('refused'))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        RetryPolicy(max_attempts=3).call('GET', send)
+
+    assert send.calls == 3
+
+
+def test_budget_stops_retries_once_spent(sleeps):
+    policy = RetryPolicy(budget_ratio=0.5, budget_max_tokens=1.0)
+    assert policy.call('GET', FakeSend(FakeResponse(503), FakeResponse(200))).status_code == 200
+    send = FakeSend(FakeResponse(503), FakeResponse(200))
+    assert policy.call('GET', send).status_code == 503
+    assert send.calls == 1
+    assert policy.stats() == dict(retries=1, exhausted=1, tokens=0.5)
+    assert policy.call('GET', FakeSend(FakeResponse(503), FakeResponse(200))).status_code == 200
@@ -0,0 +1,104 @@
+import pytest
+from simplewebdavclient.exceptions import OperationFailed, MultiStatusFailed
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def test_copy_a_file_and_a_tree(server, client):
+    client.directories_create('/d/sub/')
+    client.upload(b'copied', '/d/sub/file.bin')
+    client.copy('/d/sub/file.bin', '/d/file.bin')
+    client.copy('/d/', '/tree/')
+    client.copy('/d/', '/empty/', depth=0)
+    assert server.resources['/d/file.bin'].data == b'copied'
+    assert server.resources['/tree/sub/file.bin'].data == b'copied'
+    assert server.resources['/empty'].collection and '/empty/sub' not in server.resources
+    assert server.resources['/d/sub/file.bin'].data == b'copied'
+
+
+def test_copy_without_overwrite_fails_on_an_existing_destination(server, client):
+    client.upload(b'a', '/a')
+    client.upload(b'b', '/b')
+    with pytest.raises(OperationFailed) as error:
+        client.copy('/a', '/b', overwrite=False)
+
+    assert error.value.actual_code == 412
+    assert server.resources['/b'].data == b'b'
+
+
+def test_move_renames_a_tree(server, client):
+    client.directories_create('/d/sub/')
+    client.upload(b'moved', '/d/sub/file.bin')
+    client.move('/d/', '/renamed/')
+    assert not any(path.startswith('/d') for path in server.resources)
+    assert server.resources['/renamed/sub/file.bin'].data == b'moved'
+
+
+def test_move_reports_the_resources_that_could_not_be_moved(server, client):
+    client.directories_create('/d/sub/')
+    client.upload(b'1', '/d/sub/locked.bin')
+    client.upload(b'2', '/d/free.bin')
+    server.locked.add('/d/sub/locked.bin')
+    with pytest.raises(MultiStatusFailed) as error:
+        client.move('/d/', '/renamed/')
+
+    assert error.value.failures == [('/d/sub/locked.bin', 'HTTP/1.1 423 Locked')]
+    assert '/d/sub/locked.bin' in server.resources and '/d/free.bin' not in server.resources
+    assert server.resources['/renamed/free.bin'].data == b'2'
+
+
+def test_delete_tree_removes_everything_bottom_up(server, client):
+    client.directories_create('/tree/a/b/')
+    for path in ('/tree/one.txt', '/tree/a/two.txt', '/tree/a/b/three.txt'):
+        client.upload(b'data', path)
+
+    calls = []
+    results = client.delete_tree('/tree', progress=lambda completed, total, result: calls.append((completed, total)))
+    assert all(result.ok for result in results)
+    assert [result.item for result in results][-3:] == ['/tree/a/b/', '/tree/a/', '/tree/']
+    assert set(server.resources) == {'/'}
+    assert calls[-1] == (6, 6)
+
+
+def test_delete_tree_with_a_quoted_root(server, client):
+    client.directories_create('/my%20dir/sub/')
+    client.upload(b'data', '/my%20dir/sub/file.txt')
+    results = client.delete_tree('/my%20dir/')
+    assert [result.ok for result in results] == [True, True, True]
+    assert set(server.resources) == {'/'}
+
+
+def test_delete_tree_leaves_the_parents_of_a_failure(server, client):
+    client.directories_create('/tree/a/b/')
+    client.directories_create('/tree/c/')
+    for path in ('/tree/a/one.txt', '/tree/a/b/two.txt', '/tree/c/three.txt'):
+        client.upload(b'data', path)
+
+    server.locked.add('/tree/a/b/two.txt')
+    calls = []
+    results = client.delete_tree('/tree/', progress=lambda completed, total, result: calls.append((completed, total)))
+    assert [result.item for result in results if not result.ok] == ['/tree/a/b/two.txt']
+    assert isinstance([result for result in results if not result.ok][0].error, OperationFailed)
+    # /tree/a/b, /tree/a and /tree stay, so they are neither sent nor counted
+    assert set(result.item for result in results) == {'/tree/a/one.txt', '/tree/a/b/two.txt', '/tree/c/three.txt',
+                                                      '/tree/c/'}
+    assert calls[-1] == (4, 4)
+    assert set(server.resources) == {'/', '/tree', '/tree/a', '/tree/a/b', '/tree/a/b/two.txt'}
+
+
+def test_directory_delete_reports_locked_members(server, client):
+    client.directories_create('/tree/a/')
+    client.upload(b'data', '/tree/a/file.txt')
+    client.upload(b'data', '/tree/other.txt')
+    server.locked.add('/tree/a/file.txt')
+    with pytest.raises(MultiStatusFailed):
+        client.directory_delete('/tree/')
+
+    assert set(server.resources) == {'/', '/tree', '/tree/a', '/tree/a/file.txt'}
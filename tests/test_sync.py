@@ -0,0 +1,92 @@
+from simplewebdavclient import Client
+from simplewebdavclient.sync import build_plan
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def plan(local_files=None, local_directories=None, remote_files=None, remote_directories=None, state=None,
+         direction='push', delete=False):
+    return build_plan(local_files or {}, local_directories or set(), remote_files or {}, remote_directories or set(),
+                      state or {}, direction, delete)
+
+
+def test_push_to_an_empty_remote_sends_everything_parents_first():
+    sync_plan = plan(local_files={'a': (1, 10.0), 'd/e/b': (2, 10.0)}, local_directories={'d/e', 'd', 'z'})
+    assert sync_plan.transfers == ['a', 'd/e/b']
+    assert sync_plan.directories == ['d', 'z', 'd/e']
+    assert sync_plan.deletes == [] and sync_plan.unchanged == []
+
+
+def test_push_skips_files_the_remote_has_with_the_same_size_and_a_newer_time():
+    sync_plan = plan(local_files={'same': (3, 100.5), 'older': (3, 100.0), 'resized': (3, 100.0)},
+                     remote_files={'same': (3, 100, None), 'older': (3, 99, None), 'resized': (4, 200, None)})
+    assert sync_plan.unchanged == ['same']
+    assert sync_plan.transfers == ['older', 'resized']
+
+
+def test_pull_compares_the_other_way_round():
+    sync_plan = plan(local_files={'same': (3, 100.0), 'stale': (3, 99.0)}, local_directories={'d'},
+                     remote_files={'same': (3, 100, None), 'stale': (3, 100, None), 'new': (1, 1, None),
+                                   'missing_time': (3, None, None)},
+                     remote_directories={'d', 'e'}, direction='pull')
+    assert sync_plan.unchanged == ['same']
+    assert sync_plan.transfers == ['missing_time', 'new', 'stale']
+    assert sync_plan.directories == ['e']
+
+
+def test_recorded_etag_decides_when_the_local_file_did_not_change():
+    state = {'kept': {'local_size': 3, 'local_mtime': 100.0, 'etag': '"1"'},
+             'edited': {'local_size': 3, 'local_mtime': 100.0, 'etag': '"1"'}}
+    sync_plan = plan(local_files={'kept': (3, 100.0), 'edited': (3, 100.0)},
+                     remote_files={'kept': (3, 50, '"1"'), 'edited': (3, 500, '"2"')}, state=state)
+    assert sync_plan.unchanged == ['kept']
+    assert sync_plan.transfers == ['edited']
+
+
+def test_recorded_sizes_and_times_decide_without_etags():
+    state = {'a': {'local_size': 3, 'local_mtime': 100.0, 'remote_size': 3, 'remote_mtime': 50}}
+    assert plan(local_files={'a': (3, 100.0)}, remote_files={'a': (3, 50, None)}, state=state).unchanged == ['a']
+    assert plan(local_files={'a': (3, 101.0)}, remote_files={'a': (3, 50, None)}, state=state).transfers == ['a']
+
+
+def test_deletes_only_with_delete_and_only_the_top_directories():
+    local_files = {'keep': (1, 1.0)}
+    remote_files = {'keep': (1, 1, None), 'gone': (1, 1, None), 'x/y/f': (1, 1, None)}
+    remote_directories = {'x', 'x/y'}
+    assert plan(local_files=local_files, remote_files=remote_files, remote_directories=remote_directories).deletes == []
+    sync_plan = plan(local_files=local_files, remote_files=remote_files, remote_directories=remote_directories,
+                     delete=True)
+    assert sync_plan.deletes == ['x', 'gone']
+
+
+def test_pull_deletes_local_leftovers():
+    sync_plan = plan(local_files={'old': (1, 1.0), 'dir/old': (1, 1.0)}, local_directories={'dir'},
+                     direction='pull', delete=True)
+    assert sync_plan.deletes == ['dir', 'old']
+
+
+def test_push_and_pull_names_with_url_characters(server, tmp_path):
+    source = tmp_path / 'source'
+    (source / 'd#1').mkdir(parents=True)
+    for name, data in (('a', b'plain'), ('a#b', b'hash'), ('c?d', b'query'), ('50%', b'percent'),
+                       ('d#1/e f', b'space')):
+        (source / name).write_bytes(data)
+
+    destination = tmp_path / 'destination'
+    with Client('127.0.0.1', port=server.port) as client:
+        assert not client.sync(str(source), '/n', direction='push').failures()
+        assert server.resources['/n/a#b'].data == b'hash'
+        assert server.resources['/n/d#1/e f'].data == b'space'
+        assert not client.sync(str(destination), '/n', direction='pull').failures()
+        assert client.sync(str(source), '/n', direction='push').transfers == []
+
+    for name, data in (('a', b'plain'), ('a#b', b'hash'), ('c?d', b'query'), ('50%', b'percent'),
+                       ('d#1/e f', b'space')):
+        assert (destination / name).read_bytes() == data
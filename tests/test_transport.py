@@ -0,0 +1,66 @@
+from io import BytesIO
+from simplewebdavclient import Client, Transport
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def test_requests_reuse_one_kept_alive_connection(server):
+    connections = server.connections
+    with Client('127.0.0.1', port=server.port) as client:
+        client.upload(b'data', '/file.txt')
+        for _ in range(5):
+            client.download('/file.txt', BytesIO())
+            assert client.resource_exists('/file.txt')
+            client.resource_list('/')
+
+        stats = client.transport.connection_stats()
+
+    assert stats == dict(connections=1, requests=16, reused=15)
+    assert server.connections - connections == 1
+
+
+def test_clients_sharing_a_transport_share_its_connections(server):
+    with Client('127.0.0.1', port=server.port) as client:
+        client.directories_create('/one/')
+        client.directories_create('/two/')
+
+    connections = server.connections
+    with Transport() as transport:
+        with Client('127.0.0.1', port=server.port, path='/one', transport=transport) as one:
+            one.upload(b'data', '/file.txt')
+
+        # Closing a Client leaves a Transport it was handed open
+        with Client('127.0.0.1', port=server.port, path='/two', transport=transport) as two:
+            two.upload(b'data', '/file.txt')
+            assert two.resource_exists('/file.txt')
+
+        assert transport.connection_stats() == dict(connections=1, requests=3, reused=2)
+        assert server.connections - connections == 1
+
+    assert set(server.resources) == {'/', '/one', '/two', '/one/file.txt', '/two/file.txt'}
+
+
+def test_connections_are_not_kept_alive_when_asked_not_to(server):
+    connections = server.connections
+    with Client('127.0.0.1', port=server.port, keep_alive=False) as client:
+        for _ in range(3):
+            client.resource_list('/')
+
+    assert server.connections - connections == 3
+
+
+def test_a_blocking_pool_opens_no_more_than_pool_maxsize_connections(server):
+    connections = server.connections
+    with Client('127.0.0.1', port=server.port, pool_maxsize=2, pool_block=True) as client:
+        results = client.upload_many([(b'data', '/file-{0}.txt'.format(index)) for index in range(12)], max_workers=6)
+        assert all(result.ok for result in results)
+        assert client.transport.connection_stats()['connections'] <= 2
+
+    assert server.connections - connections <= 2
@@ -0,0 +1,63 @@
+import mmap
+from array import array
+from io import BytesIO
+from benchmarks.server import LARGE_BODY_BYTES
+from simplewebdavclient.simplewebdavclient import MMAP_THRESHOLD_BYTES
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def test_buffers_are_uploaded_as_they_are(server, client):
+    data = bytes(range(256)) * 4
+    client.upload(data, '/bytes.bin')
+    client.upload(bytearray(data), '/bytearray.bin')
+    client.upload(memoryview(data)[256:512], '/slice.bin')
+    client.upload(BytesIO(data), '/file.bin')
+    assert server.resources['/bytes.bin'].data == server.resources['/bytearray.bin'].data == data
+    assert server.resources['/slice.bin'].data == data[256:512]
+    assert server.resources['/file.bin'].data == data
+
+
+def test_memoryviews_of_wider_items_are_sent_as_bytes(server, client):
+    numbers = array('i', range(100))
+    client.upload(memoryview(numbers), '/numbers.bin')
+    assert server.resources['/numbers.bin'].data == numbers.tobytes()
+
+
+def test_iterables_of_chunks_are_streamed(server, client):
+    client.upload((chunk for chunk in (b'one ', b'two ', b'three')), '/generator.bin')
+    client.upload([b'one ', b'two ', b'three'], '/list.bin')
+    assert server.resources['/generator.bin'].data == server.resources['/list.bin'].data == b'one two three'
+
+
+def test_large_files_are_memory_mapped(server, client, tmp_path, monkeypatch):
+    size = max(MMAP_THRESHOLD_BYTES, LARGE_BODY_BYTES) + 12345
+    path = tmp_path / 'large.bin'
+    path.write_bytes(b'x' * size)
+    mapped = []
+    original_mmap = mmap.mmap
+
+    def spy(*args, **kwargs):
+        mapped.append(args)
+        return original_mmap(*args, **kwargs)
+
+    monkeypatch.setattr(mmap, 'mmap', spy)
+    client.upload(str(path), '/large.bin')
+    client.upload(path, '/large-path.bin')
+    assert len(mapped) == 2
+    assert server.resources['/large.bin'].size == server.resources['/large-path.bin'].size == size
+
+
+def test_small_files_are_read_not_mapped(server, client, tmp_path, monkeypatch):
+    path = tmp_path / 'small.bin'
+    path.write_bytes(b'small')
+    monkeypatch.setattr(mmap, 'mmap', None)
+    client.upload(path, '/small.bin')
+    assert server.resources['/small.bin'].data == b'small'
@@ -0,0 +1,83 @@
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2018, Benjamin P. Trachtenberg"
+__credits__ = 'Benjamin P. Trachtenberg'
+__license__ = 'MIT'
+__status__ = 'prod'
+__version_info__ = (1, 0, 1)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+
+def build_tree(client):
+    """
+    Function to upload a small tree to the stand-in server
+
+    :type client: Client
+    :param client: The Client
+
+    :rtype: Set
+    :return: The paths in the tree, collections without a trailing /
+
+    """
+    client.directories_create('/a/b/c/')
+    client.directories_create('/d/')
+    for path in ('/a/one.txt', '/a/b/two.txt', '/a/b/c/three.txt', '/d/four.txt'):
+        client.upload(path.encode('utf-8'), path)
+
+    return {'/', '/a', '/a/b', '/a/b/c', '/d', '/a/one.txt', '/a/b/two.txt', '/a/b/c/three.txt', '/d/four.txt'}
+
+
+def walked_paths(client, remote_path='/', **kwargs):
+    """
+    Function to walk a tree and check every resource is yielded once
+
+    :type client: Client
+    :param client: The Client
+    :type remote_path: String
+    :param remote_path: The path
+
+    :rtype: Set
+    :return: The paths walked, collections without a trailing /
+
+    """
+    paths = [client._href_key(file_data.resource_url) or '/' for file_data in client.walk(remote_path, **kwargs)]
+    assert len(paths) == len(set(paths))
+    return set(paths)
+
+
+def test_walk_with_infinite_depth(server, client):
+    expected = build_tree(client)
+    requests = server.requests
+    assert walked_paths(client) == expected
+    assert server.requests - requests == 1
+
+
+def test_walk_crawls_when_infinite_depth_is_refused(server, client):
+    expected = build_tree(client)
+    server.finite_depth = True
+    requests = server.requests
+    assert walked_paths(client) == expected
+    # The refused PROPFIND, then one Depth 1 PROPFIND per collection
+    assert server.requests - requests == 1 + 5
+    assert walked_paths(client, '/a/b/') == {'/a/b', '/a/b/c', '/a/b/two.txt', '/a/b/c/three.txt'}
+
+
+def test_crawl_lists_a_redirected_collection_once(server, client):
+    expected = build_tree(client)
+    client.directories_create('/link/')
+    server.redirects['/link'] = '/a/b/c'
+    server.finite_depth = True
+    # One worker and a little latency let the redirect finish before /a/b is listed and finds /a/b/c
+    server.latency = 0.02
+    requests = server.requests
+    assert walked_paths(client, max_workers=1) == expected | {'/link'}
+    # The refused PROPFIND, /, /a, /d, the 301 for /link, /a/b/c and /a/b, which does not list /a/b/c again
+    assert server.requests - requests == 7
+
+
+def test_crawl_follows_a_redirect_loop_once(server, client):
+    expected = build_tree(client)
+    server.redirects['/a/b/c'] = '/a'
+    server.finite_depth = True
+    assert walked_paths(client) == expected - {'/a/b/c/three.txt'}